@@ -63,6 +63,8 @@ def get_arguments_serve():
                         help="Print a Esbonio pyproject.toml and exit")
     parser.add_argument('--container', action='store_true', default=False,
                         help="Use adi/doctools_latex:v1 for latex->pdf")
+    parser.add_argument('--async-server', action='store_true', default=False,
+                        help="Serve from a single asyncio thread, with request stats at /.serve-stats")
 
     return vars(parser.parse_args())
 
@@ -118,7 +120,7 @@ def get_arguments_custom_doc():
     return args
 
 
-def get_arguments_search():
+def get_arguments_search(args=None):
     """Parse arguments for the search command."""
     parser = argparse.ArgumentParser(
         prog='adoc search',
@@ -137,12 +139,16 @@ def get_arguments_search():
                         help='Fetch file by index from previous search results, or provide a full url')
     parser.add_argument('--format', choices=['html', 'src', 'md'], default='md',
                         help='Format for fetched content: html (page html), src (source .rst/.md file), md (converted to markdown, default)')
+    parser.add_argument('--daemon', action='store_true', default=False,
+                        help='Keep the indexes in memory and answer the next searches, until interrupted')
+    parser.add_argument('--ttl', type=float, default=5,
+                        help='Minutes during which cached indexes are used without revalidation, 0 to always revalidate (default: 5)')
 
-    args = parser.parse_args()
+    args = parser.parse_args(args)
     return args
 
 
-def get_arguments_search_wiki():
+def get_arguments_search_wiki(args=None):
     """Parse arguments for the search-wiki command."""
     parser = argparse.ArgumentParser(
         prog='adoc search-wiki',
@@ -158,7 +164,7 @@ def get_arguments_search_wiki():
     parser.add_argument('--format', choices=['raw', 'html'], default='raw',
                         help='Format for fetched content: raw (DokuWiki markup, default), html')
 
-    args = parser.parse_args()
+    args = parser.parse_args(args)
     return args
 
 
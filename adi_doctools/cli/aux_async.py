@@ -0,0 +1,327 @@
+import asyncio
+import concurrent.futures
+import http.client
+import io
+import json
+import logging
+import mimetypes
+import posixpath
+import threading
+import time
+from collections import deque
+from email.utils import formatdate
+from http import HTTPStatus
+from os import curdir, pardir, path, stat
+from urllib.parse import unquote, urlsplit
+
+from .aux_http import cached_response, compressible_types, not_modified
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """
+    Request latency over a sliding window, with totals per status.
+    """
+    def __init__(self, window=1024):
+        self.started = time.time()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.by_status = {}
+        self._latency = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, status, nbytes, seconds):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += nbytes
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+            self._latency.append(seconds)
+
+    def summary(self):
+        with self._lock:
+            latency = sorted(self._latency)
+            summary = {
+                'uptime': round(time.time() - self.started, 1),
+                'requests': self.requests,
+                'bytes_sent': self.bytes_sent,
+                'by_status': {str(k): v for k, v in sorted(self.by_status.items())},
+            }
+        if latency:
+            def percentile(p):
+                return round(latency[min(len(latency) - 1, int(p * len(latency)))] * 1e3, 3)
+            summary['latency_ms'] = {
+                'window': len(latency),
+                'mean': round(sum(latency) / len(latency) * 1e3, 3),
+                'p50': percentile(0.50),
+                'p95': percentile(0.95),
+                'p99': percentile(0.99),
+                'max': round(latency[-1] * 1e3, 3),
+            }
+        return summary
+
+
+class AsyncServer:
+    """
+    Single-threaded asyncio HTTP/1.1 server for the build directory.
+    Files not cached in memory are sent with sendfile() and every dev-pool
+    subscriber is a coroutine on the same loop.
+    Mirrors serve_forever(), shutdown() and server_close() of socketserver,
+    so it can replace EventServer.
+    """
+    keepalive_timeout = 15
+    stats_path = '/.serve-stats'
+
+    def __init__(self, server_address, directory, events, file_cache,
+                 transform=None, smudge=None, smudge_types=()):
+        """
+        :param transform: Applied to the content of HTML files.
+        :param smudge: Blocking callable that takes the URL path and returns
+                       the content of a Git LFS file, or None.
+        :param smudge_types: File extensions that may be Git LFS files.
+        """
+        self.directory = directory
+        self.events = events
+        self.file_cache = file_cache
+        self.transform = transform
+        self.smudge = smudge
+        self.smudge_types = smudge_types
+        self.stats = RequestStats()
+        self.subscribers = 0
+        self._loop = asyncio.new_event_loop()
+        self._stopped = threading.Event()
+        host, port = server_address
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, host or None, port,
+                                 reuse_address=True))
+        self.server_address = self._server.sockets[0].getsockname()[:2]
+
+    def serve_forever(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._stopped.set()
+
+    def shutdown(self):
+        if self._loop.is_closed() or self._stopped.is_set():
+            return
+        future = asyncio.run_coroutine_threadsafe(self._stop(), self._loop)
+        try:
+            future.result(timeout=5)
+        except (concurrent.futures.TimeoutError, concurrent.futures.CancelledError):
+            logger.debug("Timed out cancelling the server tasks")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._stopped.wait(timeout=5)
+
+    def server_close(self):
+        self.events.close()
+        if not self._loop.is_running() and not self._loop.is_closed():
+            self._loop.close()
+
+    async def _stop(self):
+        self._server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def translate_path(self, url_path):
+        """
+        Same as SimpleHTTPRequestHandler.translate_path.
+        """
+        url_path = posixpath.normpath(unquote(url_path))
+        words = [w for w in url_path.split('/')
+                 if w and w not in (curdir, pardir) and not path.dirname(w)]
+        return path.join(self.directory, *words)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'),
+                                                  self.keepalive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        asyncio.TimeoutError, ConnectionError):
+                    break
+
+                start = time.perf_counter()
+                request_line, _, raw_headers = head.partition(b'\r\n')
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                    headers = http.client.parse_headers(io.BytesIO(raw_headers))
+                except (ValueError, http.client.HTTPException):
+                    await self._send(writer, 400, [], b'', False)
+                    break
+
+                length = headers.get('Content-Length')
+                if length and length.isdigit():
+                    await reader.readexactly(int(length))
+
+                connection = headers.get('Connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+                status, nbytes, keep_alive = await self._respond(method, target, headers,
+                                                                 writer, keep_alive)
+                self.stats.add(status, nbytes, time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, status, headers, body, keep_alive, head_only=False):
+        """
+        Write a full response, return the number of bytes sent.
+        """
+        self._write_head(writer, status, headers, len(body), keep_alive)
+        if body and not head_only:
+            writer.write(body)
+        await writer.drain()
+        return len(body)
+
+    def _write_head(self, writer, status, headers, length, keep_alive):
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                 f"Date: {formatdate(usegmt=True)}",
+                 "Server: adoc-serve"]
+        if status != 304 and length is not None and not any(k == "Content-Length" for k, _ in headers):
+            lines.append(f"Content-Length: {length}")
+        lines.extend(f"{k}: {v}" for k, v in headers)
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+    async def _respond(self, method, target, headers, writer, keep_alive):
+        """
+        Answer a request, return the status, the number of body bytes sent and
+        if the connection can be reused.
+        """
+        if method not in ('GET', 'HEAD'):
+            return 501, await self._send(writer, 501, [], b'', False), False
+        head_only = method == 'HEAD'
+        url = urlsplit(target).path
+
+        if url == "/.dev-pool":
+            if headers.get("Accept", "").startswith("text/event-stream"):
+                return 200, await self._stream(writer, headers.get("Last-Event-ID")), False
+            body = self.events.latest().encode()
+            return 200, await self._send(writer, 200, [("Content-type", "text/plain"),
+                                                       ("Cache-Control", "no-cache")],
+                                         body, keep_alive, head_only), keep_alive
+
+        if url == self.stats_path:
+            summary = self.stats.summary()
+            summary['subscribers'] = self.subscribers
+            body = json.dumps(summary, indent=2).encode()
+            return 200, await self._send(writer, 200, [("Content-type", "application/json"),
+                                                       ("Cache-Control", "no-cache")],
+                                         body, keep_alive, head_only), keep_alive
+
+        url_path = url
+        if url_path.endswith('/'):
+            url_path += 'index.html'
+        elif not path.splitext(url_path)[1]:
+            url_path += '/index.html'
+
+        if url_path.endswith('.html'):
+            entry = self.file_cache.get(self.translate_path(url_path), self.transform)
+            if entry is not None:
+                status, headers_, body = cached_response(headers, entry, "text/html")
+                return status, await self._send(writer, status, headers_, body,
+                                                keep_alive, head_only), keep_alive
+
+        if self.smudge is not None and url.endswith(tuple(self.smudge_types)):
+            blob = await self._loop.run_in_executor(None, self.smudge, url)
+            if blob is not None:
+                content_type, _ = mimetypes.guess_type(url)
+                headers_ = [("Content-type", content_type or "application/octet-stream")]
+                return 200, await self._send(writer, 200, headers_, blob,
+                                             keep_alive, head_only), keep_alive
+
+        file_path = self.translate_path(url)
+        if path.isdir(file_path) and not url.endswith('/'):
+            return 301, await self._send(writer, 301, [("Location", url + '/')], b'',
+                                         keep_alive), keep_alive
+        if not path.isfile(file_path):
+            return 404, await self._send(writer, 404, [("Content-type", "text/plain")],
+                                         b'File not found', keep_alive, head_only), keep_alive
+
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        if content_type.startswith(compressible_types):
+            entry = self.file_cache.get(file_path)
+            if entry is not None:
+                status, headers_, body = cached_response(headers, entry, content_type)
+                return status, await self._send(writer, status, headers_, body,
+                                                keep_alive, head_only), keep_alive
+
+        return await self._sendfile(writer, file_path, content_type, headers,
+                                    keep_alive, head_only)
+
+    async def _sendfile(self, writer, file_path, content_type, headers, keep_alive, head_only):
+        """
+        Send a file from disk without copying it to user space.
+        """
+        # Local disk, open is fast enough to not block the loop
+        try:
+            f = open(file_path, 'rb')  # noqa: ASYNC230, SIM115
+        except OSError:
+            return 404, await self._send(writer, 404, [], b'', keep_alive), keep_alive
+        with f:
+            st = stat(f.fileno())
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if not_modified(headers, etag, st.st_mtime_ns):
+                return 304, await self._send(writer, 304, [("ETag", etag),
+                                                           ("Cache-Control", "no-cache")],
+                                             b'', keep_alive), keep_alive
+
+            self._write_head(writer, 200, [("Content-type", content_type),
+                                           ("ETag", etag),
+                                           ("Last-Modified", formatdate(st.st_mtime, usegmt=True)),
+                                           ("Cache-Control", "no-cache")],
+                             st.st_size, keep_alive)
+            await writer.drain()
+            if head_only:
+                return 200, 0, keep_alive
+            sent = await self._loop.sendfile(writer.transport, f, 0, st.st_size)
+            return 200, sent, keep_alive
+
+    async def _stream(self, writer, last_id):
+        """
+        Stream the events channel as server-sent events until the client
+        disconnects or the channel closes.
+        """
+        wake = asyncio.Event()
+
+        def notify():
+            try:
+                self._loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass
+
+        self._write_head(writer, 200, [("Content-type", "text/event-stream"),
+                                       ("Cache-Control", "no-cache")], None, False)
+        self.events.listen(notify)
+        self.subscribers += 1
+        sent = 0
+        try:
+            payload, version = self.events.pending(self.events.parse_id(last_id))
+            while True:
+                if payload:
+                    writer.write(payload)
+                    await writer.drain()
+                    sent += len(payload)
+                if self.events.closed:
+                    break
+                try:
+                    await asyncio.wait_for(wake.wait(), self.events.keepalive)
+                except asyncio.TimeoutError:
+                    payload = b":\n\n"
+                    continue
+                wake.clear()
+                payload, version = self.events.pending(version)
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers -= 1
+            self.events.unlisten(notify)
+        return sent
@@ -0,0 +1,509 @@
+"""Memory-mapped binary cache files for search indexes and inventories.
+
+A cache file is laid out as::
+
+    magic | header length | header (JSON) | sections ... | directory (JSON)
+    | directory offset
+
+The header holds the cache metadata (Last-Modified, error markers) and is
+read on its own, so validating a cache never touches the sections.
+Sections are either arrays of uint32 or raw bytes; strings are interned in
+a single table and referred to by index.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from array import array
+from collections import namedtuple
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ADOCBIN1'
+NONE = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<8sI')
+_TRAILER = struct.Struct('<Q')
+
+
+class CacheWriter:
+    """Collect interned strings and sections of a cache file."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache file."""
+        self._strings = {}
+        self._sections = {}
+
+    def intern(self, text: str | None) -> int:
+        """Return the string table index of text, NONE for None.
+
+        :param text: String to intern
+        :return: Index in the string table
+        """
+        if text is None:
+            return NONE
+        index = self._strings.get(text)
+        if index is None:
+            index = self._strings[text] = len(self._strings)
+        return index
+
+    def add_array(self, name: str, values) -> None:
+        """Add a section of uint32 values.
+
+        :param name: Section name
+        :param values: Iterable of integers
+        """
+        self._sections[name] = ('I', array('I', values).tobytes())
+
+    def add_bytes(self, name: str, data: bytes) -> None:
+        """Add a section of raw bytes.
+
+        :param name: Section name
+        :param data: Content
+        """
+        self._sections[name] = ('B', bytes(data))
+
+    def add_strings(self, name: str, values) -> None:
+        """Add a section of interned strings.
+
+        :param name: Section name
+        :param values: Iterable of strings or None
+        """
+        self.add_array(name, (self.intern(v) for v in values))
+
+    def add_mapping(self, name: str, mapping: dict) -> None:
+        """Add a mapping of strings to lists of integers.
+
+        Stored as three sections: the interned keys, the offsets of each
+        key's values and the flattened values.
+
+        :param name: Section name prefix
+        :param mapping: Dict mapping string to int or list of int
+        """
+        keys = []
+        offsets = [0]
+        values = array('I')
+        for key, items in mapping.items():
+            keys.append(self.intern(key))
+            if isinstance(items, int):
+                values.append(items)
+            else:
+                values.extend(items)
+            offsets.append(len(values))
+        self._sections[f'{name}.keys'] = ('I', array('I', keys).tobytes())
+        self._sections[f'{name}.offsets'] = ('I', array('I', offsets).tobytes())
+        self._sections[f'{name}.values'] = ('I', values.tobytes())
+
+    def write(self, path: Path, metadata: dict) -> None:
+        """Write the cache file atomically.
+
+        :param path: Destination path
+        :param metadata: JSON serializable header
+        """
+        offsets = array('I', [0])
+        blob = bytearray()
+        for text in self._strings:
+            blob += text.encode('utf-8', 'surrogatepass')
+            offsets.append(len(blob))
+        sections = dict(self._sections)
+        sections['strings.offsets'] = ('I', offsets.tobytes())
+        sections['strings.data'] = ('B', bytes(blob))
+
+        header = json.dumps(metadata).encode()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            directory = {}
+            for name, (kind, data) in sections.items():
+                f.write(b'\0' * (-f.tell() % 8))
+                directory[name] = [kind, f.tell(), len(data)]
+                f.write(data)
+            directory_offset = f.tell()
+            f.write(json.dumps(directory).encode())
+            f.write(_TRAILER.pack(directory_offset))
+        tmp.replace(path)
+
+
+def read_metadata(path: Path) -> dict | None:
+    """Read only the header of a cache file.
+
+    :param path: Cache file path
+    :return: Header dict, or None if missing or not a cache file
+    """
+    try:
+        with open(path, 'rb') as f:
+            magic, length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC:
+                return None
+            return json.loads(f.read(length))
+    except (OSError, struct.error, ValueError) as e:
+        logger.debug(f"Failed to read cache header {path}: {e}")
+        return None
+
+
+class CacheFile:
+    """Read-only, memory-mapped view of a cache file.
+
+    Sections are decoded on access; arrays are zero-copy views of the map.
+
+    :param path: Cache file path
+    :raises ValueError: If the file is not a valid cache file
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Map the cache file and read its directory.
+
+        :param path: Cache file path
+        :raises ValueError: If the file is not a valid cache file
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, length = _HEADER.unpack_from(self._map)
+            if magic != MAGIC:
+                raise ValueError(f"Not a cache file: {path}")
+            start = _HEADER.size
+            self.metadata = json.loads(self._map[start:start + length])
+            directory_offset, = _TRAILER.unpack_from(self._map, len(self._map) - _TRAILER.size)
+            self._directory = json.loads(self._map[directory_offset:len(self._map) - _TRAILER.size])
+        except (struct.error, ValueError) as e:
+            self._map.close()
+            raise ValueError(f"Corrupted cache file {path}: {e}") from e
+        self._view = memoryview(self._map)
+        self._string_offsets = self.array('strings.offsets')
+        self._string_data = self._section('strings.data')
+        self._string_cache = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._directory
+
+    def close(self) -> None:
+        """Unmap the cache file.
+
+        Views previously returned by the sections must no longer be used.
+        """
+        self._string_offsets.release()
+        self._string_data.release()
+        self._view.release()
+        self._map.close()
+
+    def _section(self, name: str) -> memoryview:
+        _, offset, length = self._directory[name]
+        return self._view[offset:offset + length]
+
+    def bytes(self, name: str) -> memoryview:
+        """Return a raw bytes section.
+
+        :param name: Section name
+        :return: Read-only view of the section
+        """
+        return self._section(name)
+
+    def array(self, name: str) -> memoryview:
+        """Return a uint32 section as a memoryview of ints.
+
+        :param name: Section name
+        :return: Read-only view of the section
+        """
+        return self._section(name).cast('I')
+
+    def string(self, index: int) -> str | None:
+        """Return an interned string.
+
+        :param index: Index in the string table, NONE for None
+        :return: The string
+        """
+        if index == NONE:
+            return None
+        text = self._string_cache.get(index)
+        if text is None:
+            start = self._string_offsets[index]
+            end = self._string_offsets[index + 1]
+            text = str(self._string_data[start:end], 'utf-8', 'surrogatepass')
+            self._string_cache[index] = text
+        return text
+
+    def strings(self, name: str) -> list:
+        """Return a section of interned strings.
+
+        :param name: Section name
+        :return: List of strings
+        """
+        return [self.string(i) for i in self.array(name)]
+
+    def find(self, name: str, key: str) -> int:
+        """Find a key in a section of sorted interned strings.
+
+        Only the strings compared on the binary search are decoded.
+
+        :param name: Section name
+        :param key: String to find
+        :return: Index of the key in the section, -1 if missing
+        """
+        ids = self.array(name)
+        lo, hi = 0, len(ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.string(ids[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(ids) and self.string(ids[lo]) == key:
+            return lo
+        return -1
+
+    def mapping(self, name: str) -> dict:
+        """Return a mapping written with :meth:`CacheWriter.add_mapping`.
+
+        :param name: Section name prefix
+        :return: Dict mapping string to list of int
+        """
+        keys = self.array(f'{name}.keys')
+        offsets = self.array(f'{name}.offsets')
+        values = self.array(f'{name}.values')
+        return {self.string(k): values[offsets[i]:offsets[i + 1]].tolist()
+                for i, k in enumerate(keys)}
+
+
+class MappedSearchIndex:
+    """searchindex.js data backed by a cache file.
+
+    Behaves as the read-only dict of the parsed ``Search.setIndex()``
+    argument, limited to the keys used by the search; each key is decoded
+    on first access.
+
+    :param cache: Open cache file
+    """
+
+    fields = ('docnames', 'filenames', 'titles', 'alltitles', 'terms', 'titleterms')
+
+    def __init__(self, cache: CacheFile) -> None:
+        """Wrap an open cache file.
+
+        :param cache: Open cache file
+        """
+        self.cache = cache
+        self._data = {}
+
+    @staticmethod
+    def write(path: Path, data: dict, metadata: dict) -> None:
+        """Write searchindex.js data to a cache file.
+
+        :param path: Cache file path
+        :param data: Parsed searchindex.js data
+        :param metadata: Cache metadata
+        """
+        writer = CacheWriter()
+        for key in ('docnames', 'filenames', 'titles'):
+            writer.add_strings(key, data.get(key, []))
+        for key in ('terms', 'titleterms'):
+            writer.add_mapping(key, data.get(key, {}))
+
+        keys = []
+        offsets = [0]
+        file_ids = []
+        anchors = []
+        for title, occurrences in data.get('alltitles', {}).items():
+            keys.append(title)
+            for file_id, anchor in occurrences:
+                file_ids.append(file_id)
+                anchors.append(anchor)
+            offsets.append(len(file_ids))
+        writer.add_strings('alltitles.keys', keys)
+        writer.add_array('alltitles.offsets', offsets)
+        writer.add_array('alltitles.files', file_ids)
+        writer.add_strings('alltitles.anchors', anchors)
+
+        writer.write(path, metadata)
+
+    def _decode(self, key):
+        cache = self.cache
+        if key in ('docnames', 'filenames', 'titles'):
+            return cache.strings(key)
+        if key in ('terms', 'titleterms'):
+            return cache.mapping(key)
+        if key == 'alltitles':
+            offsets = cache.array('alltitles.offsets')
+            file_ids = cache.array('alltitles.files')
+            anchors = cache.array('alltitles.anchors')
+            return {
+                cache.string(k): [[file_ids[j], cache.string(anchors[j])]
+                                  for j in range(offsets[i], offsets[i + 1])]
+                for i, k in enumerate(cache.array('alltitles.keys'))
+            }
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        if key not in self._data:
+            self._data[key] = self._decode(key)
+        return self._data[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.fields
+
+    def get(self, key, default=None):
+        return self[key] if key in self.fields else default
+
+
+InventoryItem = namedtuple('InventoryItem', ['type', 'name', 'uri'])
+
+_INVENTORY_LINE = re.compile(r'(.+?)\s+(\S+)\s+(-?\d+)\s+?(\S*)\s+(.*)')
+
+
+def iter_inventory(raw, types=('std:doc', 'std:label'), chunk_size=65536):
+    """Decode the entries of an objects.inv, streaming the decompression.
+
+    :param raw: objects.inv content, version 2
+    :param types: Object types to decode, others are skipped unparsed
+    :param chunk_size: Size of the compressed chunks to decompress at once
+    :return: Iterator of :class:`InventoryItem`
+    :raises ValueError: If not a version 2 inventory
+    """
+    raw = memoryview(raw)
+    offset = 0
+    for i in range(4):
+        end = bytes(raw[offset:offset + 256]).find(b'\n')
+        if end < 0:
+            raise ValueError("Truncated inventory header")
+        if i == 0 and bytes(raw[offset:offset + end]).rstrip() != b'# Sphinx inventory version 2':
+            raise ValueError("Unsupported inventory version")
+        offset += end + 1
+
+    markers = tuple(f' {t} '.encode() for t in types)
+    decompressor = zlib.decompressobj()
+    pending = b''
+    for start in range(offset, len(raw), chunk_size):
+        try:
+            pending += decompressor.decompress(raw[start:start + chunk_size])
+        except zlib.error as e:
+            raise ValueError(f"Corrupted inventory: {e}") from e
+        lines = pending.split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            if not any(marker in line for marker in markers):
+                continue
+            match = _INVENTORY_LINE.match(line.decode('utf-8').rstrip())
+            if match is None:
+                continue
+            name, type_, _, uri, _ = match.groups()
+            if type_ not in types:
+                continue
+            if uri.endswith('$'):
+                uri = uri[:-1] + name
+            yield InventoryItem(type_, name, uri)
+
+
+class MappedInventory:
+    """objects.inv entries backed by a cache file, by docname.
+
+    The cache first holds the raw objects.inv; on first lookup it is decoded
+    once into an index of the ``std:doc`` and ``std:label`` entries by
+    docname, rewritten in the cache file, and only the entries of the looked
+    up docnames are materialized.
+
+    :param cache: Open cache file
+    """
+
+    sections = ('docnames', 'offsets', 'types', 'names', 'uris')
+
+    def __init__(self, cache: CacheFile) -> None:
+        """Wrap an open cache file.
+
+        :param cache: Open cache file
+        :raises ValueError: If the cache holds neither inventory nor index
+        """
+        if 'inventory.docnames' not in cache and 'inventory.raw' not in cache:
+            raise ValueError(f"Outdated inventory cache {cache.path}")
+        self.cache = cache
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def write(path: Path, raw: bytes, metadata: dict) -> None:
+        """Write the raw objects.inv to a cache file, indexed on first use.
+
+        :param path: Cache file path
+        :param raw: objects.inv content
+        :param metadata: Cache metadata
+        """
+        writer = CacheWriter()
+        writer.add_bytes('inventory.raw', raw)
+        writer.write(path, metadata)
+
+    @staticmethod
+    def write_index(path: Path, items, metadata: dict) -> None:
+        """Write the entries of an inventory to a cache file, by docname.
+
+        ``std:doc`` entries are indexed by name, ``std:label`` entries by the
+        page of their URI.
+
+        :param path: Cache file path
+        :param items: Iterable of :class:`InventoryItem`
+        :param metadata: Cache metadata
+        """
+        by_docname = {}
+        for item in items:
+            if item.type == 'std:doc':
+                docname = item.name
+            else:
+                page, sep, _ = item.uri.partition('#')
+                if not sep or not page.endswith('.html'):
+                    continue
+                docname = page[:-len('.html')]
+            by_docname.setdefault(docname, []).append(item)
+
+        writer = CacheWriter()
+        docnames = sorted(by_docname)
+        offsets = [0]
+        columns = {'types': [], 'names': [], 'uris': []}
+        for docname in docnames:
+            for item in by_docname[docname]:
+                columns['types'].append(item.type)
+                columns['names'].append(item.name)
+                columns['uris'].append(item.uri)
+            offsets.append(len(columns['types']))
+        writer.add_strings('inventory.docnames', docnames)
+        writer.add_array('inventory.offsets', offsets)
+        for key, values in columns.items():
+            writer.add_strings(f'inventory.{key}', values)
+        writer.write(path, metadata)
+
+    def _index(self) -> CacheFile:
+        with self._lock:
+            if 'inventory.docnames' not in self.cache:
+                cache = self.cache
+                raw = bytes(cache.bytes('inventory.raw'))
+                # A mapped file cannot be replaced on Windows
+                cache.close()
+                try:
+                    self.write_index(cache.path, iter_inventory(raw), cache.metadata)
+                finally:
+                    self.cache = CacheFile(cache.path)
+            return self.cache
+
+    def lookup(self, docname: str) -> list:
+        """Get the entries of a docname.
+
+        :param docname: Document name
+        :return: List of :class:`InventoryItem`, in inventory order
+        :raises ValueError: If the inventory cannot be decoded
+        :raises OSError: If the index cannot be written to the cache file
+        """
+        cache = self._index()
+        i = cache.find('inventory.docnames', docname)
+        if i < 0:
+            return []
+        offsets = cache.array('inventory.offsets')
+        columns = [cache.array(f'inventory.{key}') for key in ('types', 'names', 'uris')]
+        string = cache.string
+        return [InventoryItem(*(string(column[j]) for column in columns))
+                for j in range(offsets[i], offsets[i + 1])]
@@ -0,0 +1,106 @@
+import errno
+import json
+import logging
+import socket
+import socketserver
+import threading
+from os import chmod, path, unlink
+
+logger = logging.getLogger(__name__)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Answer each JSON line of the connection with a JSON line.
+    """
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.handler(json.loads(line))
+            except Exception as e:  # noqa: BLE001
+                logger.debug(f"Daemon request failed: {e}")
+                response = {'error': str(e)}
+            try:
+                self.wfile.write(json.dumps(response).encode() + b'\n')
+                self.wfile.flush()
+            except OSError:
+                break
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Resident server answering newline-delimited JSON requests on a Unix
+    socket with handler(request), while calling refresh() every
+    refresh_interval seconds in a background thread.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, handler, refresh=None, refresh_interval=300):
+        self.socket_path = str(socket_path)
+        self.handler = handler
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self._stop = threading.Event()
+
+        if path.exists(self.socket_path):
+            if is_daemon_running(self.socket_path):
+                raise OSError(errno.EADDRINUSE, f"A daemon is already listening on {self.socket_path}")
+            unlink(self.socket_path)
+        super().__init__(self.socket_path, _RequestHandler)
+        chmod(self.socket_path, 0o600)
+
+        self._refresher = threading.Thread(target=self._run_refresh, daemon=True)
+        self._refresher.start()
+
+    def _run_refresh(self):
+        while not self._stop.wait(self.refresh_interval):
+            if self.refresh is None:
+                continue
+            try:
+                self.refresh()
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Daemon refresh failed: {e}")
+
+    def server_close(self):
+        self._stop.set()
+        super().server_close()
+        try:
+            unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def is_daemon_running(socket_path):
+    """
+    Check if something accepts connections on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.5)
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def daemon_request(socket_path, request, timeout=30):
+    """
+    Send request to the daemon and return its response, or None if no daemon
+    is listening or it did not answer.
+    """
+    if not path.exists(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            with sock.makefile('rb') as f:
+                line = f.readline()
+    except OSError as e:
+        logger.debug(f"Search daemon unavailable: {e}")
+        return None
+    try:
+        return json.loads(line) if line else None
+    except ValueError:
+        return None
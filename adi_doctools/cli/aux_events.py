@@ -0,0 +1,189 @@
+import socketserver
+import threading
+from collections import deque
+
+
+class EventChannel:
+    """
+    Server-sent events broadcast channel.
+    Messages are versioned and the latest are kept in a backlog, so a client
+    reconnecting with Last-Event-ID gets every message it missed, once.
+    A single thread writes to all socket clients, regardless of how many tabs
+    are open; asyncio servers stream through listen() and pending() instead.
+    """
+    def __init__(self, backlog=64, keepalive=15, send_timeout=5):
+        self.keepalive = keepalive
+        self.send_timeout = send_timeout
+        self._cond = threading.Condition()
+        self._messages = deque(maxlen=backlog)
+        self._version = 0
+        self._clients = {}
+        self._listeners = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def latest(self):
+        """
+        Return the last published message, or an empty string.
+        """
+        with self._cond:
+            return self._messages[-1][1] if self._messages else ""
+
+    def publish(self, message):
+        """
+        Queue message to every client and return its version.
+        """
+        with self._cond:
+            self._version += 1
+            self._messages.append((self._version, message))
+            self._cond.notify()
+            listeners = list(self._listeners)
+            version = self._version
+        for callback in listeners:
+            callback()
+        return version
+
+    def listen(self, callback):
+        """
+        Call callback, without arguments, on every publish and on close.
+        """
+        with self._cond:
+            self._listeners.append(callback)
+
+    def unlisten(self, callback):
+        with self._cond:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    @staticmethod
+    def parse_id(last_id):
+        try:
+            return int(last_id)
+        except (TypeError, ValueError):
+            return None
+
+    def pending(self, last_id):
+        """
+        Return the encoded messages newer than last_id and the version they
+        bring the client to. A client without a valid last_id is greeted with
+        the current version and receives only the messages published after it.
+        """
+        with self._cond:
+            version = self._version
+            messages = list(self._messages)
+        if last_id is None or last_id > version:
+            # New client, or the server restarted since
+            return f"id: {version}\nevent: hello\ndata: {version}\n\n".encode(), version
+        return self._payload(last_id, messages), version
+
+    def subscribe(self, sock, last_id=None):
+        """
+        Take ownership of a connected socket, after the response headers were
+        sent.
+        """
+        last_id = self.parse_id(last_id)
+        sock.settimeout(self.send_timeout)
+        with self._cond:
+            if self._closed:
+                sock.close()
+                return
+            if last_id is None or last_id > self._version:
+                greeting, last_id = self.pending(None)
+                try:
+                    sock.sendall(greeting)
+                except OSError:
+                    sock.close()
+                    return
+            self._clients[sock] = last_id
+            self._cond.notify()
+
+    def owns(self, sock):
+        with self._cond:
+            return sock in self._clients
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback()
+        self._thread.join(timeout=self.send_timeout + 1)
+
+    def _payload(self, last_id, messages):
+        """
+        Encode the messages newer than last_id; if the backlog no longer
+        reaches last_id, only the newest one is sent.
+        """
+        pending = [(v, m) for v, m in messages if v > last_id]
+        if pending and pending[0][0] != last_id + 1:
+            pending = pending[-1:]
+        chunks = []
+        for version, message in pending:
+            data = ''.join(f"data: {line}\n" for line in message.split('\n'))
+            chunks.append(f"id: {version}\n{data}\n")
+        return ''.join(chunks).encode()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and all(v == self._version for v in self._clients.values()):
+                    self._cond.wait(timeout=self.keepalive)
+                if self._closed:
+                    clients = list(self._clients)
+                    self._clients.clear()
+                    break
+                version = self._version
+                messages = list(self._messages)
+                clients = list(self._clients.items())
+
+            dropped = []
+            for sock, last_id in clients:
+                payload = self._payload(last_id, messages) if last_id < version else b":\n\n"
+                try:
+                    sock.sendall(payload)
+                except OSError:
+                    dropped.append(sock)
+
+            with self._cond:
+                for sock, _ in clients:
+                    if sock in self._clients:
+                        self._clients[sock] = version
+                for sock in dropped:
+                    self._clients.pop(sock, None)
+            for sock in dropped:
+                sock.close()
+
+        for sock in clients:
+            sock.close()
+
+
+class EventServer(socketserver.ThreadingTCPServer):
+    """
+    Threading server that does not close the sockets handed over to the
+    events channel when the request handler returns.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, server_address, handler, events):
+        self.events = events
+        super().__init__(server_address, handler)
+
+    def shutdown_request(self, request):
+        if self.events.owns(request):
+            return
+        super().shutdown_request(request)
+
+    def server_close(self):
+        self.events.close()
+        super().server_close()
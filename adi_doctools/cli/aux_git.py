@@ -1,6 +1,12 @@
+import logging
 import shutil
 import subprocess
-from os import path
+import threading
+import time
+from concurrent.futures import Future
+from os import path, stat, utime
+
+logger = logging.getLogger(__name__)
 
 
 def get_git_top_level(path_):
@@ -51,3 +57,164 @@ def get_lfs_sha(path_):
             if (f.read(54) == b"version https://git-lfs.github.com/spec/v1\noid sha256:"):
                 return f.read(64)
     return False
+
+
+class LfsIndex:
+    """
+    Map of the sha256 of git lfs pointers to their source files.
+    Updated by the watcher on every change of a file of the lfs types.
+    """
+    max_pointer_size = 1024
+
+    def __init__(self, types):
+        self.types = tuple(types)
+        self._lock = threading.Lock()
+        self._files = {}
+        self._sha = {}
+
+    def update(self, file):
+        """
+        Index file if it is a git lfs pointer, or drop it if it no longer is.
+        """
+        if not file.endswith(self.types):
+            return
+        sha = False
+        try:
+            if stat(file).st_size <= self.max_pointer_size:
+                sha = get_lfs_sha(file)
+        except OSError:
+            pass
+        with self._lock:
+            self._remove(file)
+            if sha:
+                self._files[file] = sha
+                self._sha.setdefault(sha, set()).add(file)
+
+    def remove(self, file):
+        with self._lock:
+            self._remove(file)
+
+    def _remove(self, file):
+        sha = self._files.pop(file, None)
+        if sha is not None:
+            files = self._sha[sha]
+            files.discard(file)
+            if not files:
+                del self._sha[sha]
+
+    def get(self, sha):
+        """
+        Return a source file that is still a git lfs pointer to sha, or None.
+        """
+        with self._lock:
+            files = sorted(self._sha.get(sha, ()))
+        for file in files:
+            if get_lfs_sha(file) == sha:
+                return file
+            self.update(file)
+        return None
+
+    def __len__(self):
+        return len(self._files)
+
+
+class LfsFetcher:
+    """
+    Background queue of git lfs pulls.
+    Files requested while a pull runs are coalesced into the next batch,
+    fetched with a single ``git lfs pull -I a,b,c`` and a single
+    ``git update-index``. Each request gets a future, resolved to True once
+    the file is no longer a pointer.
+    """
+    def __init__(self, git_top_level, coalesce=0.05):
+        self.git_top_level = git_top_level
+        self.coalesce = coalesce
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def fetch(self, file):
+        """
+        Queue file, return its future. A file already queued shares it.
+        """
+        with self._cond:
+            future = self._pending.get(file)
+            if future is None:
+                future = Future()
+                if self._closed:
+                    future.set_result(False)
+                    return future
+                self._pending[file] = future
+                self._cond.notify()
+            return future
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    batch, self._pending = self._pending, {}
+                    break
+            # Let requests of the same page land in the same batch
+            time.sleep(self.coalesce)
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            try:
+                self._pull(batch)
+            except Exception as e:  # noqa: BLE001
+                # Keep serving the next batches, e.g. git not installed
+                logger.error(f"git lfs pull failed: {e}")
+                for future in batch.values():
+                    if not future.done():
+                        future.set_result(False)
+
+        for future in batch.values():
+            future.set_result(False)
+
+    def _pull(self, batch):
+        files = sorted(batch)
+        files_ = [path.relpath(f, self.git_top_level) for f in files]
+        logger.info(f"git lfs smudging file(s): {' '.join(files_)}")
+        times = {}
+        for f in files:
+            try:
+                st = stat(f)
+                times[f] = (st.st_atime, st.st_mtime)
+            except OSError:
+                pass
+        try:
+            subprocess.run(["git", "lfs", "pull", "-I", ','.join(files_)],
+                           capture_output=True, text=True, check=True,
+                           cwd=self.git_top_level)
+        except subprocess.CalledProcessError as e:
+            if e.returncode != 2:
+                logger.error("%s\nstderr=%r", e, e.stderr)
+
+        fetched = [f for f in files if path.isfile(f) and not get_lfs_sha(f)]
+        # Same content as far as the docs are concerned, don't trigger builds
+        for f in fetched:
+            if f in times:
+                utime(f, times[f])
+        while fetched:
+            try:
+                subprocess.run(["git", "update-index", "-q", "--refresh", "--", *fetched],
+                               capture_output=True, text=True, check=True,
+                               cwd=self.git_top_level)
+            except subprocess.CalledProcessError as e:
+                if e.returncode == 128 and "/index.lock" in e.stderr:
+                    time.sleep(0.1)
+                    continue
+                logger.debug("%s\nstderr=%r", e, e.stderr)
+            break
+
+        for file in files:
+            batch[file].set_result(file in fetched)
@@ -4,6 +4,7 @@ Convert Sphinx HTML documentation to section-level chunks for vector search embe
 from pathlib import Path
 
 from lxml import html as lxml_html
+from lxml.html.defs import block_tags
 
 from ..lut import repos
 from .aux_html2md import HTMLToMarkdown, find_main_content
@@ -49,6 +50,28 @@ def _heading_chain(section, page_title):
         chain.append(page_title)
     return chain
 
+def _section_text(section):
+    """Text nodes of a section, without its headings and subsections."""
+    parts = []
+
+    def walk(elem):
+        if elem.text:
+            parts.append(elem.text)
+        for child in elem:
+            if isinstance(child.tag, str) and child.tag not in HEADING_TAGS and \
+               child.tag not in ('section', 'script', 'style'):
+                block = child.tag in block_tags or child.tag == 'br'
+                if block:
+                    parts.append(' ')
+                walk(child)
+                if block:
+                    parts.append(' ')
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(section)
+    return ' '.join(''.join(parts).replace('¶', '').split())
+
 def _extract_breadcrumb(tree):
     nav = tree.find(".//nav[@class='breadcrumb']")
     if nav is None:
@@ -74,6 +97,37 @@ class HTMLToChunks(HTMLToMarkdown):
                 continue
             self.process_element(child)
 
+    def sections(self, html_content):
+        """
+        Split a page into the plain text of its sections, each without its
+        subsections and with whitespace collapsed.
+        Returns the page text, sections separated by newlines, and a dict
+        mapping the anchors of each section (its id and the ids of the labels
+        before its heading) to the (start, end) offsets of its text.
+        """
+        tree = lxml_html.fromstring(html_content)
+        main = find_main_content(tree)
+        if main is None:
+            main = tree
+
+        _normalize_chunks(main)
+
+        parts = []
+        anchors = {}
+        offset = 0
+        for sec in main.xpath('.//section') or [main]:
+            text = _section_text(sec)
+
+            ids = [sec.get('id')]
+            ids.extend(c.get('id') for c in sec if c.tag == 'span')
+            for id_ in ids:
+                if id_:
+                    anchors.setdefault(id_, (offset, offset + len(text)))
+            if text:
+                parts.append(text)
+                offset += len(text) + 1
+        return '\n'.join(parts), anchors
+
     def convert(self, html_path, docs_root, max_text_chars=1000):
         """1000 ~ 250 tokens."""
 
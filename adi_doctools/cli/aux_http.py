@@ -0,0 +1,194 @@
+import gzip
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from hashlib import blake2b
+from os import stat
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+compressible_types = ('text/', 'application/javascript', 'application/json',
+                      'application/xml', 'image/svg+xml')
+compress_min_size = 1024
+
+
+class CachedFile:
+    """
+    File content, as served, with a strong ETag and lazily compressed
+    variants.
+    """
+    def __init__(self, mtime_ns, size, content):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.content = content
+        self.etag = '"' + blake2b(content, digest_size=16).hexdigest() + '"'
+        self.last_modified = formatdate(mtime_ns / 1e9, usegmt=True)
+        self._variants = {}
+
+    def encoded(self, encoding):
+        """
+        Return the content compressed with encoding, computed once per file
+        version.
+        """
+        if encoding is None:
+            return self.content
+        if encoding not in self._variants:
+            if encoding == 'br':
+                self._variants[encoding] = brotli.compress(self.content, quality=9)
+            else:
+                self._variants[encoding] = gzip.compress(self.content, compresslevel=9, mtime=0)
+        return self._variants[encoding]
+
+    def etag_for(self, encoding):
+        """
+        Return the ETag of the representation, which differs per encoding.
+        """
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+    def nbytes(self):
+        return len(self.content) + sum(len(v) for v in self._variants.values())
+
+
+class FileCache:
+    """
+    In-memory LRU cache of served files, keyed on the file mtime and size.
+    Files above max_file_size are not cached.
+    """
+    def __init__(self, max_size=128 << 20, max_file_size=16 << 20):
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self._lock = threading.Lock()
+        self._files = OrderedDict()
+
+    def get(self, file, transform=None):
+        """
+        Return the CachedFile of file, with transform applied to its content,
+        or None if the file is missing or too large.
+        """
+        try:
+            st = stat(file)
+        except OSError:
+            return None
+        if st.st_size > self.max_file_size:
+            return None
+
+        with self._lock:
+            entry = self._files.get(file)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self._files.move_to_end(file)
+                return entry
+
+        try:
+            with open(file, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        if transform is not None:
+            content = transform(content)
+        entry = CachedFile(st.st_mtime_ns, st.st_size, content)
+
+        with self._lock:
+            self._files[file] = entry
+            self._files.move_to_end(file)
+            self._evict()
+        return entry
+
+    def _evict(self):
+        total = sum(e.nbytes() for e in self._files.values())
+        while total > self.max_size and len(self._files) > 1:
+            _, entry = self._files.popitem(last=False)
+            total -= entry.nbytes()
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+
+
+def select_encoding(accept_encoding, content_type, size):
+    """
+    Return the best encoding accepted by the client for the content,
+    or None to send it as is.
+    """
+    if not accept_encoding or size < compress_min_size:
+        return None
+    if not content_type or not content_type.startswith(compressible_types):
+        return None
+
+    accepted = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+
+    for coding in ('br', 'gzip'):
+        if coding == 'br' and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return None
+
+
+def not_modified(headers, etag, mtime_ns):
+    """
+    Check the conditional request headers against the representation.
+    If-None-Match takes precedence over If-Modified-Since.
+    """
+    if_none_match = headers.get('If-None-Match')
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(',')]
+        return '*' in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = headers.get('If-Modified-Since')
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        return int(mtime_ns / 1e9) <= since
+    return False
+
+
+def cached_response(headers, entry, content_type):
+    """
+    Return the status, headers and body answering the request headers with
+    entry, compressed if accepted or as a 304 if the client copy is fresh.
+    """
+    encoding = select_encoding(headers.get('Accept-Encoding'), content_type, len(entry.content))
+    etag = entry.etag_for(encoding)
+
+    if not_modified(headers, etag, entry.mtime_ns):
+        return 304, [("ETag", etag), ("Cache-Control", "no-cache"),
+                     ("Vary", "Accept-Encoding")], b''
+
+    content = entry.encoded(encoding)
+    headers_ = [("Content-type", content_type),
+                ("Content-Length", str(len(content))),
+                ("ETag", etag),
+                ("Last-Modified", entry.last_modified),
+                ("Cache-Control", "no-cache"),
+                ("Vary", "Accept-Encoding")]
+    if encoding is not None:
+        headers_.append(("Content-Encoding", encoding))
+    return 200, headers_, content
+
+
+def send_cached(handler, entry, content_type):
+    """
+    Write entry as the response of the http.server handler.
+    """
+    status, headers, content = cached_response(handler.headers, entry, content_type)
+    handler.send_response(status)
+    for key, value in headers:
+        handler.send_header(key, value)
+    handler.end_headers()
+    if content:
+        handler.wfile.write(content)
@@ -0,0 +1,383 @@
+"""Compiled inverted index over the searchindex.js of several repositories."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import pickle
+import re
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from .search_utils import STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+SCORE_TITLE = 15
+SCORE_PARTIAL_TITLE = 8
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def _postings(value):
+    """Return the file ids of a term, searchindex.js stores a single one as int."""
+    return (value,) if isinstance(value, int) else value
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CompiledIndex:
+    """Inverted index merged across repositories, ranked with BM25.
+
+    Documents of every repository share one id space, so document
+    frequencies and the average document length are computed over all of
+    them and scores are comparable across repositories.
+    Section titles (``alltitles``) are indexed by trigram for substring
+    matches and by a sorted word list for prefix matches, so neither needs
+    a scan over every title.
+
+    The index is updated in place per document: each document keeps a
+    digest of its terms and titles, and on update only the documents whose
+    digest changed are removed and added again. Removed documents are
+    tombstoned and skipped by the queries until the index is rebuilt.
+
+    :param signature: Opaque value identifying the cached sources the index
+        was built from
+    """
+
+    format_version = 2
+    k1 = 1.2
+    b = 0.75
+    title_weight = 3
+    # Fraction of tombstoned documents above which the index is rebuilt
+    max_deleted = 0.25
+
+    def __init__(self, signature=None) -> None:
+        """Initialize an empty index.
+
+        :param signature: Opaque value identifying the sources
+        """
+        self.version = self.format_version
+        self.signature = signature
+        self.repos = []
+        # (repo id, docname, title) per document
+        self.docs = []
+        self.doc_len = array('I')
+        self.doc_digests = []
+        # (repo id, docname) -> live document id
+        self.doc_ids = {}
+        self.deleted = set()
+        self.total_len = 0
+        self.avgdl = 1.0
+        # Stemmed term -> sorted document ids
+        self.terms = {}
+        self.titleterms = {}
+        # (lowercase title, title) and [(document id, anchor)] per title
+        self.titles = []
+        self.title_ids = {}
+        self.title_docs = []
+        self.trigrams = {}
+        # Sorted title words and word -> title ids
+        self.words = []
+        self.word_titles = {}
+
+    @classmethod
+    def build(cls, sources, signature=None) -> CompiledIndex:
+        """Compile the index from parsed searchindex.js data.
+
+        :param sources: Iterable of (repository URL, index data) pairs
+        :param signature: Opaque value identifying the sources
+        :return: The compiled index
+        """
+        index = cls(signature)
+        for repo_url, data in sources:
+            index.update(repo_url, data)
+        return index
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """If too many documents are tombstoned."""
+        return len(self.deleted) > self.max_deleted * len(self.docs)
+
+    @staticmethod
+    def _split(data) -> dict:
+        """Invert searchindex.js data into its documents.
+
+        :param data: Parsed searchindex.js data
+        :return: Dict mapping docname to (title, terms, title terms,
+            alltitles entries, digest)
+        """
+        docnames = data.get('docnames', [])
+        doc_titles = data.get('titles', [])
+        count = min(len(docnames), len(doc_titles))
+        body = [[] for _ in range(count)]
+        title = [[] for _ in range(count)]
+        sections = [[] for _ in range(count)]
+        for source, target in ((data.get('terms', {}), body),
+                               (data.get('titleterms', {}), title)):
+            for term, file_ids in source.items():
+                for file_id in _postings(file_ids):
+                    if file_id < count:
+                        target[file_id].append(term)
+        for section_title, occurrences in data.get('alltitles', {}).items():
+            for file_id, anchor in occurrences:
+                if file_id < count:
+                    sections[file_id].append((section_title, anchor))
+
+        docs = {}
+        for i in range(count):
+            body[i].sort()
+            title[i].sort()
+            digest = hashlib.blake2b(repr((doc_titles[i], body[i], title[i], sections[i])).encode(),
+                                     digest_size=8).digest()
+            docs[docnames[i]] = (doc_titles[i], body[i], title[i], sections[i], digest)
+        return docs
+
+    def _add_title(self, title: str) -> int:
+        title_id = self.title_ids.get(title)
+        if title_id is None:
+            title_id = self.title_ids[title] = len(self.titles)
+            lower = title.lower()
+            self.titles.append((lower, title))
+            self.title_docs.append([])
+            for index, keys in ((self.trigrams, _trigrams(lower)),
+                                (self.word_titles, set(_WORD_PATTERN.findall(lower)))):
+                for key in keys:
+                    ids = index.get(key)
+                    if ids is None:
+                        index[key] = array('I', (title_id,))
+                    else:
+                        ids.append(title_id)
+        return title_id
+
+    def update(self, repo_url: str, data) -> tuple[int, int]:
+        """Update the documents of a repository from its searchindex.js data.
+
+        Unchanged documents keep their postings; changed and removed
+        documents are tombstoned and changed and new documents are appended,
+        so posting lists stay sorted.
+
+        :param repo_url: Repository URL
+        :param data: Parsed searchindex.js data
+        :return: Tuple of (documents added, documents removed)
+        """
+        if repo_url in self.repos:
+            repo_id = self.repos.index(repo_url)
+        else:
+            repo_id = len(self.repos)
+            self.repos.append(repo_url)
+
+        docs = self._split(data)
+        current = {docname: doc_id for (rid, docname), doc_id in self.doc_ids.items()
+                   if rid == repo_id}
+
+        removed = 0
+        for docname, doc_id in current.items():
+            new = docs.get(docname)
+            if new is None or new[4] != self.doc_digests[doc_id]:
+                self.deleted.add(doc_id)
+                self.total_len -= self.doc_len[doc_id]
+                del self.doc_ids[(repo_id, docname)]
+                removed += 1
+
+        # File id in data -> document id, for the new and changed documents
+        added = {}
+        for file_id, (docname, (doc_title, body, title, sections, digest)) in enumerate(docs.items()):
+            if (repo_id, docname) in self.doc_ids:
+                continue
+            doc_id = added[file_id] = len(self.docs)
+            self.docs.append((repo_id, docname, doc_title))
+            self.doc_digests.append(digest)
+            self.doc_ids[(repo_id, docname)] = doc_id
+            length = len(body) + len(title)
+            self.doc_len.append(length)
+            self.total_len += length
+            for section_title, anchor in sections:
+                self.title_docs[self._add_title(section_title)].append((doc_id, anchor))
+
+        # Document ids are appended in increasing order, posting lists stay sorted
+        if added:
+            count = len(docs)
+            # Offset of the file ids, if the whole repository was added
+            offset = added[0] if len(added) == count else None
+            for source, target in ((data.get('terms', {}), self.terms),
+                                   (data.get('titleterms', {}), self.titleterms)):
+                for term, file_ids in source.items():
+                    if offset is not None:
+                        ids = [offset + f for f in _postings(file_ids) if f < count]
+                    else:
+                        ids = [added[f] for f in _postings(file_ids) if f in added]
+                    if ids:
+                        postings = target.get(term)
+                        if postings is None:
+                            target[term] = array('I', ids)
+                        else:
+                            postings.extend(ids)
+
+        if len(self.words) != len(self.word_titles):
+            self.words = sorted(self.word_titles)
+        live = len(self.docs) - len(self.deleted)
+        self.avgdl = max(self.total_len / live, 1.0) if live else 1.0
+        return len(added), removed
+
+    def bm25(self, stemmed_terms: list[str]) -> dict[int, float]:
+        """Score the documents containing any of the stemmed terms.
+
+        searchindex.js only records if a term occurs in a document, so the
+        term frequency is 1 in the body plus ``title_weight`` in the title.
+
+        :param stemmed_terms: Stemmed query terms
+        :return: Dict mapping document id to BM25 score
+        """
+        scores = {}
+        total = len(self.docs) - len(self.deleted)
+        for term in set(stemmed_terms):
+            body = self.terms.get(term, ())
+            title = self.titleterms.get(term, ())
+            if not body and not title:
+                continue
+            body = set(body)
+            title = set(title)
+            docs = (body | title) - self.deleted
+            if not docs:
+                continue
+            df = len(docs)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for doc_id in docs:
+                tf = (doc_id in body) + self.title_weight * (doc_id in title)
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / self.avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def find_titles(self, text: str) -> set[int]:
+        """Return the ids of the titles containing text.
+
+        Text shorter than a trigram is matched as a word prefix instead.
+
+        :param text: Lowercase text
+        :return: Set of title ids
+        """
+        if len(text) < 3:
+            ids = set()
+            i = bisect_left(self.words, text)
+            while i < len(self.words) and self.words[i].startswith(text):
+                ids.update(self.word_titles[self.words[i]])
+                i += 1
+            return ids
+
+        postings = []
+        for gram in _trigrams(text):
+            ids = self.trigrams.get(gram)
+            if ids is None:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                break
+        return {i for i in candidates if text in self.titles[i][0]}
+
+    def match_titles(self, query_terms: list[str]) -> dict[int, float]:
+        """Score the titles matching the query.
+
+        Titles containing the whole query rank highest, with a bonus for an
+        exact or prefix match; the others score by the fraction of query
+        terms they contain.
+
+        :param query_terms: Query terms as typed
+        :return: Dict mapping title id to score
+        """
+        query = ' '.join(term.lower() for term in query_terms)
+        matches = {}
+        for title_id in self.find_titles(query):
+            lower = self.titles[title_id][0]
+            if lower == query:
+                matches[title_id] = SCORE_TITLE + 5
+            elif lower.startswith(query):
+                matches[title_id] = SCORE_TITLE + 2
+            else:
+                matches[title_id] = SCORE_PARTIAL_TITLE
+
+        terms = [t.lower() for t in query_terms if t.lower() not in STOPWORDS]
+        counts = {}
+        for term in terms:
+            for title_id in self.find_titles(term):
+                if title_id not in matches:
+                    counts[title_id] = counts.get(title_id, 0) + 1
+        for title_id, count in counts.items():
+            matches[title_id] = SCORE_PARTIAL_TITLE * count / len(terms)
+        return matches
+
+    def search(self, query_terms: list[str], stemmed_terms: list[str]) -> dict:
+        """Search the index.
+
+        Pages score by BM25; sections with a matching title add the title
+        score to the BM25 score of their page.
+
+        :param query_terms: Query terms as typed
+        :param stemmed_terms: Stemmed query terms without stopwords
+        :return: Dict mapping (repository URL, docname, anchor) to
+            (title, score)
+        """
+        results = {}
+        if not stemmed_terms:
+            return results
+
+        scores = self.bm25(stemmed_terms)
+        for doc_id, score in scores.items():
+            repo_id, docname, title = self.docs[doc_id]
+            results[(self.repos[repo_id], docname, None)] = (title, score)
+
+        for title_id, title_score in self.match_titles(query_terms).items():
+            title = self.titles[title_id][1]
+            for doc_id, anchor in self.title_docs[title_id]:
+                if doc_id in self.deleted:
+                    continue
+                repo_id, docname, _ = self.docs[doc_id]
+                key = (self.repos[repo_id], docname, anchor)
+                score = title_score + scores.get(doc_id, 0.0)
+                if key not in results or results[key][1] < score:
+                    results[key] = (title, score)
+
+        return {key: (title, round(score, 3)) for key, (title, score) in results.items()}
+
+
+def load_compiled_index(path: Path, signature=None) -> CompiledIndex | None:
+    """Load a compiled index, if it was built from the same sources.
+
+    :param path: Path to the pickled index
+    :param signature: Expected signature of the sources, None to load the
+        index whatever its sources, to update it
+    :return: The index, or None if missing, stale or unreadable
+    """
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'rb') as f:
+            index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+        logger.debug(f"Failed to load compiled index {path}: {e}")
+        return None
+    if (not isinstance(index, CompiledIndex) or
+            getattr(index, 'version', None) != CompiledIndex.format_version or
+            signature is not None and index.signature != signature):
+        return None
+    return index
+
+
+def save_compiled_index(path: Path, index: CompiledIndex) -> None:
+    """Save a compiled index, atomically.
+
+    :param path: Path to the pickled index
+    :param index: Index to save
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
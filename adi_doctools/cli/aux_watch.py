@@ -0,0 +1,455 @@
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import pickle
+import select
+import struct
+import threading
+import time
+from os import close, makedirs, path, read, replace, scandir, stat
+from os import name as os_name
+
+logger = logging.getLogger(__name__)
+
+# From <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_inotify_mask = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                 IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF |
+                 IN_ONLYDIR)
+_inotify_event = struct.Struct('iIII')
+
+# Files larger than this are compared by mtime and size only
+digest_max_size = 16 * 1024 * 1024
+
+
+class FileIndex:
+    """
+    Persistent state of the watched tree, stored as a pickle next to the
+    build: the listing and mtime of every directory, and the mtime, size and
+    content digest of every file.
+    On restart, only directories with a new mtime are listed again, and the
+    digest tells if a file with a new mtime actually changed.
+    """
+    version = 1
+
+    def __init__(self, file, directory, key=()):
+        self.file = file
+        self.directory = path.abspath(directory)
+        self.key = key
+        self._prefix = self.directory + path.sep
+        self._dirs = {}
+        self._files = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.load()
+
+    def _rel(self, path_):
+        return path_[len(self._prefix):] if path_.startswith(self._prefix) else path_
+
+    def load(self):
+        if not path.isfile(self.file):
+            return
+        try:
+            with open(self.file, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+            logger.debug(f"Discarding {self.file}: {e}")
+            return
+        if (data.get('version') != self.version or
+                data.get('directory') != self.directory or
+                data.get('key') != self.key):
+            return
+        self._dirs = data['dirs']
+        self._files = data['files']
+
+    def save(self):
+        with self._lock:
+            data = {
+                'version': self.version,
+                'directory': self.directory,
+                'key': self.key,
+                'dirs': self._dirs,
+                'files': self._files,
+            }
+            try:
+                makedirs(path.dirname(self.file), exist_ok=True)
+                with open(self.file + '.tmp', 'wb') as f:
+                    pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+                replace(self.file + '.tmp', self.file)
+            except OSError as e:
+                logger.debug(f"Could not save {self.file}: {e}")
+
+    def listing(self, dir_, mtime_ns):
+        """
+        Return (dirs, files) names of dir_ if its mtime didn't change.
+        """
+        rel = self._rel(dir_)
+        self._seen.add(rel)
+        entry = self._dirs.get(rel)
+        if entry is None or entry[0] != mtime_ns:
+            return None
+        return entry[1], entry[2]
+
+    def set_listing(self, dir_, mtime_ns, dirs, files):
+        rel = self._rel(dir_)
+        with self._lock:
+            entry = self._dirs.get(rel)
+            if entry is not None:
+                for name in set(entry[2]) - set(files):
+                    self._files.pop(self._rel(path.join(dir_, name)), None)
+            self._dirs[rel] = (mtime_ns, tuple(dirs), tuple(files))
+
+    def prune(self):
+        """
+        Drop the directories not visited since the last prune.
+        """
+        with self._lock:
+            for rel in set(self._dirs) - self._seen:
+                for name in self._dirs.pop(rel)[2]:
+                    self._files.pop(path.join(rel, name) if rel != self.directory else name, None)
+            self._seen = set()
+
+    def mtime(self, file):
+        entry = self._files.get(self._rel(file))
+        return None if entry is None else entry[0]
+
+    def changed(self, file, st):
+        """
+        Store the new state of file, return False only if the content is
+        known to be identical to the stored one.
+        """
+        rel = self._rel(file)
+        entry = self._files.get(rel)
+        if entry is not None and entry[0] == st.st_mtime and entry[1] == st.st_size:
+            return False
+        digest = _digest(file, st.st_size)
+        with self._lock:
+            self._files[rel] = (st.st_mtime, st.st_size, digest)
+        return (entry is None or entry[1] != st.st_size or
+                digest is None or entry[2] != digest)
+
+    def set(self, file, st):
+        rel = self._rel(file)
+        with self._lock:
+            entry = self._files.get(rel)
+            if entry is None or entry[0] != st.st_mtime or entry[1] != st.st_size:
+                self._files[rel] = (st.st_mtime, st.st_size, None)
+
+    def remove(self, file):
+        with self._lock:
+            self._files.pop(self._rel(file), None)
+
+    def fill_digests(self, stop_event):
+        """
+        Compute the missing digests, meant to run in the background.
+        """
+        with self._lock:
+            pending = [rel for rel, entry in self._files.items() if entry[2] is None]
+        for rel in pending:
+            if stop_event.is_set():
+                return
+            file = rel if path.isabs(rel) else path.join(self.directory, rel)
+            try:
+                st = stat(file)
+            except OSError:
+                continue
+            digest = _digest(file, st.st_size)
+            with self._lock:
+                entry = self._files.get(rel)
+                if entry is not None and entry[0] == st.st_mtime and entry[1] == st.st_size:
+                    self._files[rel] = (st.st_mtime, st.st_size, digest)
+
+
+def _digest(file, size):
+    if size > digest_max_size:
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(file, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.digest()
+
+
+class PollWatcher:
+    """
+    Watch a source tree by walking it on every call to wait().
+    Used when inotify is not available, and as the base of InotifyWatcher.
+    """
+
+    def __init__(self, directory, suffixes, files=(), exclude=(), index=None):
+        self.directory = path.abspath(directory)
+        self.suffixes = tuple(suffixes)
+        self.exclude = {path.abspath(e) for e in exclude}
+        self.index = index
+        self._files = {}
+        self._extra = {}
+        self._closed = threading.Event()
+        self.watch_files(files)
+
+    def _match(self, name):
+        return name.endswith(self.suffixes) and not name.startswith('.')
+
+    def _walk(self, dir_, seen, on_dir=None, index=None):
+        """
+        Yield (file, mtime) under dir_, skipping hidden entries, excluded
+        paths and symbolic link loops.
+        If index is given, directories with an unchanged mtime are not listed.
+        """
+        real = path.realpath(dir_)
+        if real in seen:
+            return
+        seen.add(real)
+        if on_dir is not None:
+            on_dir(dir_)
+        if index is not None:
+            try:
+                mtime_ns = stat(dir_).st_mtime_ns
+            except OSError:
+                return
+            if (listing := index.listing(dir_, mtime_ns)) is not None:
+                dirs, files = listing
+                for name in files:
+                    f = path.join(dir_, name)
+                    if (mtime := index.mtime(f)) is None:
+                        mtime = _mtime(f)
+                    if mtime is not None:
+                        yield f, mtime
+                for name in dirs:
+                    yield from self._walk(path.join(dir_, name), seen, on_dir, index)
+                return
+        try:
+            with scandir(dir_) as it:
+                entries = list(it)
+        except OSError:
+            return
+        dirs, files = [], []
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir():
+                    if entry.path not in self.exclude:
+                        dirs.append(entry.name)
+                        yield from self._walk(entry.path, seen, on_dir, index)
+                elif self._match(entry.name):
+                    st = entry.stat()
+                    files.append(entry.name)
+                    if index is not None:
+                        index.set(entry.path, st)
+                    yield entry.path, st.st_mtime
+            except OSError:
+                continue
+        if index is not None:
+            index.set_listing(dir_, mtime_ns, dirs, files)
+
+    def scan(self):
+        """
+        Walk the whole tree, return a dict of file to mtime.
+        """
+        self._files = dict(self._walk(self.directory, set(), index=self.index))
+        if self.index is not None:
+            self.index.prune()
+        return self._state()
+
+    def _state(self):
+        extra = {f: m for f, m in self._extra.items() if m is not None}
+        return {**self._files, **extra}
+
+    def _diff(self, files):
+        """
+        Replace the known files with files, return the changed ones.
+        """
+        changed = {f for f, m in files.items() if self._files.get(f) != m}
+        changed.update(f for f in self._files if f not in files)
+        self._files = files
+        return changed
+
+    def watch_files(self, files):
+        """
+        Watch individual files, e.g. included files outside the tree.
+        """
+        for f in files:
+            f = path.abspath(f)
+            if f not in self._extra:
+                self._extra[f] = _mtime(f)
+
+    def _check_extra(self):
+        changed = set()
+        for f, mtime in self._extra.items():
+            mtime_ = _mtime(f)
+            if mtime_ != mtime:
+                self._extra[f] = mtime_
+                changed.add(f)
+        return changed
+
+    def wait(self, timeout):
+        """
+        Block up to timeout seconds, return the set of changed, added
+        or removed files.
+        """
+        if self._closed.wait(timeout):
+            return set()
+        changed = self._diff(dict(self._walk(self.directory, set())))
+        changed.update(self._check_extra())
+        return changed
+
+    def close(self):
+        self._closed.set()
+
+
+class InotifyWatcher(PollWatcher):
+    """
+    Watch a source tree with Linux inotify, one watch per directory.
+    Bursts of events (e.g. git checkout) are coalesced until the tree is
+    quiet for debounce seconds, or debounce_max seconds have passed.
+    """
+
+    def __init__(self, directory, suffixes, files=(), exclude=(), index=None,
+                 debounce=0.05, debounce_max=1.0):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wd = {}
+        self._polling = False
+        self.debounce = debounce
+        self.debounce_max = debounce_max
+        super().__init__(directory, suffixes, files, exclude, index)
+
+    def _add_watch(self, dir_):
+        wd = self._libc.inotify_add_watch(self._fd, dir_.encode(), _inotify_mask)
+        if wd < 0:
+            # Most likely fs.inotify.max_user_watches
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {dir_}")
+        self._wd[wd] = dir_
+
+    def scan(self):
+        try:
+            self._files = dict(self._walk(self.directory, set(), self._add_watch, self.index))
+            if self.index is not None:
+                self.index.prune()
+        except OSError as e:
+            logger.warning(f"{e}, falling back to polling.")
+            self._polling = True
+            close(self._fd)
+            return super().scan()
+        return self._state()
+
+    def _read_events(self, changed):
+        """
+        Consume pending events, return False on queue overflow.
+        """
+        try:
+            buf = read(self._fd, 65536)
+        except BlockingIOError:
+            return True
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, len_ = _inotify_event.unpack_from(buf, offset)
+            name = buf[offset + 16:offset + 16 + len_].rstrip(b'\0').decode(errors='surrogateescape')
+            offset += 16 + len_
+            if mask & IN_Q_OVERFLOW:
+                return False
+            dir_ = self._wd.get(wd)
+            if dir_ is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._wd[wd]
+                continue
+            if not name:
+                continue
+            path_ = path.join(dir_, name)
+            if mask & IN_ISDIR:
+                if name.startswith('.') or path_ in self.exclude:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files moved in along the directory get no events.
+                    for f, _ in self._walk(path_, set(), self._add_watch):
+                        changed.add(f)
+                else:
+                    prefix = path_ + path.sep
+                    changed.update(f for f in self._files if f.startswith(prefix))
+            elif self._match(name) or path_ in self._extra:
+                changed.add(path_)
+        return True
+
+    def wait(self, timeout):
+        if self._polling:
+            return super().wait(timeout)
+        changed = set()
+        try:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if ready and not self._closed.is_set():
+                ok = self._read_events(changed)
+                start = time.monotonic()
+                while ok and time.monotonic() - start < self.debounce_max:
+                    ready, _, _ = select.select([self._fd], [], [], self.debounce)
+                    if not ready:
+                        break
+                    ok = self._read_events(changed)
+                if not ok:
+                    logger.debug("inotify queue overflow, rescanning")
+                    files = dict(self._walk(self.directory, set(), self._add_watch))
+                    return self._diff(files) | self._check_extra()
+        except (OSError, ValueError) as e:
+            if self._closed.is_set():
+                return set()
+            logger.warning(f"{e}, falling back to polling.")
+            self._polling = True
+            close(self._fd)
+            return self._diff(dict(self._walk(self.directory, set()))) | self._check_extra()
+
+        for f in changed:
+            mtime = _mtime(f)
+            if f in self._extra:
+                self._extra[f] = mtime
+            elif mtime is None:
+                self._files.pop(f, None)
+            else:
+                self._files[f] = mtime
+        changed.update(self._check_extra())
+        return changed
+
+    def close(self):
+        if not self._closed.is_set():
+            super().close()
+            if not self._polling:
+                close(self._fd)
+
+
+def _mtime(file):
+    try:
+        return stat(file).st_mtime
+    except OSError:
+        return None
+
+
+def get_watcher(directory, suffixes, files=(), exclude=(), index=None):
+    """
+    Return an InotifyWatcher, or a PollWatcher if inotify is not available.
+    """
+    if os_name == 'posix' and hasattr(select, 'select'):
+        try:
+            return InotifyWatcher(directory, suffixes, files, exclude, index)
+        except (OSError, AttributeError) as e:
+            logger.debug(f"inotify not available, polling instead: {e}")
+    return PollWatcher(directory, suffixes, files, exclude, index)
@@ -6,43 +6,53 @@ That is a fork from sphinx provided search.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
-import pickle
 import re
+import signal
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from email.utils import parsedate_to_datetime
-from html.parser import HTMLParser
-from io import StringIO
 from pathlib import Path
 from urllib.error import HTTPError, URLError
 from urllib.parse import urljoin, urlparse
-from urllib.request import urlopen
 
 import snowballstemmer
-from packaging.version import Version
-from sphinx import __version__ as __sphinx_version__
-from sphinx.ext.intersphinx._load import _InvConfig
+from lxml.etree import ParserError
 
 from ..lut import remote_doc, repos, source_hostname_raw
 from .argument_parser import get_arguments_search
+from .aux_cache import (
+    CacheFile,
+    CacheWriter,
+    MappedInventory,
+    MappedSearchIndex,
+    read_metadata,
+)
+from .aux_daemon import DaemonServer, daemon_request
+from .aux_html2chunk import HTMLToChunks
 from .aux_html2md import convert_html_to_markdown
+from .aux_index import CompiledIndex, load_compiled_index, save_compiled_index
 from .logging import BLUE, DIM, NC, RESET
 from .search_utils import (
     STOPWORDS,
+    PageCache,
     SearchResultsCache,
     calculate_limit_from_terminal,
     calculate_wrapped_lines,
     clear_line,
-    fetch_batch,
-    fetch_last_modified,
+    fetch_conditional,
+    format_http_date,
     get_terminal_size,
+    http_open,
+    is_fresh,
     make_clickable_link,
     move_cursor_down,
     move_cursor_up,
     strip_ansi,
+    touch,
     truncate_text,
 )
 from .string_search import (
@@ -54,20 +64,16 @@ from .string_search import (
     format_desc_source_rest_markdown,
 )
 
-if Version(__sphinx_version__) < Version('9.0.0'):
-    from sphinx.ext.intersphinx._load import _fetch_inventory
-else:
-    from sphinx.ext.intersphinx._load import _fetch_inventory_data, _load_inventory
-
 logger = logging.getLogger(__name__)
 
 CACHE_DIR = Path('/tmp/adoc.search')
 _results_cache = SearchResultsCache(CACHE_DIR, 'last_results')
-
-SCORE_TITLE = 15
-SCORE_PARTIAL_TITLE = 8
-SCORE_TERM = 5
-SCORE_PARTIAL_TERM = 2
+DAEMON_SOCKET = CACHE_DIR / 'daemon.sock'
+DAEMON_REFRESH = 300
+# Seconds during which cached indexes are used without revalidation
+CACHE_TTL = 300
+# Pages of the results, for summaries and --fetch
+PAGE_CACHE_DIR = CACHE_DIR / 'pages'
 
 
 def split_strings_in_tuple(t):
@@ -102,30 +108,6 @@ def extract_path_from_url(url):
 
 
 
-class HTMLTextExtractor(HTMLParser):
-    """Extract text content from HTML, skipping scripts and styles."""
-
-    def __init__(self):
-        super().__init__()
-        self.text = StringIO()
-        self.skip = False
-
-    def handle_starttag(self, tag, attrs):
-        if tag in ('script', 'style'):
-            self.skip = True
-
-    def handle_endtag(self, tag):
-        if tag in ('script', 'style'):
-            self.skip = False
-
-    def handle_data(self, data):
-        if not self.skip:
-            self.text.write(data)
-
-    def get_text(self):
-        return self.text.getvalue()
-
-
 def get_cache_path(url):
     """Get the cache file path for a given URL."""
     parsed = urlparse(url)
@@ -136,27 +118,28 @@ def get_cache_path(url):
     path = path[:-len("/searchindex.js")]
     parts.append(path.replace('/', '.'))
 
-    filename = '.'.join(parts) + '.json'
+    filename = '.'.join(parts) + '.bin'
 
     return CACHE_DIR / filename
 
 
-def fetch_repo_data_batch(repo_sources, last_modified_map):
-    """Fetch search indexes and inventories for all repos in parallel."""
+def fetch_repo_data_batch(repo_sources, ttl=CACHE_TTL):
+    """Fetch search indexes and inventories for all repos in parallel.
+
+    Cached copies younger than ttl seconds are used without a request, older
+    ones are revalidated with a conditional GET.
+    """
     results = {}
 
     def fetch_repo(repo_name, repo_url):
-        searchindex_last_modified = last_modified_map.get(repo_url)
         base_url = get_base_url(repo_url)
-        inv_url = base_url + 'objects.inv'
-        inv_last_modified = last_modified_map.get(inv_url)
 
         try:
-            index_data = fetch_search_index(repo_url, searchindex_last_modified)
+            index_data = fetch_search_index(repo_url, ttl)
             if index_data is None:
                 return repo_url, (None, None, base_url)
 
-            inventory = fetch_intersphinx_inventory(base_url, inv_last_modified)
+            inventory = fetch_intersphinx_inventory(base_url, ttl)
             return repo_url, (index_data, inventory, base_url)
         except URLError as e:
             logger.warning(f"Failed to fetch {repo_name or repo_url}: {e}")
@@ -171,62 +154,46 @@ def fetch_repo_data_batch(repo_sources, last_modified_map):
     return results
 
 
-def is_cache_valid(cache_path, remote_last_modified):
-    """Check if cache file exists and is still valid based on Last-Modified header."""
-    if not cache_path.exists() or not remote_last_modified:
-        return False
-
+def load_from_cache(cache_path):
+    """Load search index from cache file, mapped and decoded on access."""
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cached_data = json.load(f)
-    except (json.JSONDecodeError, OSError) as e:
+        cache = CacheFile(cache_path)
+    except (OSError, ValueError) as e:
         logger.debug(f"Failed to load cache {cache_path}: {e}")
-        return False
-
-    if isinstance(cached_data, dict) and cached_data.get('__cache_error__'):
-        return False
-
-    cached_last_modified_str = cached_data.get('__cache_metadata__', {}).get('last_modified')
-    if not cached_last_modified_str:
-        return False
-
-    cached_last_modified = parsedate_to_datetime(cached_last_modified_str)
-    return remote_last_modified <= cached_last_modified
-
-
-def load_from_cache(cache_path):
-    """Load search index from cache file."""
-    with open(cache_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        return None
 
-    if isinstance(data, dict) and data.get('__cache_error__'):
+    if cache.metadata.get('__cache_error__'):
         return None
 
-    if isinstance(data, dict) and '__cache_metadata__' in data:
-        data = {k: v for k, v in data.items() if k != '__cache_metadata__'}
+    return MappedSearchIndex(cache)
+
 
-    return data
+def get_cache_metadata(last_modified=None, etag=None):
+    """Get the cache metadata holding the response validators."""
+    metadata = {'fetched': time.time()}
+    if last_modified:
+        metadata['last_modified'] = format_http_date(last_modified)
+    if etag:
+        metadata['etag'] = etag
+    return metadata
 
 
-def save_to_cache(cache_path, data, last_modified=None):
-    """Save search index to cache file with Last-Modified metadata."""
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
+def get_cache_validators(metadata):
+    """Get the ETag and Last-Modified to revalidate a cache, if it holds data."""
+    if not metadata or metadata.get('__cache_error__'):
+        return None, None
+    return metadata.get('etag'), metadata.get('last_modified')
 
-    cache_data = dict(data) if isinstance(data, dict) else data
 
-    if last_modified and isinstance(cache_data, dict):
-        cache_data['__cache_metadata__'] = {
-            'last_modified': last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT') if hasattr(last_modified, 'strftime') else str(last_modified)
-        }
+def save_to_cache(cache_path, data, last_modified=None, etag=None):
+    """Save search index to cache file with ETag and Last-Modified metadata."""
+    metadata = get_cache_metadata(last_modified, etag)
 
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(cache_data, f)
+    MappedSearchIndex.write(cache_path, data, metadata)
 
 
 def save_error_to_cache(cache_path, error_type, url):
     """Save an error marker to cache file."""
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-
     error_marker = {
         '__cache_error__': True,
         'error_type': error_type,
@@ -234,8 +201,7 @@ def save_error_to_cache(cache_path, error_type, url):
         'timestamp': time.time()
     }
 
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(error_marker, f)
+    CacheWriter().write(cache_path, error_marker)
 
 
 def save_search_results(results):
@@ -259,125 +225,85 @@ def load_search_results():
     return _results_cache.load()
 
 
-def fetch_url_content(url, format='md'):
-    """Fetch content from URL in specified format."""
-    if format == 'src':
-        print(error_format_src_not_applicable)
-        print(error_format_src_requires_index_1)
-        print(error_format_src_requires_index_2)
-        sys.exit(1)
-
-    print()
-    print(f"{BLUE}Format:{RESET} {format.upper()}", end='')
-    if format == 'md':
-        print(format_desc_converted_markdown)
-    elif format == 'html':
-        print(" (html)")
-
-    logger.debug(format_available)
-    print(f"\n{BLUE}Fetching:{RESET} {url}\n")
+def get_url_content(url, format='md', ttl=CACHE_TTL):
+    """Fetch a page through the page cache and return it as html or converted to Markdown.
 
+    Raises URLError or ValueError on failure.
+    """
     try:
-        with urlopen(url, timeout=30) as response:
-            html_content = response.read().decode('utf-8')
+        _, content = _page_cache.get(url, ttl)
+        html_content = content.decode('utf-8')
     except HTTPError as e:
-        logger.error(f"HTTP {e.code} - {url}")
-        sys.exit(1)
-    except URLError as e:
-        logger.error(f"Failed to fetch URL - {e.reason}")
-        sys.exit(1)
+        raise URLError(f"HTTP {e.code} - {url}")
     except UnicodeDecodeError as e:
-        logger.error(f"{e}")
-        sys.exit(1)
-
-    terminal_width, _ = get_terminal_size()
-    print("─" * terminal_width)
+        raise ValueError(str(e))
 
     if format == 'html':
-        print(html_content)
-    elif format == 'md':
-        markdown = convert_html_to_markdown(url, html_content)
-        if markdown is None:
-            logger.error("Failed to convert HTML to Markdown")
-            sys.exit(1)
-        print(markdown)
+        return html_content
 
+    markdown = convert_html_to_markdown(url, html_content)
+    if markdown is None:
+        raise ValueError("Failed to convert HTML to Markdown")
+    return markdown
 
-def fetch_source_file(index, format='src'):
-    """Fetch and display file from previous search results in specified format."""
+
+def get_result(index):
+    """Get a result of the previous search by index.
+
+    Raises LookupError if there is no such result.
+    """
     results = load_search_results()
 
     if results is None:
-        logger.error("No previous search results found. Run a search first.")
-        sys.exit(1)
+        raise LookupError("No previous search results found. Run a search first.")
 
-    result = None
     for r in results:
         if r['index'] == index:
-            result = r
-            break
+            return r
 
-    if result is None:
-        logger.error(f"No result found at index {index}. Valid indices: 1-{len(results)}")
-        sys.exit(1)
+    raise LookupError(f"No result found at index {index}. Valid indices: 0-{len(results) - 1}")
 
-    result_url = result['url']
 
-    print()
-    print(f"{BLUE}Format:{RESET} {format.upper()}", end='')
-    if format == 'md':
-        print(format_desc_converted_markdown)
-    elif format == 'src':
-        print(format_desc_source_rest_markdown)
-    elif format == 'html':
-        print(" (html)")
-    logger.debug(format_available)
-
-    if format == 'html':
-        print(f"\n{BLUE}Fetching from:{RESET} [{index}] {result['title']}")
-        print(f"{BLUE}URL:{RESET} {result_url}\n")
+def resolve_include_path(pathname, docname, include_path):
+    """Resolve an include directive path relative to the document source."""
+    # The current file path is like "doc/sphinx/source/drivers/adc/ad405x.rst"
+    # The include path is like "../../../../../drivers/adc/ad405x/README.rst"
+    if pathname:
+        current_file_path = f"{pathname}/{docname}"
+    else:
+        current_file_path = docname
 
-        try:
-            with urlopen(result_url, timeout=30) as response:
-                html_content = response.read().decode('utf-8')
-        except (URLError, UnicodeDecodeError) as e:
-            logger.error(f"Failed to fetch HTML - {e}")
-            sys.exit(1)
+    current_dir = '/'.join(current_file_path.split('/')[:-1]) if '/' in current_file_path else ''
 
-        terminal_width, _ = get_terminal_size()
-        print("─" * terminal_width)
-        print(html_content)
-        return
+    if current_dir:
+        resolved_path = f"{current_dir}/{include_path}"
+    else:
+        resolved_path = include_path
 
-    elif format == 'md':
-        print(f"\n{BLUE}Fetching from:{RESET} [{index}] {result['title']}")
-        print(f"{BLUE}URL:{RESET} {result_url}\n")
+    path_parts = []
+    for part in resolved_path.split('/'):
+        if part == '..':
+            if path_parts:
+                path_parts.pop()
+        elif part and part != '.':
+            path_parts.append(part)
 
-        try:
-            with urlopen(result_url, timeout=30) as response:
-                html_content = response.read().decode('utf-8')
-        except (URLError, UnicodeDecodeError) as e:
-            logger.error(f"Failed to fetch HTML - {e}")
-            sys.exit(1)
+    return '/'.join(path_parts)
 
-        markdown = convert_html_to_markdown(result_url, html_content)
-        if markdown is None:
-            logger.error("Failed to convert HTML to Markdown")
-            sys.exit(1)
 
-        terminal_width, _ = get_terminal_size()
-        print("─" * terminal_width)
-        print(markdown)
-        return
+def get_source_content(result):
+    """Fetch the source file (.rst or .md) of a search result.
 
-    # format == 'src' - fetch source file
+    Follows the include directive of a source that only includes another
+    file. Returns the source URL, the content and the followed include path,
+    if any. Raises LookupError if the source can't be found.
+    """
     repo_name = result['repo']
     docname = result['docname']
 
     if not repo_name or repo_name not in repos:
-        logger.error(f"Unknown source location for '{repo_name or 'unknown'}'.")
-        print("  " + ", ".join(sorted(repos.keys())))
-        sys.exit(1)
+        raise LookupError(f"Unknown source location for '{repo_name or 'unknown'}'. "
+                          f"Known: {', '.join(sorted(repos.keys()))}")
 
     repo_info = repos[repo_name]
     pathname = repo_info['pathname']
@@ -388,10 +314,6 @@ def fetch_source_file(index, format='src'):
     # or could be other extensions
     source_extensions = ['.rst', '.md']
 
-    print(f"\n{BLUE}Fetching from:{RESET} [{index}] {result['title']}")
-    print(f"{BLUE}Repository:{RESET} {repo_name}")
-    print(f"{BLUE}Document:{RESET} {docname}\n")
-
     source_url = None
     content = None
 
@@ -410,7 +332,7 @@ def fetch_source_file(index, format='src'):
         )
 
         try:
-            response = urlopen(test_url)
+            response = http_open(test_url)
             content = response.read().decode('utf-8')
             source_url = test_url
             break
@@ -418,43 +340,18 @@ def fetch_source_file(index, format='src'):
             logger.error(str(e))
 
     if content is None:
-        logger.error(f"Could not fetch source file. Tried extensions: {', '.join(source_extensions)}")
-        print(f"URL: {result['url']}")
-        sys.exit(1)
+        raise LookupError(f"Could not fetch source file. Tried extensions: {', '.join(source_extensions)}. "
+                          f"URL: {result['url']}")
 
     include_pattern = re.compile(r'^\s*\.\.\s+include::\s+(.+?)\s*$', re.MULTILINE)
     lines = [line for line in content.strip().split('\n') if line.strip() and not line.strip().startswith('..') or line.strip().startswith('.. include::')]
 
+    include_path = None
     if len(lines) <= 1:
         match = include_pattern.search(content)
         if match:
             include_path = match.group(1).strip()
-
-            # Resolve the include path relative to the current file
-            # The current file path is like "doc/sphinx/source/drivers/adc/ad405x.rst"
-            # The include path is like "../../../../../drivers/adc/ad405x/README.rst"
-
-            if pathname:
-                current_file_path = f"{pathname}/{docname}"
-            else:
-                current_file_path = docname
-
-            current_dir = '/'.join(current_file_path.split('/')[:-1]) if '/' in current_file_path else ''
-
-            if current_dir:
-                resolved_path = f"{current_dir}/{include_path}"
-            else:
-                resolved_path = include_path
-
-            path_parts = []
-            for part in resolved_path.split('/'):
-                if part == '..':
-                    if path_parts:
-                        path_parts.pop()
-                elif part and part != '.':
-                    path_parts.append(part)
-
-            resolved_path = '/'.join(path_parts)
+            resolved_path = resolve_include_path(pathname, docname, include_path)
 
             included_url = source_hostname_raw.format(
                 repository=repo_name,
@@ -463,144 +360,154 @@ def fetch_source_file(index, format='src'):
             )
 
             try:
-                print(f"{BLUE}Following include directive to:{RESET} {include_path}\n")
-                response = urlopen(included_url)
+                response = http_open(included_url)
                 content = response.read().decode('utf-8')
                 source_url = included_url
             except HTTPError as e:
                 if e.code == 404:
-                    logger.warning("Could not fetch included file (404). Showing original content.")
-                    print(f"Attempted URL: {included_url}\n")
+                    logger.warning(f"Could not fetch included file (404). Showing original content. Attempted URL: {included_url}")
                 else:
                     logger.warning(f"Could not fetch included file (HTTP {e.code}). Showing original content.")
             except (URLError, UnicodeDecodeError) as e:
                 logger.warning(f"Could not fetch included file: {e}. Showing original content.")
 
+    return source_url, content, include_path
+
+
+def fetch_url_content(url, format='md'):
+    """Fetch content from URL in specified format."""
+    if format == 'src':
+        print(error_format_src_not_applicable)
+        print(error_format_src_requires_index_1)
+        print(error_format_src_requires_index_2)
+        sys.exit(1)
+
+    print()
+    print(f"{BLUE}Format:{RESET} {format.upper()}", end='')
+    if format == 'md':
+        print(format_desc_converted_markdown)
+    elif format == 'html':
+        print(" (html)")
+
+    logger.debug(format_available)
+    print(f"\n{BLUE}Fetching:{RESET} {url}\n")
+
+    try:
+        content = get_url_content(url, format)
+    except (URLError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+
     terminal_width, _ = get_terminal_size()
-    print(f"{BLUE}Source URL:{RESET} {source_url}\n")
     print("─" * terminal_width)
     print(content)
 
 
-def get_inventory_cache_path(base_url):
-    """Get cache path for objects.inv based on base URL."""
-    inv_url = base_url.rstrip('/') + '/objects.inv'
-    parsed = urlparse(inv_url)
+def fetch_source_file(index, format='src'):
+    """Fetch and display file from previous search results in specified format."""
+    try:
+        result = get_result(index)
+    except LookupError as e:
+        logger.error(str(e))
+        sys.exit(1)
 
-    parts = [parsed.netloc]
+    result_url = result['url']
 
-    path = parsed.path.strip('/')
-    path = path[:-len("/objects.inv")]
-    parts.append(path.replace('/', '.'))
+    print()
+    print(f"{BLUE}Format:{RESET} {format.upper()}", end='')
+    if format == 'md':
+        print(format_desc_converted_markdown)
+    elif format == 'src':
+        print(format_desc_source_rest_markdown)
+    elif format == 'html':
+        print(" (html)")
+    logger.debug(format_available)
 
-    filename = '.'.join(parts) + '.inv.pickle'
-    return CACHE_DIR / filename
+    if format in ('html', 'md'):
+        print(f"\n{BLUE}Fetching from:{RESET} [{index}] {result['title']}")
+        print(f"{BLUE}URL:{RESET} {result_url}\n")
 
+        try:
+            content = get_url_content(result_url, format)
+        except (URLError, ValueError) as e:
+            logger.error(f"Failed to fetch HTML - {e}")
+            sys.exit(1)
 
-def get_inventory_metadata_path(cache_path):
-    """Get metadata file path for inventory cache."""
-    return cache_path.with_suffix('.meta.json')
+        terminal_width, _ = get_terminal_size()
+        print("─" * terminal_width)
+        print(content)
+        return
 
+    # format == 'src' - fetch source file
+    print(f"\n{BLUE}Fetching from:{RESET} [{index}] {result['title']}")
+    print(f"{BLUE}Repository:{RESET} {result['repo']}")
+    print(f"{BLUE}Document:{RESET} {result['docname']}\n")
 
-def is_inventory_cache_valid(cache_path, remote_last_modified):
-    """Check if inventory cache is valid based on Last-Modified header."""
-    if not cache_path.exists():
-        return False
+    try:
+        source_url, content, include_path = get_source_content(result)
+    except LookupError as e:
+        logger.error(str(e))
+        sys.exit(1)
 
-    if not remote_last_modified:
-        return False
+    if include_path:
+        print(f"{BLUE}Followed include directive to:{RESET} {include_path}\n")
 
-    metadata_path = get_inventory_metadata_path(cache_path)
-    if not metadata_path.exists():
-        return False
+    terminal_width, _ = get_terminal_size()
+    print(f"{BLUE}Source URL:{RESET} {source_url}\n")
+    print("─" * terminal_width)
+    print(content)
 
-    try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to load inventory metadata {metadata_path}: {e}")
-        return False
 
-    if metadata.get('__cache_error__'):
-        return False
+def get_inventory_cache_path(base_url):
+    """Get cache path for objects.inv based on base URL."""
+    inv_url = base_url.rstrip('/') + '/objects.inv'
+    parsed = urlparse(inv_url)
 
-    cached_last_modified_str = metadata.get('last_modified')
-    if not cached_last_modified_str:
-        return False
+    parts = [parsed.netloc]
 
-    cached_last_modified = parsedate_to_datetime(cached_last_modified_str)
+    path = parsed.path.strip('/')
+    path = path[:-len("/objects.inv")]
+    parts.append(path.replace('/', '.'))
 
-    return remote_last_modified <= cached_last_modified
+    filename = '.'.join(parts) + '.inv.bin'
+    return CACHE_DIR / filename
 
 
 def load_inventory_from_cache(cache_path):
-    """Load inventory from cache file."""
-    metadata_path = get_inventory_metadata_path(cache_path)
-
-    if metadata_path.exists():
-        try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                if metadata.get('__cache_error__'):
-                    return None
-        except (json.JSONDecodeError, OSError):
-            pass
-
-    with open(cache_path, 'rb') as f:
-        return pickle.load(f)
+    """Load inventory from cache file, mapped and decoded on first lookup.
 
+    Raises ValueError if the cache file is invalid or outdated.
+    """
+    cache = CacheFile(cache_path)
+    if cache.metadata.get('__cache_error__'):
+        return None
 
-def save_inventory_to_cache(cache_path, inventory, last_modified=None):
-    """Save inventory to cache file with Last-Modified metadata."""
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    return MappedInventory(cache)
 
-    with open(cache_path, 'wb') as f:
-        pickle.dump(inventory, f)
 
-    metadata_path = get_inventory_metadata_path(cache_path)
-    metadata = {}
-    if last_modified:
-        if hasattr(last_modified, 'strftime'):
-            metadata['last_modified'] = last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
-        else:
-            metadata['last_modified'] = str(last_modified)
+def save_inventory_to_cache(cache_path, raw_data, last_modified=None, etag=None):
+    """Save the raw inventory to cache file with ETag and Last-Modified metadata."""
+    metadata = get_cache_metadata(last_modified, etag)
 
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f)
+    MappedInventory.write(cache_path, raw_data, metadata)
 
 
 def save_inventory_error_to_cache(cache_path, error_type, url):
     """Save an error marker for inventory cache."""
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-
-    metadata_path = get_inventory_metadata_path(cache_path)
-
-    error_marker = {
-        '__cache_error__': True,
-        'error_type': error_type,
-        'url': url,
-        'timestamp': time.time()
-    }
-
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(error_marker, f)
+    save_error_to_cache(cache_path, error_type, url)
 
 
-def fetch_search_index(url, remote_last_modified=None):
-    """Fetch and parse searchindex.js from URL, with Last-Modified based caching."""
+def fetch_search_index(url, ttl=CACHE_TTL):
+    """Fetch and parse searchindex.js from URL, cached and revalidated with a conditional GET."""
     cache_path = get_cache_path(url)
+    metadata = read_metadata(cache_path)
 
-    if is_cache_valid(cache_path, remote_last_modified):
-        cached_data = load_from_cache(cache_path)
-        if cached_data is not None:
-            return cached_data
+    if metadata is not None and is_fresh(cache_path, ttl):
+        return load_from_cache(cache_path)
 
+    etag, last_modified = get_cache_validators(metadata)
     try:
-        with urlopen(url, timeout=30) as response:
-            content = response.read().decode('utf-8')
-            if remote_last_modified is None:
-                last_modified_str = response.headers.get('Last-Modified')
-                remote_last_modified = parsedate_to_datetime(last_modified_str) if last_modified_str else None
+        content, etag, last_modified = fetch_conditional(url, etag, last_modified)
     except HTTPError as e:
         if e.code == 404:
             save_error_to_cache(cache_path, '404', url)
@@ -609,62 +516,56 @@ def fetch_search_index(url, remote_last_modified=None):
     except URLError as e:
         raise URLError(f"Failed to fetch {url}: {e.reason}")
 
-    match = re.search(r'Search\.setIndex\((.*)\)', content, re.DOTALL)
+    if content is None:
+        touch(cache_path)
+        cached_data = load_from_cache(cache_path)
+        if cached_data is not None:
+            return cached_data
+        # Cache lost since read, fetch it again
+        content, etag, last_modified = fetch_conditional(url)
+
+    match = re.search(r'Search\.setIndex\((.*)\)', content.decode('utf-8'), re.DOTALL)
     if not match:
         raise ValueError("Could not find Search.setIndex() in searchindex.js")
 
     json_str = match.group(1)
     try:
         data = json.loads(json_str)
-        save_to_cache(cache_path, data, remote_last_modified)
+        save_to_cache(cache_path, data, last_modified, etag)
         return data
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse searchindex.js JSON: {e}")
 
 
-def fetch_intersphinx_inventory(base_url, remote_last_modified=None):
-    """Fetch and parse intersphinx objects.inv file, with Last-Modified based caching."""
+def fetch_intersphinx_inventory(base_url, ttl=CACHE_TTL):
+    """Fetch intersphinx objects.inv file, cached and revalidated with a conditional GET.
+
+    The inventory is decoded on first lookup, see :class:`MappedInventory`.
+    """
     if not base_url.endswith('/'):
         base_url += '/'
 
     inv_url = base_url + 'objects.inv'
     cache_path = get_inventory_cache_path(base_url)
+    metadata = read_metadata(cache_path)
 
-    if is_inventory_cache_valid(cache_path, remote_last_modified):
+    if metadata is not None and is_fresh(cache_path, ttl):
         try:
-            cached_inv = load_inventory_from_cache(cache_path)
-            if cached_inv is not None:
-                return cached_inv
-        except (pickle.UnpicklingError, OSError, EOFError) as e:
+            return load_inventory_from_cache(cache_path)
+        except (OSError, ValueError) as e:
             logger.debug(f"Failed to load inventory cache: {e}")
+            metadata = None
 
-    config = _InvConfig(
-        intersphinx_cache_limit=5,
-        intersphinx_timeout=10,
-        tls_verify=True,
-        tls_cacerts=None,
-        user_agent='',
-    )
-
+    etag, last_modified = get_cache_validators(metadata)
     try:
-        if Version(__sphinx_version__) < Version('9.0.0'):
-            inv = _fetch_inventory(
-                target_uri='',
-                inv_location=inv_url,
-                config=config,
-                srcdir=Path(),
-            )
-        else:
-            raw_data, target_uri = _fetch_inventory_data(
-                target_uri='',
-                inv_location=inv_url,
-                config=config,
-                srcdir=Path(),
-                cache_path=None,
-            )
-            inv = _load_inventory(raw_data, target_uri=target_uri)
-        save_inventory_to_cache(cache_path, inv, remote_last_modified)
-        return inv
+        raw_data, etag, last_modified = fetch_conditional(inv_url, etag, last_modified, timeout=10)
+        if raw_data is None:
+            touch(cache_path)
+            try:
+                return load_inventory_from_cache(cache_path)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Failed to load inventory cache: {e}")
+                raw_data, etag, last_modified = fetch_conditional(inv_url, timeout=10)
     except HTTPError as e:
         if e.code == 404:
             save_inventory_error_to_cache(cache_path, '404', inv_url)
@@ -674,33 +575,41 @@ def fetch_intersphinx_inventory(base_url, remote_last_modified=None):
         logger.debug(f"Failed to fetch inventory {inv_url}: {e.reason}")
         return None
 
+    try:
+        save_inventory_to_cache(cache_path, raw_data, last_modified, etag)
+        return load_inventory_from_cache(cache_path)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Failed to cache inventory {inv_url}: {e}")
+        return None
+
 
 def get_intersphinx_references(inventory, docname, repo_name, base_url):
     """Get intersphinx references for a document."""
-    if not inventory:
-        return {'doc_ref': None, 'label_refs': []}
-
     result = {'doc_ref': None, 'label_refs': []}
+    if not inventory:
+        return result
 
-    if 'std:doc' in inventory.data and docname in inventory.data['std:doc']:
-        if repo_name:
-            result['doc_ref'] = f":external+{repo_name}:doc:`{docname}`"
+    try:
+        items = inventory.lookup(docname)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Failed to decode inventory of {base_url}: {e}")
+        return result
+
+    for item in items:
+        if item.type == 'std:doc':
+            if repo_name:
+                result['doc_ref'] = f":external+{repo_name}:doc:`{docname}`"
+            else:
+                result['doc_ref'] = f":std:doc:`{docname}`"
         else:
-            result['doc_ref'] = f":std:doc:`{docname}`"
-
-    if 'std:label' in inventory.data:
-        doc_uri_prefix = f"{docname}.html#"
+            full_url = urljoin(base_url, item.uri)
 
-        for label_name, inv_item in inventory.data['std:label'].items():
-            if inv_item.uri.startswith(doc_uri_prefix):
-                full_url = urljoin(base_url, inv_item.uri)
-
-                if repo_name:
-                    ref_text = f":external+{repo_name}:ref:`{label_name}`"
-                else:
-                    ref_text = f":std:label:`{label_name}`"
+            if repo_name:
+                ref_text = f":external+{repo_name}:ref:`{item.name}`"
+            else:
+                ref_text = f":std:label:`{item.name}`"
 
-                result['label_refs'].append((ref_text, label_name, full_url))
+            result['label_refs'].append((ref_text, item.name, full_url))
 
     return result
 
@@ -720,45 +629,26 @@ def stem_query(query_terms, stemmer):
     return stemmed
 
 
-def extract_html_text(html_content, anchor=None):
-    """Extract text from HTML content."""
+def get_page_sections(html_content):
+    """Build the section text store of a page, see :meth:`HTMLToChunks.sections`."""
     try:
-        # Try to find [role="main"] section
-        main_match = re.search(r'<[^>]+role=["\']main["\'][^>]*>(.*)',
-                              html_content, re.DOTALL | re.IGNORECASE)
+        return HTMLToChunks().sections(html_content)
+    except ParserError:
+        return '', {}
 
-        if main_match:
-            content = main_match.group(1)
-        else:
-            content = html_content
 
-        # If anchor specified, try to extract that section
-        if anchor:
-            anchor_id = anchor.lstrip('#')
-            patterns = [
-                rf'<[^>]+id=["\']?{re.escape(anchor_id)}["\']?[^>]*>(.*?)(?=<h[1-6][^>]*>|</section>|</div>|$)',
-                rf'id=["\']?{re.escape(anchor_id)}["\']?[^>]*>([^<]*.*?)(?=<h[1-6]|</(?:div|section)|$)',
-            ]
-
-            for pattern in patterns:
-                anchor_match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-                if anchor_match:
-                    content = anchor_match.group(1)
-                    break
-
-        extractor = HTMLTextExtractor()
-        extractor.feed(content)
-        text = extractor.get_text()
-
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
-    except (re.error, ValueError, TypeError, AttributeError):
-        return ""
-
-
-def get_summary(html_content, query_terms, anchor=None, max_chars=480):
-    """Extract a summary from HTML content around the first matching keyword."""
-    text = extract_html_text(html_content, anchor)
+def get_page_summary(url, query_terms, ttl=CACHE_TTL, max_chars=480):
+    """Get the summary of a result page from its cached section text store.
+
+    Raises URLError on failure.
+    """
+    anchor = url.split('#', 1)[1] if '#' in url else None
+    text = _page_cache.get_text(url, anchor, ttl, timeout=10)
+    return format_summary(text, query_terms, max_chars)
+
+
+def format_summary(text, query_terms, max_chars=480):
+    """Format a summary of text around the first matching keyword."""
     if not text:
         return None
 
@@ -792,123 +682,309 @@ def get_summary(html_content, query_terms, anchor=None, max_chars=480):
     return summary
 
 
-def search_index(index_data, query_terms, stemmer):
-    """Search the index for query terms."""
-    results = {}
+def get_compiled_index_path(urls):
+    """Get the compiled index path for a set of searchindex.js URLs."""
+    digest = hashlib.md5('\n'.join(sorted(urls)).encode()).hexdigest()
+    return CACHE_DIR / f'compiled.{digest}.pickle'
 
-    docnames = index_data.get('docnames', [])
-    titles = index_data.get('titles', [])
-    alltitles = index_data.get('alltitles', {})
-    titleterms = index_data.get('titleterms', {})
-    terms = index_data.get('terms', {})
-
-    # Stem query terms
-    stemmed_terms = stem_query(query_terms, stemmer)
-    if not stemmed_terms:
-        return results
-
-    query_lower = ' '.join(term.lower() for term in query_terms)
-
-    # 1. Search in alltitles (exact and partial title matches)
-    for title_text, occurrences in alltitles.items():
-        title_lower = title_text.lower()
-
-        # Check for exact match of full query
-        if query_lower in title_lower:
-            score = SCORE_TITLE
-            if query_lower == title_lower:
-                score = SCORE_TITLE + 5  # Bonus for exact match
-            elif title_lower.startswith(query_lower):
-                score = SCORE_TITLE + 2  # Bonus for prefix match
-            else:
-                score = SCORE_PARTIAL_TITLE
 
-            for file_id, anchor in occurrences:
-                if file_id < len(docnames):
-                    docname = docnames[file_id]
-                    key = (docname, anchor)
-                    if key not in results or results[key][1] < score:
-                        results[key] = (title_text, score)
+def get_compiled_index_signature(urls):
+    """Identify the cached search indexes of the URLs by their validators.
 
-        # Check for individual term matches in title
-        else:
-            matched_terms = sum(1 for term in query_terms if term.lower() in title_lower)
-            if matched_terms > 0:
-                # Score based on proportion of query terms found
-                score = int(SCORE_PARTIAL_TITLE * (matched_terms / len(query_terms)))
-                for file_id, anchor in occurrences:
-                    if file_id < len(docnames):
-                        docname = docnames[file_id]
-                        key = (docname, anchor)
-                        if key not in results or results[key][1] < score:
-                            results[key] = (title_text, score)
-
-    # 2. Search in titleterms (stemmed title keywords)
-    for stemmed_term in stemmed_terms:
-        if stemmed_term in titleterms:
-            file_ids = titleterms[stemmed_term]
-            if isinstance(file_ids, list):
-                for file_id in file_ids:
-                    if file_id < len(titles) and file_id < len(docnames):
-                        title = titles[file_id]
-                        docname = docnames[file_id]
-                        key = (docname, None)
-                        score = SCORE_PARTIAL_TITLE
-                        if key not in results or results[key][1] < score:
-                            results[key] = (title, score)
-
-    # 3. Search in terms (full-text stemmed keywords)
-    for stemmed_term in stemmed_terms:
-        if stemmed_term in terms:
-            file_ids = terms[stemmed_term]
-            if isinstance(file_ids, list):
-                for file_id in file_ids:
-                    if file_id < len(titles) and file_id < len(docnames):
-                        title = titles[file_id]
-                        docname = docnames[file_id]
-                        key = (docname, None)
-                        # Only add if not already found with higher score
-                        score = SCORE_TERM
-                        if key not in results or results[key][1] < score:
-                            results[key] = (title, score)
+    Returns None if any of them is not cached on disk.
+    """
+    signature = []
+    for url in sorted(urls):
+        metadata = read_metadata(get_cache_path(url))
+        if not metadata or metadata.get('__cache_error__'):
+            return None
+        signature.append((url, metadata.get('etag'), metadata.get('last_modified'),
+                          metadata.get('fetched')))
+    return tuple(signature)
 
-    return results
+
+def get_compiled_index(repo_data_map):
+    """Get the compiled index of the fetched repos.
+
+    The saved index is updated in place with the pages changed in the repos
+    refreshed since, and rebuilt only when too many pages were removed.
+    """
+    urls = [url for url, data in repo_data_map.items() if data[0] is not None]
+    path = get_compiled_index_path(urls)
+    signature = get_compiled_index_signature(urls)
+
+    index = load_compiled_index(path) if signature else None
+    if index is not None and index.signature == signature:
+        return index
+
+    if index is not None and set(index.repos) == set(urls):
+        previous = dict(zip(sorted(urls), index.signature or ()))
+        for url, source in zip(sorted(urls), signature):
+            if previous.get(url) != source:
+                added, removed = index.update(url, repo_data_map[url][0])
+                logger.debug(f"Updated {url}: {added} pages added, {removed} removed")
+        index.signature = signature
+
+    if index is None or index.signature != signature or index.needs_rebuild:
+        index = CompiledIndex.build(((url, repo_data_map[url][0]) for url in urls), signature)
+
+    if signature:
+        try:
+            save_compiled_index(path, index)
+        except OSError as e:
+            logger.debug(f"Failed to save compiled index {path}: {e}")
+    return index
+
+
+def get_repo_sources(repo=None, url=None):
+    """Get the (repo name, searchindex.js URL) pairs to search.
+
+    Searches all known repositories if neither repo nor url are given.
+    Raises ValueError on conflicting arguments or unknown repositories.
+    """
+    if url and repo:
+        raise ValueError("Cannot specify both --url and --repo")
+
+    if url:
+        if not url.endswith('searchindex.js'):
+            if not url.endswith('/'):
+                url += '/'
+            url += 'searchindex.js'
+        return [(None, url)]
+
+    if not repo or repo.strip() == 'all':
+        repo_names = sorted(repos.keys())
+    else:
+        repo_names = [r.strip() for r in repo.split(',')]
+
+        unknown_repos = [r for r in repo_names if r not in repos]
+        if unknown_repos:
+            raise ValueError(f"Unknown repository(ies): {' '.join(unknown_repos)}")
+
+    return [(repo_name, f"{remote_doc}{repo_name}/searchindex.js") for repo_name in repo_names]
 
 
-def format_results_sync(results, base_url, limit):
-    """Format and sort search results (without summaries)."""
-    formatted = []
+def load_repo_data(repo_sources, ttl=CACHE_TTL):
+    """Fetch the indexes and inventories of the repos, or load them from cache.
 
-    for (docname, anchor), (title, score) in results.items():
-        url = urljoin(base_url, f"{docname}.html")
+    Cached copies older than ttl seconds are revalidated with a conditional GET.
+    Returns the per-repo data and their compiled index.
+    """
+    repo_data_map = fetch_repo_data_batch(repo_sources, ttl)
+
+    return repo_data_map, get_compiled_index(repo_data_map)
+
+
+def query_repo_data(repo_sources, repo_data_map, index, query, limit=None):
+    """Rank the results of query over loaded repos.
+
+    Intersphinx references are resolved only for the first limit results.
+    Returns the total number of results and the ranked results.
+    """
+    stemmer = snowballstemmer.stemmer('porter')
+    results = index.search(query, stem_query(query, stemmer))
+
+    ranked = sorted(results.items(), key=lambda x: (-x[1][1], x[1][0].lower()))
+    total = len(ranked)
+    if limit is not None:
+        ranked = ranked[:limit]
+
+    repo_info = {repo_url: repo_name for repo_name, repo_url in repo_sources}
+    all_results = []
+    for (repo_url, docname, anchor), (title, score) in ranked:
+        repo_name = repo_info.get(repo_url)
+        _, inventory, base_url = repo_data_map[repo_url]
+        result_url = urljoin(base_url, f"{docname}.html")
         if anchor:
-            url += f"#{anchor}"
+            result_url += f"#{anchor}"
+
+        refs = get_intersphinx_references(inventory, docname, repo_name, base_url)
+
+        all_results.append({
+            'repo': repo_name,
+            'title': title,
+            'url': result_url,
+            'score': score,
+            'anchor': anchor,
+            'docname': docname,
+            'doc_ref': refs['doc_ref'],
+            'label_refs': refs['label_refs']
+        })
+
+    return total, all_results
+
+
+class SearchState:
+    """Loaded repos and compiled indexes, kept in memory.
+
+    Repos loaded more than max_age seconds ago, or more than the ttl of the
+    access, are reloaded on access.
+    """
+
+    def __init__(self, max_age=None):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._loaded = {}
+
+    def get(self, repo_sources, ttl=CACHE_TTL):
+        key = tuple(tuple(source) for source in repo_sources)
+        max_age = ttl if self.max_age is None else min(ttl, self.max_age)
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is None or time.monotonic() - entry[0] >= max_age:
+                entry = self._loaded[key] = (time.monotonic(), load_repo_data(key, ttl))
+            return entry[1]
+
+    def query(self, request):
+        """Answer a daemon request."""
+        repo_sources = [tuple(source) for source in request['sources']]
+        repo_data_map, index = self.get(repo_sources, request.get('ttl', CACHE_TTL))
+        total, results = query_repo_data(repo_sources, repo_data_map, index,
+                                         request['query'], request.get('limit'))
+        return {'total': total, 'results': results}
+
+    def refresh(self):
+        """Reload the repos, revalidating every cached copy."""
+        with self._lock:
+            keys = list(self._loaded)
+        for key in keys:
+            data = load_repo_data(key, ttl=0)
+            with self._lock:
+                self._loaded[key] = (time.monotonic(), data)
+
+
+# Shared by in-process searches
+_state = SearchState(max_age=DAEMON_REFRESH)
+_page_cache = PageCache(PAGE_CACHE_DIR, index_page=get_page_sections)
+
+
+def run_daemon():
+    """Serve searches from memory until interrupted."""
+    state = SearchState()
+    repo_sources = [(name, f"{remote_doc}{name}/searchindex.js") for name in sorted(repos.keys())]
+    print(f"Loading {len(repo_sources)} repositories...")
+    state.get(repo_sources)
+
+    try:
+        server = DaemonServer(DAEMON_SOCKET, state.query, state.refresh, DAEMON_REFRESH)
+    except OSError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    def signal_handler(sig, frame):
+        # shutdown() waits for serve_forever(), running in this thread
+        threading.Thread(target=server.shutdown).start()
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    print(f"Search daemon listening on {DAEMON_SOCKET}, refreshing every {DAEMON_REFRESH} s")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def query_repos(repo_sources, query, limit=None, ttl=CACHE_TTL):
+    """Rank the results of query, through the daemon if it is running."""
+    response = daemon_request(DAEMON_SOCKET, {'sources': repo_sources,
+                                              'query': list(query),
+                                              'limit': limit,
+                                              'ttl': ttl})
+    if response is not None and 'results' in response:
+        return response['total'], response['results']
+
+    repo_data_map, index = _state.get(repo_sources, ttl)
+    return query_repo_data(repo_sources, repo_data_map, index, query, limit)
+
+
+def search_docs(query, repo=None, url=None, limit=10, summaries=True, ttl=CACHE_TTL):
+    """Search the docs and return the results as data.
+
+    In-process counterpart of ``adoc search``: nothing is printed, loaded
+    repos are kept in memory between calls, and the results are saved so
+    ``adoc search --fetch`` and :func:`fetch_docs` can refer to them by index.
+
+    :param query: Query terms
+    :param repo: Repository name(s), comma-separated, or 'all'
+    :param url: Explicit url to the documentation
+    :param limit: Maximum number of results
+    :param summaries: Fetch a summary of each result
+    :param ttl: Seconds during which cached indexes are used without revalidation
+    :return: Dict with the query, total number of results and the results
+    :raises ValueError: On conflicting arguments or unknown repositories
+    """
+    repo_sources = get_repo_sources(repo, url)
+    query = split_strings_in_tuple(tuple(query))
+    total, results = query_repos(repo_sources, query, limit, ttl)
+
+    if summaries and results:
+        def summarize(result):
+            try:
+                summary = get_page_summary(result['url'], query, ttl)
+            except URLError:
+                summary = None
+            return strip_ansi(summary) if summary else None
 
-        formatted.append((title, url, score))
+        with ThreadPoolExecutor(max_workers=min(len(results), 10)) as executor:
+            for result, summary in zip(results, executor.map(summarize, results)):
+                result['summary'] = summary
 
-    formatted.sort(key=lambda x: (-x[2], x[0].lower()))
+    save_search_results([(r['title'], r['url'], r['score'], r['repo'], r['doc_ref'],
+                          r['label_refs'], r['docname']) for r in results])
 
-    return formatted[:limit]
+    for i, result in enumerate(results):
+        result['index'] = i
+        result['label_refs'] = [ref_text for ref_text, _, _ in result['label_refs']]
 
+    return {'query': ' '.join(query), 'total': total, 'results': results}
 
-async def fetch_single_summary(url, query_terms, anchor, executor):
+
+def fetch_docs(target, format='md'):
+    """Fetch a page, or the source of a previous result, and return it as data.
+
+    In-process counterpart of ``adoc search --fetch``.
+
+    :param target: Index of a previous search result, or a full URL
+    :param format: 'md' (converted to Markdown), 'html' or 'src'
+    :return: Dict with the url, source_url (for 'src') and content
+    :raises LookupError: If there is no such result or source file
+    :raises URLError: On fetch failures
+    :raises ValueError: On invalid arguments
+    """
+    if isinstance(target, str) and target.startswith(('http://', 'https://')):
+        if format == 'src':
+            raise ValueError(f"{error_format_src_not_applicable} {error_format_src_requires_index_1} "
+                             f"{error_format_src_requires_index_2}")
+        return {'url': target, 'content': get_url_content(target, format)}
+
+    result = get_result(int(target))
+    if format == 'src':
+        source_url, content, _ = get_source_content(result)
+        return {'title': result['title'], 'url': result['url'],
+                'source_url': source_url, 'content': content}
+
+    return {'title': result['title'], 'url': result['url'],
+            'content': get_url_content(result['url'], format)}
+
+
+async def fetch_single_summary(url, query_terms, anchor, executor, ttl=CACHE_TTL):
     """Fetch and extract summary for a single result."""
     loop = asyncio.get_event_loop()
 
     def fetch_sync():
         try:
-            with urlopen(url, timeout=10) as response:
-                html_content = response.read().decode('utf-8')
-                return get_summary(html_content, query_terms, anchor)
-        except HTTPError:
+            return get_page_summary(url, query_terms, ttl)
+        except URLError:
             return None
 
     return await loop.run_in_executor(executor, fetch_sync)
 
 
-async def update_result_summary(result_num, url, query_terms, anchor, result_line_counts, terminal_width, executor):
+async def update_result_summary(result_num, url, query_terms, anchor, result_line_counts, terminal_width, executor,
+                                ttl=CACHE_TTL):
     """Fetch summary and update the display for one result."""
-    summary = await fetch_single_summary(url, query_terms, anchor, executor)
+    summary = await fetch_single_summary(url, query_terms, anchor, executor, ttl)
 
     if not sys.stdout.isatty():
         if summary:
@@ -960,7 +1036,8 @@ async def update_result_summary(result_num, url, query_terms, anchor, result_lin
     move_cursor_down(lines_back - 1)
 
 
-async def fetch_and_display_summaries(formatted_results, query_terms, base_url, result_line_counts, terminal_width):
+async def fetch_and_display_summaries(formatted_results, query_terms, base_url, result_line_counts, terminal_width,
+                                      ttl=CACHE_TTL):
     """Fetch summaries asynchronously and update display."""
     with ThreadPoolExecutor(max_workers=10) as executor:
         tasks = []
@@ -970,7 +1047,7 @@ async def fetch_and_display_summaries(formatted_results, query_terms, base_url,
                 url_parts = url.split('#', 1)
                 anchor = '#' + url_parts[1]
 
-            task = update_result_summary(i, url, query_terms, anchor, result_line_counts, terminal_width, executor)
+            task = update_result_summary(i, url, query_terms, anchor, result_line_counts, terminal_width, executor, ttl)
             tasks.append(task)
 
         await asyncio.gather(*tasks)
@@ -1002,6 +1079,12 @@ def search():
         # Fetch by url
         adoc search --fetch https://analogdevicesinc.github.io/.../index.html
 
+        # Revalidate the cached indexes on every search
+        adoc search --ttl 0 -- axi
+
+        # Keep the indexes in memory, used by later searches while running
+        adoc search --daemon
+
     Format options:
         html: Page html
         src:  Source file (.rst or .md)
@@ -1009,6 +1092,10 @@ def search():
     """
     args = get_arguments_search()
 
+    if args.daemon:
+        run_daemon()
+        return
+
     if args.fetch is not None:
         if isinstance(args.fetch, str) and (args.fetch.startswith('http://') or args.fetch.startswith('https://')):
             fetch_url_content(args.fetch, format=args.format)
@@ -1026,102 +1113,33 @@ def search():
         logger.error("Query is required")
         sys.exit(1)
 
-    if args.url and args.repo:
-        logger.error("Cannot specify both --url and --repo")
-        sys.exit(1)
-
-    url = args.url
-    repo = args.repo
-    if url and not url.endswith('searchindex.js'):
-        if not url.endswith('/'):
-            url += '/'
-        url += 'searchindex.js'
-
-    if not url and not repo:
-        repo = 'all'
-
     limit = args.limit
     if limit is None:
         limit = calculate_limit_from_terminal()
 
-    repo_sources = []  # List of (repo_name, url) tuples
-    if repo:
-        if repo.strip() == 'all':
-            repo_names = sorted(repos.keys())
-            print(f"Searching {len(repo_names)} repositories...")
-        else:
-            repo_names = [r.strip() for r in repo.split(',')]
-
-            unknown_repos = [r for r in repo_names if r not in repos]
-            if unknown_repos:
-                logger.error(f"Unknown repository(ies): {' '.join(unknown_repos)}")
-                print(f"Available repositories: {' '.join(sorted(repos.keys()))}")
-                sys.exit(1)
-
-        for repo_name in repo_names:
-            repo_url = f"{remote_doc}{repo_name}/searchindex.js"
-            repo_sources.append((repo_name, repo_url))
-    else:
-        repo_sources = [(None, url)]
+    try:
+        repo_sources = get_repo_sources(args.repo, args.url)
+    except ValueError as e:
+        logger.error(str(e))
+        if args.repo and not args.url:
+            print(f"Available repositories: {' '.join(sorted(repos.keys()))}")
+        sys.exit(1)
+    if len(repo_sources) > 1 and (not args.repo or args.repo.strip() == 'all'):
+        print(f"Searching {len(repo_sources)} repositories...")
 
     # At this time, don't allow multiword exact match.
     query = split_strings_in_tuple(tuple(args.query))
     query_str = ' '.join(query)
 
-    stemmer = snowballstemmer.stemmer('porter')
-
     try:
-        all_results = []
-
-        urls_to_check = []
-        for repo_name, repo_url in repo_sources:
-            urls_to_check.append(repo_url)  # searchindex.js URL
-            base_url = get_base_url(repo_url)
-            urls_to_check.append(base_url + 'objects.inv')  # objects.inv URL
-
-        last_modified_map = fetch_batch(urls_to_check, fetch_last_modified)
-
-        repo_data_map = fetch_repo_data_batch(repo_sources, last_modified_map)
-
-        for repo_name, repo_url in repo_sources:
-            data = repo_data_map.get(repo_url)
-            if data is None:
-                continue
-
-            index_data, inventory, base_url = data
-            if index_data is None:
-                continue
-
-            results = search_index(index_data, query, stemmer)
-
-            for (docname, anchor), (title, score) in results.items():
-                result_url = urljoin(base_url, f"{docname}.html")
-                if anchor:
-                    result_url += f"#{anchor}"
-
-                refs = get_intersphinx_references(inventory, docname, repo_name, base_url)
-
-                all_results.append({
-                    'repo': repo_name,
-                    'title': title,
-                    'url': result_url,
-                    'score': score,
-                    'anchor': anchor,
-                    'docname': docname,
-                    'doc_ref': refs['doc_ref'],
-                    'label_refs': refs['label_refs']
-                })
+        total, all_results = query_repos(repo_sources, query, limit, args.ttl * 60)
 
         if not all_results:
             print(f"\nNo results found for \"{query_str}\"")
             return
 
-        all_results.sort(key=lambda x: (-x['score'], x['title'].lower()))
-        total = len(all_results)
         print(f"\nFound {total} result{'s' if total != 1 else ''} for \"{query_str}\"")
 
-        all_results = all_results[:limit]
-
         formatted_results = [(r['title'], r['url'], r['score'], r['repo'], r['doc_ref'], r['label_refs'], r['docname']) for r in all_results]
         showing = len(formatted_results)
 
@@ -1245,7 +1263,8 @@ def search():
         save_search_results(formatted_results)
 
         formatted_for_async = [(title, url, score) for title, url, score, _, _, _, _ in formatted_results]
-        asyncio.run(fetch_and_display_summaries(formatted_for_async, query, None, result_line_counts, terminal_width))
+        asyncio.run(fetch_and_display_summaries(formatted_for_async, query, None, result_line_counts, terminal_width,
+                                                args.ttl * 60))
 
         if sys.stdout.isatty():
             print()
@@ -1,6 +1,7 @@
 """Shared utilities for search commands."""
 from __future__ import annotations
 
+import base64
 import hashlib
 import json
 import logging
@@ -8,18 +9,25 @@ import os
 import re
 import shutil
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from email.utils import parsedate_to_datetime
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from io import BytesIO
 from pathlib import Path
-from typing import Callable, TypeVar
+from typing import Callable
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from urllib.parse import unquote, urljoin, urlsplit, urlunsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 
-logger = logging.getLogger(__name__)
+try:
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    httpx = None
 
-T = TypeVar('T')
+logger = logging.getLogger(__name__)
 
 STOPWORDS = {
     'a', 'and', 'are', 'as', 'at',
@@ -370,6 +378,499 @@ class HttpCache:
             json.dump(error_marker, f)
 
 
+class PageCache:
+    """Content-addressed on-disk cache of fetched pages.
+
+    Each URL entry records the validators of the last response and the
+    SHA-256 digest of its content; the content is stored once per digest,
+    with its section text store built by index_page cached alongside.
+    Entries younger than the ttl are served without a request, older ones
+    are revalidated with a conditional GET.
+    Content files are bumped on access and evicted least recently used
+    first once they exceed max_size bytes.
+
+    :param cache_dir: Directory for cache files
+    :param max_size: Maximum size of the stored content in bytes
+    :param index_page: Function building the section text store of a page,
+        from its html to a tuple of (text, {anchor: (start, end)})
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int = 64 * 1024 * 1024,
+                 index_page: Callable[[str], tuple[str, dict]] | None = None) -> None:
+        """Initialize the page cache.
+
+        :param cache_dir: Directory for cache files
+        :param max_size: Maximum size of the stored content in bytes
+        :param index_page: Function building the section text store of a page
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.index_page = index_page
+
+    def get_entry_path(self, url: str) -> Path:
+        """Get the entry path of a URL, without fragment.
+
+        :param url: Page URL
+        :return: Path to the entry file
+        """
+        url = url.split('#', 1)[0]
+        return self.cache_dir / 'urls' / f'{hashlib.md5(url.encode()).hexdigest()}.json'
+
+    def get_blob_path(self, digest: str, suffix: str = '.html') -> Path:
+        """Get the path of stored content by digest.
+
+        :param digest: SHA-256 hex digest of the content
+        :param suffix: '.html' for the content, '.sections.json' for its
+            section text store
+        :return: Path to the content file
+        """
+        return self.cache_dir / 'blobs' / digest[:2] / f'{digest}{suffix}'
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def _load_entry(self, entry_path: Path) -> dict | None:
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_blob(self, digest: str) -> bytes | None:
+        blob_path = self.get_blob_path(digest)
+        try:
+            content = blob_path.read_bytes()
+        except OSError:
+            return None
+        touch(blob_path)
+        return content
+
+    def get(self, url: str, ttl: float = 0, timeout: int = 30) -> tuple[str, bytes]:
+        """Get a page through the cache.
+
+        :param url: Page URL, the fragment is ignored
+        :param ttl: Seconds during which the cache is used without a request
+        :param timeout: Request timeout in seconds
+        :return: Tuple of (digest, content)
+        :raises HTTPError: On HTTP error responses
+        :raises URLError: On connection failures
+        """
+        url = url.split('#', 1)[0]
+        entry_path = self.get_entry_path(url)
+        entry = self._load_entry(entry_path)
+
+        if entry is not None and is_fresh(entry_path, ttl):
+            content = self._read_blob(entry['digest'])
+            if content is not None:
+                return entry['digest'], content
+
+        etag = last_modified = None
+        if entry is not None:
+            etag, last_modified = entry.get('etag'), entry.get('last_modified')
+        content, etag, last_modified = fetch_conditional(url, etag, last_modified, timeout)
+        if content is None:
+            content = self._read_blob(entry['digest'])
+            if content is not None:
+                touch(entry_path)
+                return entry['digest'], content
+            content, etag, last_modified = fetch_conditional(url, timeout=timeout)
+
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self.get_blob_path(digest)
+        if not blob_path.exists():
+            self._write(blob_path, content)
+            if self.index_page is not None:
+                self._build_sections(digest, content)
+        entry = {'url': url, 'digest': digest, 'etag': etag,
+                 'last_modified': last_modified}
+        self._write(entry_path, json.dumps(entry).encode())
+        self.evict()
+        return digest, content
+
+    def _build_sections(self, digest: str, content: bytes) -> dict:
+        try:
+            text, anchors = self.index_page(content.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError) as e:
+            logger.debug(f"Failed to index page {digest}: {e}")
+            text, anchors = '', {}
+        sections = {'text': text, 'anchors': anchors}
+        self._write(self.get_blob_path(digest, '.sections.json'),
+                    json.dumps(sections).encode())
+        return sections
+
+    def get_sections(self, url: str, ttl: float = 0, timeout: int = 30) -> dict:
+        """Get the section text store of a page through the cache.
+
+        The store is built once per content, when the page is fetched.
+
+        :param url: Page URL, the fragment is ignored
+        :param ttl: Seconds during which the cache is used without a request
+        :param timeout: Request timeout in seconds
+        :return: Dict with the page 'text' and the 'anchors' mapping each
+            anchor to the [start, end] offsets of its section
+        :raises HTTPError: On HTTP error responses
+        :raises URLError: On connection failures
+        """
+        digest, content = self.get(url, ttl, timeout)
+        try:
+            with open(self.get_blob_path(digest, '.sections.json'), 'rb') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return self._build_sections(digest, content)
+
+    def get_text(self, url: str, anchor: str | None = None,
+                 ttl: float = 0, timeout: int = 30) -> str:
+        """Get the plain text of a page section through the cache.
+
+        :param url: Page URL, the fragment is ignored
+        :param anchor: Section anchor, None or unknown for the whole page
+        :param ttl: Seconds during which the cache is used without a request
+        :param timeout: Request timeout in seconds
+        :return: Plain text
+        :raises HTTPError: On HTTP error responses
+        :raises URLError: On connection failures
+        """
+        sections = self.get_sections(url, ttl, timeout)
+        text = sections['text']
+        if anchor and anchor in sections['anchors']:
+            start, end = sections['anchors'][anchor]
+            return text[start:end]
+        return text
+
+    def evict(self) -> None:
+        """Remove the least recently used content over max_size bytes."""
+        blobs = []
+        total = 0
+        for path in (self.cache_dir / 'blobs').glob('*/*.html'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            blobs.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        if total <= self.max_size:
+            return
+
+        blobs.sort()
+        for _, size, path in blobs:
+            if total <= self.max_size:
+                break
+            for stale in (path, path.with_name(path.name[:-len('.html')] + '.sections.json')):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+            total -= size
+
+
+def format_http_date(value: datetime | str) -> str:
+    """Format a datetime as an HTTP date, strings are kept as is.
+
+    :param value: Datetime or HTTP date string
+    :return: HTTP date string
+    """
+    if hasattr(value, 'strftime'):
+        return value.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    return str(value)
+
+
+def is_fresh(cache_path: Path, ttl: float) -> bool:
+    """Check if a cache file was written or touched within ttl seconds.
+
+    :param cache_path: Path to the cache file
+    :param ttl: Freshness lifetime in seconds, 0 to always revalidate
+    :return: True if the cache can be used without a request
+    """
+    if not ttl or ttl <= 0:
+        return False
+    try:
+        return time.time() - cache_path.stat().st_mtime < ttl
+    except OSError:
+        return False
+
+
+def touch(cache_path: Path) -> None:
+    """Mark a cache file as fresh by updating its modification time.
+
+    :param cache_path: Path to the cache file
+    """
+    try:
+        os.utime(cache_path)
+    except OSError as e:
+        logger.debug(f"Failed to touch {cache_path}: {e}")
+
+
+class HttpResponse:
+    """Response of a pooled request, read in full.
+
+    Mirrors the parts of the urllib response used by the fetchers.
+    """
+
+    def __init__(self, url: str, status: int, headers, body: bytes) -> None:
+        """Wrap a read response.
+
+        :param url: Final URL, after redirects
+        :param status: HTTP status code
+        :param headers: Case-insensitive response headers
+        :param body: Response body
+        """
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    def read(self) -> bytes:
+        return self._body
+
+    def geturl(self) -> str:
+        return self.url
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+class HttpPool:
+    """Keep-alive HTTP(S) connections shared by the search fetches.
+
+    Idle connections are kept per host and reused by the next request to
+    the same host, so only the first request pays the TCP and TLS setup.
+    At most max_per_host requests to a host are in flight, the others wait
+    for a free connection.
+    If httpx is installed with HTTP/2 support, requests are multiplexed
+    over a single HTTP/2 connection per host instead.
+    Proxies are taken from the environment, as urlopen: http URLs are
+    requested from the proxy, https URLs are tunneled through it.
+
+    :param max_per_host: Maximum concurrent requests per host
+    :param http2: Use HTTP/2, by default if httpx supports it
+    :param max_redirects: Maximum redirects followed per request
+    """
+
+    redirects = (301, 302, 303, 307, 308)
+
+    def __init__(self, max_per_host: int = 8, http2: bool | None = None,
+                 max_redirects: int = 5) -> None:
+        """Initialize an empty pool.
+
+        :param max_per_host: Maximum concurrent requests per host
+        :param http2: Use HTTP/2, by default if httpx supports it
+        :param max_redirects: Maximum redirects followed per request
+        """
+        self.max_per_host = max_per_host
+        self.http2 = httpx is not None and http2 is not False
+        self.max_redirects = max_redirects
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._slots = {}
+        self._client = None
+        self._proxies = getproxies()
+
+    def _slot(self, key: tuple) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _proxy(self, parts) -> tuple | None:
+        """Get the proxy of a URL.
+
+        :return: Tuple of (host, port, authorization), None to connect directly
+        """
+        proxy = self._proxies.get(parts.scheme)
+        if not proxy or proxy_bypass(parts.netloc):
+            return None
+        if '://' not in proxy:
+            proxy = f'http://{proxy}'
+        proxy = urlsplit(proxy)
+        authorization = None
+        if proxy.username is not None:
+            credentials = f'{unquote(proxy.username)}:{unquote(proxy.password or "")}'
+            authorization = f'Basic {base64.b64encode(credentials.encode()).decode()}'
+        port = proxy.port or (443 if proxy.scheme == 'https' else 80)
+        return proxy.hostname, port, authorization
+
+    def _connection(self, key: tuple, timeout: float):
+        """Get an idle connection to the host, or a new one.
+
+        :return: Tuple of (connection, reused)
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        scheme, host, port, proxy = key
+        cls = HTTPSConnection if scheme == 'https' else HTTPConnection
+        if proxy is None:
+            return cls(host, port, timeout=timeout), False
+        proxy_host, proxy_port, authorization = proxy
+        conn = cls(proxy_host, proxy_port, timeout=timeout)
+        if scheme == 'https':
+            conn.set_tunnel(host, port, headers={'Proxy-Authorization': authorization}
+                            if authorization else None)
+        return conn, False
+
+    def _http2_client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(http2=True)
+            return self._client
+
+    def _send(self, url: str, method: str, headers: dict, timeout: float) -> tuple:
+        """Send a single request, without following redirects.
+
+        :return: Tuple of (status, reason, headers, body)
+        :raises URLError: On connection failures
+        """
+        parts = urlsplit(url)
+        # httpx takes the proxies from the environment itself
+        proxy = None if self.http2 else self._proxy(parts)
+        key = (parts.scheme, parts.hostname, parts.port, proxy)
+        with self._slot(key):
+            if self.http2:
+                try:
+                    response = self._http2_client().request(method, url, headers=headers,
+                                                            timeout=timeout)
+                except httpx.TransportError as e:
+                    raise URLError(e) from e
+                return (response.status_code, response.reason_phrase, response.headers,
+                        response.content)
+
+            if proxy is not None and parts.scheme == 'http':
+                # The proxy gets the absolute URI
+                path = urlunsplit(parts._replace(path=parts.path or '/', fragment=''))
+                if proxy[2]:
+                    headers = {**headers, 'Proxy-Authorization': proxy[2]}
+            else:
+                path = parts.path or '/'
+                if parts.query:
+                    path += f'?{parts.query}'
+            while True:
+                conn, reused = self._connection(key, timeout)
+                try:
+                    conn.request(method, path, headers=headers)
+                    response = conn.getresponse()
+                    body = response.read()
+                except (HTTPException, OSError) as e:
+                    conn.close()
+                    # The server may close idle connections at any time
+                    if reused and not isinstance(e, TimeoutError):
+                        continue
+                    raise URLError(e) from e
+                if response.will_close:
+                    conn.close()
+                else:
+                    with self._lock:
+                        self._idle.setdefault(key, []).append(conn)
+                return response.status, response.reason, response.headers, body
+
+    def request(self, url: str, headers: dict[str, str] | None = None,
+                method: str = 'GET', timeout: float = 30) -> HttpResponse:
+        """Send a request, following redirects.
+
+        :param url: HTTP(S) URL
+        :param headers: Request headers
+        :param method: HTTP method
+        :param timeout: Socket timeout in seconds
+        :return: The response, read in full
+        :raises HTTPError: On responses other than 2xx, as urlopen
+        :raises URLError: On connection failures
+        """
+        # Request.header_items() capitalizes the names, as User-agent
+        headers = {'User-Agent': 'adoc-search/1.0',
+                   **{k.title(): v for k, v in (headers or {}).items()}}
+        for _ in range(self.max_redirects + 1):
+            status, reason, response_headers, body = self._send(url, method, headers, timeout)
+            location = response_headers.get('Location')
+            if status not in self.redirects or not location:
+                break
+            url = urljoin(url, location)
+            if status == 303:
+                method = 'GET'
+        if not 200 <= status < 300:
+            raise HTTPError(url, status, reason, response_headers, BytesIO(body))
+        return HttpResponse(url, status, response_headers, body)
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_http_pool = HttpPool()
+
+
+def http_open(request: str | Request, timeout: float = 30) -> HttpResponse:
+    """Open a URL through the shared connection pool, as urlopen would.
+
+    URLs other than http and https are opened with urlopen.
+
+    :param request: URL or Request
+    :param timeout: Socket timeout in seconds
+    :return: The response, read in full
+    :raises HTTPError: On HTTP error responses
+    :raises URLError: On connection failures
+    """
+    if isinstance(request, Request):
+        url = request.full_url
+        method = request.get_method()
+        headers = dict(request.header_items())
+    else:
+        url, method, headers = request, 'GET', {}
+    if urlsplit(url).scheme not in ('http', 'https'):
+        return urlopen(request, timeout=timeout)
+    return _http_pool.request(url, headers, method, timeout)
+
+
+def fetch_conditional(url: str, etag: str | None = None,
+                      last_modified: str | None = None,
+                      timeout: int = 30) -> tuple[bytes | None, str | None, str | None]:
+    """GET url, conditional on the validators of a cached copy.
+
+    Sends If-None-Match and If-Modified-Since so an unchanged resource
+    costs a single 304 response instead of a HEAD plus a GET.
+
+    :param url: URL to fetch
+    :param etag: ETag of the cached copy
+    :param last_modified: Last-Modified header of the cached copy
+    :param timeout: Request timeout in seconds
+    :return: Tuple of (content, etag, last_modified); content is None if
+        the cached copy is still valid
+    :raises HTTPError: On HTTP error responses
+    :raises URLError: On connection failures
+    """
+    headers = {'User-Agent': 'adoc-search/1.0'}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        with http_open(Request(url, headers=headers), timeout=timeout) as response:
+            return (response.read(), response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'))
+    except HTTPError as e:
+        if e.code == 304:
+            return (None, e.headers.get('ETag') or etag,
+                    e.headers.get('Last-Modified') or last_modified)
+        raise
+
+
 def fetch_url(url: str, timeout: int = 30,
               headers: dict[str, str] | None = None) -> str:
     """Fetch URL content with error handling.
@@ -386,50 +887,5 @@ def fetch_url(url: str, timeout: int = 30,
         req_headers['User-Agent'] = 'adoc-search/1.0'
 
     request = Request(url, headers=req_headers)
-    with urlopen(request, timeout=timeout) as response:
+    with http_open(request, timeout=timeout) as response:
         return response.read().decode('utf-8')
-
-
-def fetch_last_modified(url: str, timeout: int = 10) -> datetime | None:
-    """Get Last-Modified header via HEAD request.
-
-    :param url: URL to check
-    :param timeout: Request timeout in seconds
-    :return: Parsed datetime or None if unavailable
-    """
-    try:
-        request = Request(url, method='HEAD')
-        with urlopen(request, timeout=timeout) as response:
-            last_modified = response.headers.get('Last-Modified')
-            if last_modified:
-                return parsedate_to_datetime(last_modified)
-    except (HTTPError, URLError):
-        pass
-    return None
-
-
-def fetch_batch(urls: list[str], fetch_fn: Callable[[str], T],
-                max_workers: int = 20) -> dict[str, T]:
-    """Fetch multiple URLs in parallel using ThreadPoolExecutor.
-
-    :param urls: List of URLs to fetch
-    :param fetch_fn: Function to call for each URL (takes URL, returns result)
-    :param max_workers: Maximum concurrent workers (capped at len(urls))
-    :return: Dict mapping URL to result
-    """
-    if not urls:
-        return {}
-
-    results = {}
-
-    def fetch_one(url: str) -> tuple[str, T]:
-        return url, fetch_fn(url)
-
-    worker_count = min(len(urls), max_workers)
-    with ThreadPoolExecutor(max_workers=worker_count) as executor:
-        futures = [executor.submit(fetch_one, url) for url in urls]
-        for future in futures:
-            url, result = future.result()
-            results[url] = result
-
-    return results
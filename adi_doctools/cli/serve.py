@@ -1,9 +1,12 @@
 import importlib
+import json
 import logging
 import mimetypes
 import tempfile
 import threading
-from os import environ, listdir, mkdir, pardir, path, remove, stat, utime
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from hashlib import sha1
+from os import listdir, mkdir, pardir, path, remove, scandir, stat, utime
 from shutil import copy2, rmtree, which
 
 from packaging.version import Version
@@ -11,8 +14,19 @@ from sphinx import __version__ as __sphinx_version__
 from sphinx.application import Sphinx
 from sphinx.testing.util import _clean_up_global_state
 
-from .aux_git import get_git_dir, get_git_top_level, get_lfs_sha, is_git_lfs_installed
+from .aux_async import AsyncServer
+from .aux_events import EventChannel, EventServer
+from .aux_git import (
+    LfsFetcher,
+    LfsIndex,
+    get_git_dir,
+    get_git_top_level,
+    get_lfs_sha,
+    is_git_lfs_installed,
+)
+from .aux_http import FileCache, send_cached
 from .aux_os import aux_killpg
+from .aux_watch import FileIndex, get_watcher
 from .logging import BLUE, FAIL, NC, RED
 
 logger = logging.getLogger(__name__)
@@ -20,7 +34,6 @@ logger = logging.getLogger(__name__)
 log = {
     'sphinx_too_old': "Serve does not support sphinx < 7.3.0, current installed is {}.",
     'no_lfs': "File .gitattributes contains lfs rules, but git-lfs is not installed.",
-    'lfs_skip_smudge': "GIT_LFS_SKIP_SMUDGE=1 is set, GET requests won't smudge files, only touching the source!",
     'no_conf_py': "File conf.py not found, is {} a docs folder?",
     'inv_f': "Could not find {}, check rollup output.",
     'inv_srcdir': "Could not find SOURCEDIR {}.",
@@ -52,7 +65,8 @@ theme_path = path.join('adi_doctools', 'theme', 'harmonic')
 style_path = path.join(theme_path, 'style')
 static_common_path = path.join(theme_path, 'static_common')
 static_core_path = path.join(theme_path, 'static_core')
-dev_pool_val = b""
+
+doc_types = ('.rst', '.md', '.svg', '.txt', '.png', '.jpg', '.jpeg', '.js', '.css')
 
 common_paths = [".", "docs", path.join("doc", "source"), path.join("doc", "sphinx", "source")]
 
@@ -81,13 +95,15 @@ class Serve:
 
     @classmethod
     def start(cls, directory='.', port=8080, dev=False, once=False,
-              builder='html', sparse=None, verbose=False, jsonrpc=False):
+              builder='html', sparse=None, verbose=False, jsonrpc=False,
+              async_server=False):
         """Start the server."""
         with cls._lock:
             if cls._instance is not None:
                 logger.warning("Server already running")
                 return False
-            cls._instance = cls(directory, port, dev, once, builder, sparse, verbose, jsonrpc)
+            cls._instance = cls(directory, port, dev, once, builder, sparse, verbose, jsonrpc,
+                                async_server=async_server)
             error = cls._instance._setup()
             if error:
                 cls._instance = None
@@ -141,9 +157,10 @@ class Serve:
 
         srcdir_rel = path.relpath(directory, git_top_level)
         builddir_rel = path.join(srcdir_rel, builddir_, "html")
-        doctreedir_rel = path.join(srcdir_rel, builddir_, "doctrees")
 
         confoverrides = compute_sparse_config(directory, sparse, verbose)
+        doctreedir = get_sparse_doctreedir(path.join(directory, builddir_), confoverrides)
+        doctreedir_rel = path.relpath(doctreedir, git_top_level)
 
         override_args = []
         for key, value in confoverrides.items():
@@ -172,7 +189,8 @@ cwd = {cwd_display}""")
 
         return False
 
-    def __init__(self, directory, port, dev, once, builder, sparse, verbose, jsonrpc=False, esbonio=False, container=False):
+    def __init__(self, directory, port, dev, once, builder, sparse, verbose, jsonrpc=False, esbonio=False, container=False,
+                 async_server=False):
         self.esbonio = esbonio
         if esbonio:
             Serve.esbonio_pyproject(directory, sparse, verbose)
@@ -187,6 +205,7 @@ cwd = {cwd_display}""")
         self.verbose = verbose
         self.jsonrpc = jsonrpc
         self.container = container
+        self.async_server = async_server
 
         # Process handles
         self.rollup_p = None
@@ -195,7 +214,6 @@ cwd = {cwd_display}""")
 
         # Threading
         self._shutdown_event = threading.Event()
-        self._reload_event = threading.Event()
         self._sparse_update_event = threading.Event()
         self._shutdown_lock = threading.Lock()
         self._sparse_lock = threading.Lock()
@@ -209,8 +227,6 @@ cwd = {cwd_display}""")
         self.build_returncode = 0
         self._first_run = True
         self._trigger_rst = ("", "")
-        self._dev_pool_val = b""
-        self._dev_pool_lock = threading.Lock()
 
     def _setup(self):
         """Validate environment and prepare for serving. Returns True on error."""
@@ -248,7 +264,6 @@ cwd = {cwd_display}""")
 
         logger.info("Shutting down server")
         self._shutdown_event.set()
-        self._reload_event.set()
 
         if self.rollup_p is not None:
             aux_killpg(self.rollup_p)
@@ -271,11 +286,10 @@ cwd = {cwd_display}""")
 
     def _run(self):
         """Main server loop."""
+        import concurrent.futures
         import glob
         import http.server
         import re
-        import sched
-        import socketserver
         import subprocess
         import sys
         import time
@@ -394,7 +408,6 @@ cwd = {cwd_display}""")
         buildroot = path.join(directory, builddir_)
         builddir = path.join(buildroot, sphinx_builder)
         self.builddir = builddir
-        doctreedir = path.join(buildroot, "doctrees")
         if dir_assert(directory, log['inv_srcdir']):
             return
 
@@ -410,19 +423,16 @@ cwd = {cwd_display}""")
                             match = re.match(r"\*\.([a-zA-Z0-9]+)", line)
                             if match:
                                 types_lfs.append('.' + match.group(1))
-                if len(types_lfs) > 0:
-                    if not is_git_lfs_installed():
-                        logger.info(log['no_lfs'])
-                        types_lfs = []
-                    elif ("GIT_LFS_SKIP_SMUDGE" in environ and
-                          environ["GIT_LFS_SKIP_SMUDGE"] == "1"):
-                        logger.error(f"{FAIL}{log['lfs_skip_smudge']}{NC}")
+                if len(types_lfs) > 0 and not is_git_lfs_installed():
+                    logger.info(log['no_lfs'])
+                    types_lfs = []
+
+        lfs_index = LfsIndex(types_lfs)
+        lfs_fetcher = LfsFetcher(git_top_level) if types_lfs else None
+        lfs_timeout = 120
 
         confoverrides = compute_sparse_config(directory, self.sparse, self.verbose)
-        if self.sparse:
-            # FIXME: cache check confoverrides to not have to discard sparse
-            # builds.
-            rmtree(path.join(directory, builddir_), ignore_errors=True)
+        doctreedir = get_sparse_doctreedir(buildroot, confoverrides)
 
         if self.jsonrpc:
             from sphinx._cli.util.colour import disable_colour
@@ -552,61 +562,76 @@ cwd = {cwd_display}""")
             dev_pool_script = f'<script id="dev-pool">\n{f.read()}</script>\n</body>'.encode()
 
         shutdown_event = self._shutdown_event
-        reload_event = self._reload_event
-        dev_pool_lock = self._dev_pool_lock
+        dev_pool_events = EventChannel()
 
-        def get_source_lfs_file(path_, ext):
+        def get_source_lfs_file(path_):
             """
             Check if _build binary file is a git lfs pointer,
-            and if so, search and return the source file path.
+            and if so, return the source file path from the lfs index.
             If any step fails, returns None
             """
             if sha := get_lfs_sha(path_):
-                name_ = path.basename(path_)
-                name_ = re.sub(r'(_?\d+)?\.\w+$', '', name_)
-                pattern = path.join(directory, '**', f'*{ext}')
-                files = []
-                for file_path in glob.glob(pattern, recursive=True):
-                    norm_path = path.normpath(file_path).replace('\\', '/')
-                    if ("/_build/" not in norm_path and
-                        "/build/" not in norm_path and
-                        name_ in path.basename(file_path)):
-                        files.append(file_path)
-
-                for file in files:
-                    try:
-                        with open(file, 'rb') as f:
-                            f.seek(54)
-                            sha_ = f.read(64)
-                            if sha == sha_:
-                                return file
-                    except OSError as e:
-                        logger.debug(f"Error checking file hash: {e}")
-                return None
+                return lfs_index.get(sha)
             return None
 
+        def smudge_lfs(url_path):
+            """
+            If the requested file is a Git LFS pointer, smudge the source file
+            and return its content, otherwise return None.
+            """
+            if url_path.endswith(tuple(types_lfs)):
+                url_relative = url_path[1:].replace('/', path.sep)
+                path_ = path.join(builddir, url_relative)
+                lfs_f = get_source_lfs_file(path_)
+                if lfs_f is None:
+                    return None
+
+                try:
+                    if not lfs_fetcher.fetch(lfs_f).result(timeout=lfs_timeout):
+                        return b''
+                except FutureTimeoutError:
+                    # Serve the pointer, the fetch goes on in the background
+                    logger.info(f"Git LFS fetch of {lfs_f} still running, "
+                                "serving the pointer.")
+                    return None
+                # Replace the pointer in the build too, until the next build
+                copy2(lfs_f, path_)
+                with open(lfs_f, "rb") as f:
+                    blob = f.read()
+
+                return blob
+            return None
+
+        file_cache = FileCache()
+
+        def inject_dev_pool(content):
+            return content.replace(b'</body>', dev_pool_script)
+
         class Handler(http.server.SimpleHTTPRequestHandler):
             def __init__(_self, *args, **kwargs):
                 super().__init__(*args, directory=builddir, **kwargs)
 
             def do_GET(_self):
-                global dev_pool_val
-
                 if shutdown_event.is_set():
                     return
 
                 try:
                     if _self.path == "/.dev-pool":
+                        if _self.headers.get("Accept", "").startswith("text/event-stream"):
+                            _self.send_response(200)
+                            _self.send_header("Content-type", "text/event-stream")
+                            _self.send_header("Cache-Control", "no-cache")
+                            _self.end_headers()
+                            _self.wfile.flush()
+                            _self.close_connection = True
+                            dev_pool_events.subscribe(_self.request, _self.headers.get("Last-Event-ID"))
+                            return
+
                         _self.send_response(200)
                         _self.send_header("Content-type", "text/plain")
+                        _self.send_header("Cache-Control", "no-cache")
                         _self.end_headers()
-                        if _self.headers.get("no-wait") is None:
-                            if not reload_event.wait(timeout=30):
-                                with dev_pool_lock:
-                                    dev_pool_val = f"{time.time()}\n@timed-out\n".encode()
-                            reload_event.clear()
-                        with dev_pool_lock:
-                            _self.wfile.write(dev_pool_val)
+                        _self.wfile.write(dev_pool_events.latest().encode())
                         return
 
                     url_path = _self.path.split('?')[0]
@@ -617,63 +642,28 @@ cwd = {cwd_display}""")
 
                     if url_path.endswith('.html'):
                         file_path = path.join(builddir, url_path.lstrip('/').replace('/', path.sep))
-                        if path.isfile(file_path):
-                            with open(file_path, 'rb') as f:
-                                content = f.read().replace(b'</body>', dev_pool_script)
-                            _self.send_response(200)
-                            _self.send_header("Content-type", "text/html")
-                            _self.send_header("Content-Length", len(content))
-                            _self.end_headers()
-                            _self.wfile.write(content)
+                        entry = file_cache.get(file_path, inject_dev_pool)
+                        if entry is not None:
+                            send_cached(_self, entry, "text/html")
                             return
 
-                    for ext in types_lfs:
-                        if _self.path.endswith(ext):
-                            url_relative = _self.path[1:].replace('/', path.sep)
-                            path_ = path.join(builddir, url_relative)
-                            lfs_f = get_source_lfs_file(path_, ext)
-                            if lfs_f is not None:
-                                stat_ = stat(lfs_f)
-                                lfs_f_ = path.relpath(lfs_f, git_top_level)
-                                logger.info(f"git lfs smudging file {lfs_f_}")
-                                blob = b''
-                                try:
-                                    with open(path_, "rb") as fin:
-                                        result = subprocess.run(["git", "lfs", "smudge"], stdin=fin, stdout=subprocess.PIPE, check=True)
-                                        blob = result.stdout
-                                except Exception as e:
-                                    if e.returncode == 2:
-                                        pass
-                                    else:
-                                        raise
-
-                                content_type, _ = mimetypes.guess_type(_self.path)
-                                _self.send_response(200)
-                                _self.send_header("Content-type", content_type or "application/octet-stream")
-                                _self.send_header("Content-Length", len(blob))
-                                _self.end_headers()
-
-                                if not len(blob):
-                                    return
-
-                                _self.wfile.write(blob)
-                                with open(lfs_f, "wb") as f:
-                                    f.write(blob)
-                                utime(lfs_f, (stat_.st_atime, stat_.st_mtime))
-
-                                while True:
-                                    try:
-                                        subprocess.run(["git", "update-index", "--", lfs_f],
-                                                       capture_output=True, text=True, check=True)
-                                    except subprocess.CalledProcessError as e:
-                                        if e.returncode == 128 and "/index.lock" in e.stderr:
-                                                time.sleep(0.1)
-                                                continue
-                                        else:
-                                            logger.error("%s\nstderr=%r", e, e.stderr)
-                                    break
-
-                                return
+                    blob = smudge_lfs(_self.path)
+                    if blob is not None:
+                        content_type, _ = mimetypes.guess_type(_self.path)
+                        _self.send_response(200)
+                        _self.send_header("Content-type", content_type or "application/octet-stream")
+                        _self.send_header("Content-Length", len(blob))
+                        _self.end_headers()
+                        if len(blob):
+                            _self.wfile.write(blob)
+                        return
+
+                    file_path = _self.translate_path(_self.path)
+                    if path.isfile(file_path):
+                        entry = file_cache.get(file_path)
+                        if entry is not None:
+                            send_cached(_self, entry, _self.guess_type(file_path))
+                            return
 
                     super().do_GET()
                 except (BrokenPipeError, ConnectionResetError):
@@ -684,8 +674,12 @@ cwd = {cwd_display}""")
 
         if not self.once and self.builder == "html":
             try:
-                socketserver.ThreadingTCPServer.allow_reuse_address = True
-                self.http_p = socketserver.ThreadingTCPServer(("", self.port), Handler)
+                if self.async_server:
+                    self.http_p = AsyncServer(("", self.port), builddir, dev_pool_events,
+                                              file_cache, inject_dev_pool,
+                                              smudge_lfs, types_lfs)
+                else:
+                    self.http_p = EventServer(("", self.port), Handler, dev_pool_events)
                 self._http_thread = threading.Thread(target=self.http_p.serve_forever)
                 self._http_thread.daemon = True
                 self._http_thread.start()
@@ -754,12 +748,19 @@ cwd = {cwd_display}""")
         if self.once:
             return
 
-        # app.build() doesn't handle the cache well in parallel,
-        # instead, we call through subprocess if needed
-        self.app = Sphinx(directory, directory, builddir,
-                          doctreedir, sphinx_builder, confoverrides=confoverrides,
-                          parallel=0, status=sys.stdout if self.verbose else None,
-                          warning=warning_stream)
+        read_docnames = set()
+
+        def new_sphinx_app():
+            # app.build() doesn't handle the cache well in parallel,
+            # instead, we call through subprocess if needed
+            app = Sphinx(directory, directory, builddir,
+                         doctreedir, sphinx_builder, confoverrides=confoverrides,
+                         parallel=0, status=sys.stdout if self.verbose else None,
+                         warning=warning_stream)
+            app.connect('doctree-read', lambda app_, doctree: read_docnames.add(app_.env.docname))
+            return app
+
+        self.app = new_sphinx_app()
 
         if self.builder == "html":
             server_url = f"http://127.0.0.1:{self.port}?v={str(uuid4())[:2]}"
@@ -771,11 +772,8 @@ cwd = {cwd_display}""")
         dev_pool = path.join(builddir, '.dev-pool')
 
         def update_dev_pool(message):
-            global dev_pool_val
             dev_pool_val_ = f"{time.time()!s}\n{message}"
-            with dev_pool_lock:
-                dev_pool_val = bytes(dev_pool_val_, 'utf-8')
-            reload_event.set()
+            dev_pool_events.publish(dev_pool_val_)
             if path.isdir(builddir):
                 with open(dev_pool, 'w') as dev_f:
                     dev_f.write(dev_pool_val_)
@@ -783,54 +781,66 @@ cwd = {cwd_display}""")
         if self.builder == "html":
             update_dev_pool("")
 
-        def get_doc_sources_included():
-            include_ = set()
-            for docname in self.app.env.included:
-                include_.update(self.app.env.included[docname])
-            files_ = {item + ".rst" for item in include_}
-            files = []
-            ctime = []
-            for f in files_:
-                if not path.isfile(f):
-                    continue
-                ctime_ = stat(f).st_mtime
-                ctime.append(ctime_)
-                files.append(f)
-            return (files, ctime)
-
-        def get_doc_sources():
-            types = ['*.rst', '*.md', '*.svg', '*.txt', '*.png', '*.jpg', '*.jpeg', '*.js', '*.css']
-            files = []
-            ctime = []
-            for typ in types:
-                glob_ = path.join(directory, typ)
-                _files = glob.glob(glob_)
-                __files = [path.abspath(f) for f in _files]
-                files.extend(__files)
-                for f in __files:
-                    ctime.append(stat(f).st_mtime)
-            if path.isfile(conf_py):
-                files.append(conf_py)
-                ctime.append(stat(conf_py).st_mtime)
-            dirs = [d for d in listdir(directory)
-                    if path.isdir(path.join(directory, d))]
-            if builddir_ in dirs:
-                dirs.remove(builddir_)
-            for d in dirs:
-                for typ in types:
-                    glob_ = path.join(directory, d, '**', typ)
-                    _files = glob.glob(glob_, recursive=True)
-                    __files = [path.abspath(f) for f in _files]
-                    for f in __files:
-                        if not path.isfile(f):
-                            continue
-                        ctime_ = stat(f).st_mtime
-                        ctime.append(ctime_)
-                        files.append(f)
-            files_, ctime_ = get_doc_sources_included()
-            files.extend(files_)
-            ctime.extend(ctime_)
-            return (files, ctime)
+        # Also watch the lfs types to keep the lfs index up to date
+        watch_types = doc_types + tuple(t for t in types_lfs if t not in doc_types)
+        file_index = FileIndex(path.join(buildroot, '.serve-index'), directory,
+                               (watch_types, path.abspath(buildroot)))
+        watcher = get_watcher(directory, watch_types, files=[conf_py],
+                              exclude=[buildroot], index=file_index)
+        watch_file_rst.update(watcher.scan())
+        for file in watch_file_rst:
+            lfs_index.update(file)
+
+        dependents = {}
+
+        def update_dependents():
+            """
+            Refresh the reverse dependency graph and watch the dependencies
+            that are outside the source tree or of other file types.
+            """
+            nonlocal dependents
+            dependents = get_dependents(self.app.env, directory)
+            extra = [f for f in dependents if f not in watch_file_rst]
+            watcher.watch_files(extra)
+            for f in extra:
+                if path.isfile(f):
+                    watch_file_rst[f] = stat(f).st_mtime
+
+        def app_build(files):
+            """
+            Build only the docs that depend on files, or everything outdated
+            if any of the files is unknown.
+            """
+            docnames = set()
+            for f in files or [None]:
+                if f not in dependents:
+                    docnames = None
+                    break
+                docnames.update(dependents[f])
+
+            read_docnames.clear()
+            if docnames is None:
+                self.app.build()
+                return
+
+            env = self.app.env
+            state = get_toctree_state(env)
+            self.app.build(filenames=[env.doc2path(d) for d in docnames
+                                      if d in env.found_docs])
+            # Sphinx still reads every outdated doc, and the docs showing
+            # their titles and numbers are only written by update builds,
+            # make sure these are written too.
+            written = set(docnames)
+            for d in docnames:
+                written.update(env.files_to_rebuild.get(d, ()))
+            missed = ((read_docnames | get_stale_docs(env, state, read_docnames))
+                      - written) & env.found_docs
+            if missed:
+                self.app.build(filenames=[env.doc2path(d) for d in missed])
+
+        update_dependents()
+        threading.Thread(target=file_index.fill_digests, args=(shutdown_event,),
+                         daemon=True).start()
 
         trigger_rst = ("", "")
 
@@ -841,6 +851,10 @@ cwd = {cwd_display}""")
                 c = -4
             elif file.endswith(".md"):
                 c = -3
+            elif dependents.get(file):
+                # Reload the first page that depends on the file
+                docname = min(dependents[file])
+                return get_trigger_rst(trigger_rst_, str(self.app.env.doc2path(docname)))
             else:
                 return trigger_rst_
             path_ = path.relpath(file, directory)[:c] + ".html"
@@ -848,13 +862,14 @@ cwd = {cwd_display}""")
                 return trigger_rst_
             return (file, path_)
 
-        first_run = True
-
-        def check_files(scheduler):
-            nonlocal git_ref, toctree_mtime, toctree_content, first_run, trigger_rst, confoverrides
+        def check_files(changed):
+            nonlocal git_ref, toctree_mtime, toctree_content, trigger_rst, confoverrides, doctreedir
             update_sphinx = False
             update_dev = False
             deep_clean = False
+            sparse_switch = False
+            full_build = False
+            changed_files = []
             git_lfs_pull = []
 
             # Check for sparse path updates
@@ -863,12 +878,27 @@ cwd = {cwd_display}""")
                 with self._sparse_lock:
                     new_sparse = self.sparse
                 confoverrides = compute_sparse_config(directory, new_sparse, self.verbose)
+                doctreedir = get_sparse_doctreedir(buildroot, confoverrides)
                 update_sphinx = True
-                deep_clean = True
+                sparse_switch = True
                 trigger_rst = ("", "")
                 logger.info(f"Sparse paths updated: {new_sparse}")
 
-            for file, ctime in zip(*get_doc_sources()):
+            for file in changed:
+                if not path.isfile(file):
+                    file_index.remove(file)
+                    lfs_index.remove(file)
+                    if watch_file_rst.pop(file, None) is not None:
+                        update_sphinx = True
+                        full_build = True
+                    continue
+                stat_ = stat(file)
+                ctime = stat_.st_mtime
+                lfs_index.update(file)
+                if not file_index.changed(file, stat_) and file in watch_file_rst:
+                    # Touched, but same content, e.g. git checkout
+                    watch_file_rst[file] = ctime
+                    continue
                 if file in watch_file_rst and ctime > watch_file_rst[file]:
                     _, ext_ = path.splitext(file)
                     if ext_ in types_lfs and get_lfs_sha(file):
@@ -877,7 +907,10 @@ cwd = {cwd_display}""")
                 if file in watch_file_rst and ctime > watch_file_rst[file]:
                     trigger_rst = get_trigger_rst(trigger_rst, file)
                 if file not in watch_file_rst or ctime > watch_file_rst[file]:
+                    if file not in watch_file_rst:
+                        full_build = True
                     update_sphinx = True
+                    changed_files.append(file)
                     watch_file_rst[file] = ctime
                     for u in unmanaged:
                         if u in file:
@@ -904,37 +937,26 @@ cwd = {cwd_display}""")
                     deep_clean = True
                 git_ref = git_ref_
 
-            if first_run:
-                first_run = False
-                update_dev = False
-                update_sphinx = False
-
             if len(git_lfs_pull) > 0:
-                git_lfs_pull = [path.relpath(gf, git_top_level) for gf in git_lfs_pull]
-                lfs_f_s = ' -I '.join(git_lfs_pull)
-                logger.info(f"git lfs smudging file(s): {' '.join(git_lfs_pull)}")
-                try:
-                    subprocess.run(["git", "lfs", "pull", "-I", lfs_f_s], check=True,
-                                   cwd=git_top_level)
-                except subprocess.CalledProcessError as e:
-                    if e.returncode == 2:
-                        pass
-                    else:
-                        raise
+                futures = [lfs_fetcher.fetch(f) for f in git_lfs_pull]
+                concurrent.futures.wait(futures, timeout=lfs_timeout)
 
             if update_sphinx:
                 if self.dev:
                     app_subprocess_build()
-                elif deep_clean:
+                elif deep_clean or (sparse_switch and
+                                    not path.isfile(path.join(doctreedir, 'environment.pickle'))):
                     _clean_up_global_state()
                     app_subprocess_build()
-                    self.app = Sphinx(directory, directory, builddir,
-                                      doctreedir, sphinx_builder, confoverrides=confoverrides,
-                                      parallel=0, status=sys.stdout if self.verbose else None,
-                                      warning=warning_stream)
+                    self.app = new_sphinx_app()
                 else:
+                    if sparse_switch:
+                        # Resume from the pickled environment of the sparse set
+                        _clean_up_global_state()
+                        self.app = new_sphinx_app()
+                        full_build = True
                     build_notify("started", mode=False)
-                    self.app.build()
+                    app_build(None if full_build else changed_files)
                     if self.container:
                         container_build = subprocess.run(container_cmd,
                                                          capture_output=not self.verbose, check=False)
@@ -943,6 +965,8 @@ cwd = {cwd_display}""")
                     if warning_stream:
                         warning_stream.flush()
                     build_notify("completed")
+                update_dependents()
+                file_index.save()
 
             if update_dev:
                 for f in w_files:
@@ -974,12 +998,140 @@ cwd = {cwd_display}""")
                 elif update_dev:
                     update_dev_pool("@code-changed\n")
 
-            if not self._shutdown_event.is_set():
-                scheduler.enter(1, 1, check_files, (scheduler,))
+        # The timeout only paces the cheap checks (sparse, git HEAD, --dev),
+        # source changes wake up the loop as soon as the burst settles.
+        while not self._shutdown_event.is_set():
+            check_files(watcher.wait(1))
+        watcher.close()
+        file_index.save()
+        if lfs_fetcher is not None:
+            lfs_fetcher.close()
+
+
+def get_dependents(env, directory):
+    """
+    Return the reverse dependency graph of the Sphinx environment, as a dict
+    of absolute file path to the docnames that depend on it.
+    """
+    graph = {}
+
+    def add(file, docname):
+        file = path.normpath(path.join(directory, file))
+        graph.setdefault(file, set()).add(docname)
+
+    for docname in env.found_docs:
+        add(env.doc2path(docname), docname)
+    for docname, deps in env.dependencies.items():
+        for dep in deps:
+            add(dep, docname)
+    for docname, included in env.included.items():
+        for inc in included:
+            add(env.doc2path(inc), docname)
+
+    # Artifacts managed by directive/hdl.py, paths relative to the docs
+    if hasattr(env, 'regmaps'):
+        prefix = path.join(pardir, 'hdl', 'docs') if env.config.monolithic else '.'
+        for lib, rm in env.regmaps.items():
+            for owner in rm['owners']:
+                add(path.join(prefix, 'regmap', f"adi_regmap_{lib}.txt"), owner)
+    if hasattr(env, 'component'):
+        for lib, cp in env.component.items():
+            for owner in cp['owners']:
+                add(path.join(pardir, lib, 'component.xml'), owner)
+
+    return graph
+
+
+def get_toctree_state(env):
+    """
+    Snapshot the titles, tables of contents, toctrees and section and figure
+    numbers of the Sphinx environment, for get_stale_docs.
+    """
+    return (dict(env.titles), dict(env.tocs), dict(env.toctree_includes),
+            dict(env.toc_secnumbers), dict(env.toc_fignumbers))
+
+
+def get_stale_docs(env, state, read_docnames):
+    """
+    Return the docs that show a title, table of contents, toctree or number
+    changed since state: the ancestors of the changed read docs and the
+    renumbered docs.
+    Sphinx writes these only on updates, from the env-get-updated event.
+    """
+    titles, tocs, includes, secnumbers, fignumbers = state
+
+    def changed(d):
+        if d not in titles or d not in env.titles:
+            return True
+        return (titles[d].astext() != env.titles[d].astext() or
+                tocs[d].astext() != env.tocs[d].astext() or
+                includes.get(d) != env.toctree_includes.get(d))
+
+    stale = set()
+    pending = [d for d in read_docnames if changed(d)]
+    while pending:
+        for parent in env.files_to_rebuild.get(pending.pop(), ()):
+            if parent not in stale:
+                stale.add(parent)
+                pending.append(parent)
+
+    for d in env.found_docs:
+        if (secnumbers.get(d) != env.toc_secnumbers.get(d) or
+                fignumbers.get(d) != env.toc_fignumbers.get(d)):
+            stale.add(d)
+    return stale
+
+
+def get_sparse_doctreedir(buildroot, confoverrides, keep=4):
+    """
+    Return the doctree directory for the sparse overrides, so each sparse set
+    keeps its own pickled environment. Only the most recent are kept.
+    """
+    if not confoverrides:
+        return path.join(buildroot, "doctrees")
+
+    key = json.dumps(confoverrides, sort_keys=True)
+    doctreedir = path.join(buildroot, f"doctrees-{sha1(key.encode()).hexdigest()[:12]}")
+
+    if path.isdir(buildroot):
+        sparse_dirs = [path.join(buildroot, d) for d in listdir(buildroot)
+                       if d.startswith("doctrees-") and d != path.basename(doctreedir)]
+        sparse_dirs.sort(key=lambda d: stat(d).st_mtime, reverse=True)
+        for d in sparse_dirs[keep - 1:]:
+            rmtree(d, ignore_errors=True)
+    if path.isdir(doctreedir):
+        # Mark as recently used
+        utime(doctreedir)
 
-        scheduler = sched.scheduler(time.time, time.sleep)
-        scheduler.enter(1, 1, check_files, (scheduler,))
-        scheduler.run()
+    return doctreedir
+
+
+_listdir_cache = {}
+
+
+def _listdir(dir_):
+    """
+    Return the sorted (subdirectories, files) of dir_, memoized on the
+    directory mtime, which changes when entries are added or removed.
+    """
+    try:
+        mtime = stat(dir_).st_mtime_ns
+    except OSError:
+        return (), ()
+    cached = _listdir_cache.get(dir_)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    dirs, files = [], []
+    with scandir(dir_) as it:
+        for entry in it:
+            try:
+                (dirs if entry.is_dir() else files).append(entry.name)
+            except OSError:
+                continue
+    listing = (tuple(sorted(dirs)), tuple(sorted(files)))
+    _listdir_cache[dir_] = (mtime, listing)
+    return listing
 
 
 def _exclude_siblings(basedir, sparse, path_parts, exclude_patterns, lpath=''):
@@ -993,13 +1145,7 @@ def _exclude_siblings(basedir, sparse, path_parts, exclude_patterns, lpath=''):
     current_path = path.join(basedir, current)
     lpath = f"{lpath}/{current}" if lpath else current
 
-    if not path.isdir(current_path):
-        return
-
-    for sibling in listdir(current_path):
-        sibling_path = path.join(current_path, sibling)
-        if not path.isdir(sibling_path):
-            continue
+    for sibling in _listdir(current_path)[0]:
         if sibling == path_parts[1]:
             _exclude_siblings(current_path, sparse, path_parts[1:], exclude_patterns, lpath)
         else:
@@ -1012,6 +1158,23 @@ def _exclude_siblings(basedir, sparse, path_parts, exclude_patterns, lpath=''):
                 exclude_patterns.add(relative)
 
 
+def _compact_patterns(patterns):
+    """
+    Drop the patterns already covered by an excluded directory, e.g.
+    'a/b/c' by 'a/b', and 'a/index' by 'a/*'.
+    Sphinx matches every pattern against every doc, so fewer is faster.
+    """
+    def covered(p):
+        parts = p.split('/')
+        for i in range(1, len(parts)):
+            d = '/'.join(parts[:i])
+            if d in patterns or (f"{d}/*" in patterns and p != f"{d}/*"):
+                return True
+        return False
+
+    return {p for p in patterns if not covered(p)}
+
+
 def _normalize_sparse_path(sparse):
     """Normalize a sparse path by stripping extensions and trailing slashes."""
     sparse = sparse.rstrip('/\\')
@@ -1050,25 +1213,29 @@ def compute_sparse_config(directory, sparse, verbose):
     sparse_parts_list = [s.split('/') for s in sparse_paths]
     top_level_includes = {parts[0] for parts in sparse_parts_list}
 
-    for item in listdir(directory):
-        item_path = path.join(directory, item)
+    dirs, files = _listdir(directory)
+    for item in dirs:
         if item.startswith(('.', '_')):
             continue
         if item in exclude_patterns:
             continue
 
-        if path.isdir(item_path):
-            if item in top_level_includes:
-                for sparse_parts in sparse_parts_list:
-                    if sparse_parts[0] == item:
-                        _exclude_siblings(directory, sparse, sparse_parts, exclude_patterns)
-            else:
-                index_rst = path.join(item_path, 'index.rst')
-                if path.isfile(index_rst):
-                    exclude_patterns.update([f'{item}/index', f'{item}/*'])
-                else:
-                    exclude_patterns.add(item)
-        elif item.endswith(('.rst', '.md')):
+        if item in top_level_includes:
+            for sparse_parts in sparse_parts_list:
+                if sparse_parts[0] == item:
+                    _exclude_siblings(directory, sparse, sparse_parts, exclude_patterns)
+        elif 'index.rst' in _listdir(path.join(directory, item))[1]:
+            exclude_patterns.add(f'{item}/*')
+        else:
+            exclude_patterns.add(item)
+
+    for item in files:
+        if item.startswith(('.', '_')):
+            continue
+        if item in exclude_patterns:
+            continue
+
+        if item.endswith(('.rst', '.md')):
             name = item[:-4] if item.endswith('.rst') else item[:-3]
             if name not in top_level_includes and name != 'index':
                 exclude_patterns.add(item)
@@ -1087,7 +1254,7 @@ def compute_sparse_config(directory, sparse, verbose):
     # between subprocess and app.build() calls,
     confoverrides = {
         'intersphinx_disabled_reftypes': [''], # Match any
-        'exclude_patterns': list(exclude_patterns),
+        'exclude_patterns': sorted(_compact_patterns(exclude_patterns)),
         'suppress_warnings': suppress_warnings,
         'interref_repos': interref_repos,
     }
@@ -8,8 +8,11 @@ from docutils.parsers.rst import directives
 from lxml import etree
 from sphinx.util import logging
 from sphinx.util.osutil import SEP
+from sphinx.util.parallel import ParallelTasks, make_chunks, parallel_available
 
+from ..parser.cache import fingerprint, parse_cache
 from ..parser.hdl import (
+    get_hdl_regmap_importers,
     parse_hdl_build_status,
     parse_hdl_component,
     parse_hdl_regmap,
@@ -507,8 +510,16 @@ def hdl_component_write_managed(env, tree, lib):
                                       'managed'))
     dest_file = path.join(dest_dir, hdl_component.get_name(lib))
 
+    # Keep the mtime of an identical diagram
+    data = etree.tostring(tree)
+    if path.isfile(dest_file):
+        with open(dest_file, 'rb') as f:
+            if f.read() == data:
+                return
+
     makedirs(dest_dir, exist_ok=True)
-    tree.write(dest_file)
+    with open(dest_file, 'wb') as f:
+        f.write(data)
 
 
 def discover_hdl_component(env, lib):
@@ -526,14 +537,30 @@ def discover_hdl_component(env, lib):
     if not path.isfile(f):
         return
 
-    ctime = path.getctime(f)
-    cp[lib] = parse_hdl_component(f, ctime)
+    fp = fingerprint(f)
+    cp[lib] = parse_cache.get(f, parse_hdl_component, f)
+    cp[lib]['fingerprint'] = fp
     cp[lib]['owners'].append(env.docname)
     tree = hdl_component.render(lib, cp[lib])
     hdl_component_write_managed(env, tree, lib)
 
 
-def manage_hdl_components(env, docnames, libraries):
+def outdate_owners(env, docnames, owners):
+    """
+    Mark the owners docnames to be read again, forgetting the removed ones.
+    """
+    for d in list(owners):
+        if d not in docnames:
+            if d in env.found_docs:
+                docnames.append(d)
+            else:
+                owners.remove(d)
+
+
+def manage_hdl_components(env, docnames, libraries, jobs):
+    """
+    Queue the changed components to jobs, see manage_hdl_artifacts.
+    """
     if not hasattr(env, 'component'):
         env.component = {}
 
@@ -544,57 +571,124 @@ def manage_hdl_components(env, docnames, libraries):
             del cp[lib]
             continue
 
-        ctime = path.getctime(f)
-        if ctime <= cp[lib]['ctime']:
+        previous = cp[lib].get('fingerprint')
+        fp = fingerprint(f, previous)
+        if previous is not None and fp is not None and fp[2] == previous[2]:
+            cp[lib]['fingerprint'] = fp
             continue
 
-        cp[lib] = parse_hdl_component(f, ctime, cp[lib]['owners'])
-        tree = hdl_component.render(lib, cp[lib])
-        hdl_component_write_managed(env, tree, lib)
-        for d in cp[lib]['owners']:
-            if d not in docnames:
-                if d in env.found_docs:
-                    docnames.append(d)
-                else:
-                    cp[lib]['owners'].remove(d)
+        def done(component, lib=lib, fp=fp, owners=cp[lib]['owners']):
+            cp[lib] = component
+            cp[lib]['fingerprint'] = fp
+            cp[lib]['owners'] = owners.copy()
+            tree = hdl_component.render(lib, cp[lib])
+            hdl_component_write_managed(env, tree, lib)
+            outdate_owners(env, docnames, cp[lib]['owners'])
+
+        jobs.append(((f, parse_hdl_component, f), done))
 
 
-def manage_hdl_regmaps(env, docnames):
+def hdl_regmap_file(env, lib):
+    prefix = f"..{SEP}hdl{SEP}docs" if env.config.monolithic else "."
+    return f"{prefix}{SEP}regmap{SEP}adi_regmap_{lib}.txt"
+
+
+def manage_hdl_regmaps(env, docnames, jobs):
+    """
+    Queue the new and changed regmaps to jobs, see manage_hdl_artifacts.
+    Return the keys of the regmaps to resolve, and the subregmaps changed,
+    filled as the jobs are done.
+    """
     if not hasattr(env, 'regmaps'):
         env.regmaps = {}
 
     prefix = f"..{SEP}hdl{SEP}docs" if env.config.monolithic else "."
     rm = env.regmaps
+    libs = set()
+    names = set()
     for lib in list(rm):
-        f = f"{prefix}{SEP}regmap{SEP}adi_regmap_{lib}.txt"
-        if not path.isfile(f):
+        if not path.isfile(hdl_regmap_file(env, lib)):
+            names.update(rm[lib]['subregmap'])
             del rm[lib]
     # Inconsistent naming convention, need to parse all in directory.
     for (dirpath, dirnames, filenames) in walk(f"{prefix}/regmap"):
-        for file in filenames:
+        for file in sorted(filenames):
             m = re.search("adi_regmap_(\\w+)\\.txt", file)
             if not bool(m):
                 continue
 
             reg_name = m.group(1)
             file_ = path.join(prefix, "regmap", file)
-            if path.isfile(file_):
-                ctime = path.getctime(file_)
-            else:
+            previous = rm[reg_name].get('fingerprint') if reg_name in rm else None
+            fp = fingerprint(file_, previous)
+            if fp is None:
                 continue
 
-            if reg_name in rm and rm[reg_name]['ctime'] < ctime:
-                for o in rm[reg_name]['owners']:
-                    if o not in docnames:
-                        if o in env.found_docs:
-                            docnames.append(o)
-                        else:
-                            rm[reg_name]['owners'].remove(o)
-            if reg_name in rm and rm[reg_name]['ctime'] >= ctime:
-                pass
-            else:
-                rm[reg_name] = parse_hdl_regmap(ctime, file_)
-    resolve_hdl_regmap(rm)
+            if reg_name in rm:
+                unchanged = previous is not None and fp[2] == previous[2]
+                # Entries without 'imports' were resolved before the import graph
+                if unchanged and 'imports' in rm[reg_name]:
+                    rm[reg_name]['fingerprint'] = fp
+                    continue
+                if not unchanged:
+                    outdate_owners(env, docnames, rm[reg_name]['owners'])
+                names.update(rm[reg_name]['subregmap'])
+
+            def done(regmap, reg_name=reg_name, fp=fp):
+                rm[reg_name] = regmap
+                rm[reg_name]['fingerprint'] = fp
+                libs.add(reg_name)
+                names.update(regmap['subregmap'])
+
+            jobs.append(((file_, parse_hdl_regmap, file_), done))
+
+    return (libs, names)
+
+
+def manage_hdl_regmap_importers(env, docnames, importers, jobs):
+    """
+    Queue the regmaps in importers to jobs, to be resolved again from their
+    parsed version, and mark their owners outdated.
+    """
+    rm = env.regmaps
+    for lib in sorted(importers):
+        file = hdl_regmap_file(env, lib)
+
+        def done(regmap, lib=lib):
+            regmap['fingerprint'] = rm[lib]['fingerprint']
+            regmap['owners'] = rm[lib]['owners']
+            rm[lib] = regmap
+            outdate_owners(env, docnames, regmap['owners'])
+
+        jobs.append(((file, parse_hdl_regmap, file), done))
+
+
+def _parse_hdl_artifacts(chunk):
+    return [parse_cache.get(*job) for job in chunk]
+
+
+def parse_hdl_artifacts(app, jobs):
+    """
+    Return the result of each (file, parser, *args) job of jobs, see
+    ParseCache.get.
+    The jobs are split across processes in parallel builds (-j), the
+    warnings are emitted by the main process.
+    """
+    nproc = app.parallel
+    if nproc <= 1 or not parallel_available or len(jobs) <= 5:
+        return [parse_cache.get(*job) for job in jobs]
+
+    chunks = make_chunks(jobs, nproc)
+    results = [None] * len(chunks)
+
+    tasks = ParallelTasks(nproc)
+    for i, chunk in enumerate(chunks):
+        def merge(chunk, ret, i=i):
+            results[i] = ret
+
+        tasks.add_task(_parse_hdl_artifacts, chunk, merge)
+    tasks.join()
+    return [r for ret in results for r in ret]
 
 
 def manage_hdl_artifacts(app, env, docnames):
@@ -602,8 +696,24 @@ def manage_hdl_artifacts(app, env, docnames):
     libraries = [[k.replace('/index', ''), [k]]
                  for k in env.found_docs if k.find(f"{prefix}{SEP}library{SEP}") == 0]
 
-    manage_hdl_components(env, docnames, libraries)
-    manage_hdl_regmaps(env, docnames)
+    def run(jobs):
+        results = parse_hdl_artifacts(app, [job for job, _ in jobs])
+        for (_, done), result in zip(jobs, results):
+            done(result)
+
+    # Parse all changed artifacts in one go, then merge the results in order
+    jobs = []
+    manage_hdl_components(env, docnames, libraries, jobs)
+    libs, names = manage_hdl_regmaps(env, docnames, jobs)
+    run(jobs)
+
+    # Resolve only the changed regmaps and the ones importing from them
+    importers = get_hdl_regmap_importers(env.regmaps, names) - libs
+    jobs = []
+    manage_hdl_regmap_importers(env, docnames, importers, jobs)
+    run(jobs)
+    resolve_hdl_regmap(env.regmaps, libs | importers)
+    parse_cache.evict()
 
 
 def hdl_setup(app):
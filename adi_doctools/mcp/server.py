@@ -10,16 +10,34 @@ Exposes:
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import io
+import json
+import shlex
 import signal
 import subprocess
+import threading
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from ..cli.argument_parser import get_arguments_search, get_arguments_search_wiki
+from ..cli.search import fetch_docs, search_docs
+from ..cli.search_wiki import (
+    fetch_wiki_page,
+    load_search_results,
+    save_search_results,
+    search_wiki,
+)
+
 app = Server("adoc")
 
+# Parsers print help and usage errors to the process stdout, which is the
+# MCP transport, so they are captured one call at a time
+_parse_lock = threading.Lock()
+
 background_processes: set[subprocess.Popen] = set()
 
 tool_desc_search = (
@@ -28,7 +46,7 @@ tool_desc_search = (
     "or technical documentation for ADI components. "
     "ADI devices typically start with ad* (e.g., ad4000), "
     "max* (e.g., max78000fthr), or lt* (e.g., lt3045). "
-    "Returns search results with URLs and summaries. "
+    "Returns search results as JSON, with URLs, intersphinx references and summaries. "
     "The search is 'or' based, 'ad9081 ad9088' will search for both parts. "
     "The --repo allows to search a specific repository,"
     "in particular, --repo documentation is the system-level docs, "
@@ -44,7 +62,7 @@ tool_desc_search_wiki = (
     "and technical articles for ADI components. "
     "ADI devices typically start with ad* (e.g., ad9081), "
     "max* (e.g., max78000), or lt* (e.g., lt3045). "
-    "Returns search results with URLs and snippets. "
+    "Returns search results as JSON, with URLs and snippets. "
     "Use --fetch to fetch a result by index (or full url). "
     "Use --help to know about the arguments."
 )
@@ -139,9 +157,9 @@ async def run_adoc_command_background(cmd: list[str]) -> dict[str, Any]:
 
 
 async def run_adoc_command(command: str, args: list[str]) -> dict[str, Any]:
-    """Run an adoc CLI command using subprocess.
+    """Run an adoc CLI command using subprocess, used for 'serve'.
 
-    :param command: The adoc subcommand to run (e.g., 'search', ...)
+    :param command: The adoc subcommand to run (e.g., 'serve')
     :param args: Command arguments to pass
     :return: Dictionary containing the command output and status
     """
@@ -169,6 +187,104 @@ async def run_adoc_command(command: str, args: list[str]) -> dict[str, Any]:
     }
 
 
+def parse_arguments(parse, args: list[str]) -> tuple[Any, dict[str, Any] | None]:
+    """Parse arguments with an adoc argument parser.
+
+    :param parse: Argument parser entry point, e.g. get_arguments_search
+    :param args: Command arguments
+    :return: The parsed arguments and None, or None and the result holding
+        the help or usage error
+    """
+    output = io.StringIO()
+    with _parse_lock, contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            return parse(args), None
+        except SystemExit as e:
+            exit_code = e.code or 0
+    return None, {
+        "success": exit_code == 0,
+        "output": output.getvalue(),
+        "exit_code": exit_code,
+    }
+
+
+def format_fetched(data: dict[str, Any]) -> str:
+    """Format a fetched page or source file."""
+    lines = []
+    if data.get("title"):
+        lines.append(f"Title: {data['title']}")
+    lines.append(f"URL: {data['url']}")
+    if data.get("source_url"):
+        lines.append(f"Source URL: {data['source_url']}")
+    return "\n".join(lines) + "\n\n" + data["content"]
+
+
+def run_search(args: list[str]) -> dict[str, Any]:
+    """Run 'adoc search' in-process.
+
+    :param args: Command arguments
+    :return: Dictionary containing the output, results as JSON, and status
+    """
+    parsed, result = parse_arguments(get_arguments_search, args)
+    if result is not None:
+        return result
+
+    try:
+        if parsed.daemon:
+            raise ValueError("Start the daemon from a shell with: adoc search --daemon")
+        if parsed.fetch is not None:
+            output = format_fetched(fetch_docs(parsed.fetch, parsed.format))
+        else:
+            if not parsed.query:
+                raise ValueError("Query is required")
+            data = search_docs(parsed.query, parsed.repo, parsed.url,
+                               parsed.limit if parsed.limit is not None else 10,
+                               ttl=parsed.ttl * 60)
+            output = json.dumps(data, indent=1)
+    except (LookupError, OSError, ValueError) as e:
+        return {"success": False, "output": str(e), "exit_code": 1}
+
+    return {"success": True, "output": output, "exit_code": 0}
+
+
+def run_search_wiki(args: list[str]) -> dict[str, Any]:
+    """Run 'adoc search-wiki' in-process.
+
+    :param args: Command arguments
+    :return: Dictionary containing the output, results as JSON, and status
+    """
+    parsed, result = parse_arguments(get_arguments_search_wiki, args)
+    if result is not None:
+        return result
+
+    try:
+        if parsed.fetch is not None:
+            if parsed.fetch.startswith(('http://', 'https://')):
+                data = {"url": parsed.fetch}
+            else:
+                results = load_search_results()
+                index = int(parsed.fetch)
+                if not 0 <= index < len(results):
+                    raise LookupError(f"No result found at index {index}, run a search first.")
+                data = {"title": results[index]["title"], "url": results[index]["url"]}
+            data["content"] = fetch_wiki_page(data["url"], parsed.format)
+            output = format_fetched(data)
+        else:
+            if not parsed.query:
+                raise ValueError("Query is required")
+            query = " ".join(parsed.query)
+            results = search_wiki(query, parsed.limit if parsed.limit is not None else 10)
+            save_search_results(results)
+            output = json.dumps({
+                "query": query,
+                "results": [dict(r, index=i) for i, r in enumerate(results)],
+            }, indent=1)
+    except (LookupError, OSError, ValueError) as e:
+        return {"success": False, "output": str(e), "exit_code": 1}
+
+    return {"success": True, "output": output, "exit_code": 0}
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls."""
@@ -183,9 +299,17 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
     args_str = arguments.get("args", "")
-    args = args_str.split() if args_str else []
-
-    result = await run_adoc_command(command, args)
+    try:
+        args = shlex.split(args_str) if args_str else []
+    except ValueError as e:
+        return [TextContent(type="text", text=f"Invalid arguments: {e}")]
+
+    if command == "serve":
+        result = await run_adoc_command(command, args)
+    else:
+        handler = run_search if command == "search" else run_search_wiki
+        loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(None, handler, args)
 
     return [TextContent(type="text", text=result["output"])]
 
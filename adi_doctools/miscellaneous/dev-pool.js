@@ -230,34 +230,36 @@ pool_changes.search(PoolChanges.get_paths()).then(obj => {
         app.hot_reload.load_toctree(new URL("_toctree.html", url_root), true)
   }
 
+  const handle_changes = (obj) => {
+    let url__ = obj.map(l => l.match(/^@docname\s+(.+)$/)).find(Boolean)?.[1].trim() || "";
+    let url_ = new URL(url__, url_root)
+    if (Object.hasOwn(window, 'app') &&
+        Object.hasOwn(app, 'hot_reload') &&
+        typeof app.hot_reload.load_href === "function") {
+      if (obj.includes("@code-changed")) {
+        location.reload()
+      } else if (obj.includes("@toctree-changed")) {
+        app.hot_reload.load_toctree(new URL("_toctree.html", url_root), false)
+          .then(() => app.hot_reload.load_href(url_))
+      } else {
+        app.hot_reload.load_href(url_)
+      }
+    } else {
+      pool_preserve_scroll = true
+      if (document.visibilityState === 'visible' && url__ !== "")
+        location.href = url_
+      else
+        location.reload()
+    }
+  }
+
+  /* Fallback for servers without server-sent events, e.g. static hosting */
   do_pool = () => {
     PoolChanges.do(url).then(obj => {
       obj = obj.split("\n")
-      if (obj[1] === "@timed-out") {
-        setTimeout(do_pool, 500)
-        return
-      }
       if (this.pool_timestamp < Number(obj[0])) {
-        let url__ = obj.map(l => l.match(/^@docname\s+(.+)$/)).find(Boolean)?.[1].trim() || "";
-        let url_ = new URL(url__, url_root)
-        if (Object.hasOwn(window, 'app') &&
-            Object.hasOwn(app, 'hot_reload') &&
-            typeof app.hot_reload.load_href === "function") {
-          if (obj.includes("@code-changed")) {
-            location.reload()
-          } else if (obj.includes("@toctree-changed")) {
-            app.hot_reload.load_toctree(new URL("_toctree.html", url_root), false)
-              .then(() => app.hot_reload.load_href(url_))
-          } else {
-            app.hot_reload.load_href(url_)
-          }
-        } else {
-          pool_preserve_scroll = true
-          if (document.visibilityState === 'visible' && url__ !== "")
-            location.href = url_
-          else
-            location.reload()
-        }
+        this.pool_timestamp = Number(obj[0])
+        handle_changes(obj)
       }
       pool_changes.$.state.classList.remove('degraded')
       setTimeout(do_pool, 500)
@@ -277,8 +279,34 @@ pool_changes.search(PoolChanges.get_paths()).then(obj => {
     })
   }
 
+  /* Every message is delivered once, the browser resumes from the last
+   * event id on reconnect */
+  do_events = () => {
+    let greeted = false
+    let source = new EventSource(url)
+    source.addEventListener('hello', () => {
+      greeted = true
+      pool_changes.$.state.classList.remove('degraded')
+    })
+    source.onmessage = (e) => {
+      pool_changes.$.state.classList.remove('degraded')
+      handle_changes(e.data.split("\n"))
+    }
+    source.onerror = () => {
+      if (!greeted) {
+        source.close()
+        setTimeout(do_pool, 500)
+        return
+      }
+      pool_changes.$.state.classList.add('degraded')
+    }
+  }
+
   console.log(`File ${url} is present, pooling interface enabled.`)
   pool_changes.$.state.classList.add('waiting_changes')
   pool_timestamp = Number(obj_.split("\n")[0])
-  setTimeout(do_pool, 500)
+  if (typeof EventSource === "function")
+    do_events()
+  else
+    setTimeout(do_pool, 500)
 })
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import hashlib
+import logging as logging_
+import pickle
+import threading
+from os import environ, getpid, makedirs, path, replace, scandir, stat, unlink, utime
+
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+# Shared by every build and build directory of the user,
+# set ADOC_HDL_CACHE to another directory, or to empty to disable it.
+CACHE_DIR = environ.get(
+    'ADOC_HDL_CACHE',
+    path.join(environ.get('XDG_CACHE_HOME', path.join(path.expanduser('~'), '.cache')),
+              'adoc', 'hdl'))
+
+_tracking = threading.local()
+
+
+def track(file: str) -> None:
+    """
+    Record a file read by the parser running in this thread, so the cached
+    result is discarded once the file changes, is created or is removed.
+    """
+    files = getattr(_tracking, 'files', None)
+    if files is not None:
+        try:
+            file = path.relpath(file)
+        except ValueError:
+            file = path.abspath(file)
+        files[file] = None
+
+
+def digest(file: str) -> bytes | None:
+    """
+    Content digest of file, None if it does not exist.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(file, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.digest()
+
+
+def fingerprint(file: str, previous: tuple | None = None) -> tuple | None:
+    """
+    Return the (size, mtime, digest) fingerprint of file, None if it does not
+    exist. The digest of previous is kept if the size and mtime are the same,
+    so only touched files are read.
+    """
+    try:
+        st = stat(file)
+    except OSError:
+        return None
+    if previous is not None and previous[:2] == (st.st_size, st.st_mtime_ns):
+        return previous
+    return (st.st_size, st.st_mtime_ns, digest(file))
+
+
+class _WarningCollector(logging_.Handler):
+    """
+    Collect the warnings emitted by the parsers of this thread.
+    """
+    def __init__(self):
+        super().__init__(logging_.WARNING)
+        self.thread = threading.get_ident()
+        self.records = []
+
+    def emit(self, record):
+        if record.thread == self.thread:
+            self.records.append((record.name, record.getMessage()))
+
+
+def collect(parser, *args) -> tuple:
+    """
+    Run parser(*args) and return its result, the files it read and the
+    warnings it emitted, as (result, files, warnings).
+    """
+    files = {}
+    _tracking.files = files
+    handler = _WarningCollector()
+    logger_ = logging_.getLogger('sphinx.' + __package__)
+    logger_.addHandler(handler)
+    try:
+        result = parser(*args)
+    finally:
+        logger_.removeHandler(handler)
+        _tracking.files = None
+    return (result, tuple(files), handler.records)
+
+
+def replay(warnings: list) -> None:
+    """
+    Emit again the warnings returned by collect.
+    """
+    for name, msg in warnings:
+        logging.getLogger(name[len('sphinx.'):]).warning(msg)
+
+
+class ParseCache:
+    """
+    On-disk cache of the output of the HDL parsers, keyed by the parser,
+    its arguments and the content of the parsed file.
+    Each entry also stores the digest of every other file read by the parser,
+    and the warnings it emitted, replayed on a hit.
+    Least recently used entries are removed past max_size bytes.
+    """
+    version = 1
+
+    def __init__(self, directory: str, max_size: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_size = max_size
+        self._code = None
+
+    def _code_digest(self) -> bytes:
+        # Invalidate on any change of the parsers, or of the strings they use
+        if self._code is None:
+            h = hashlib.blake2b(digest_size=16)
+            root = path.dirname(path.dirname(__file__))
+            for mod in ('parser/cache.py', 'parser/hdl.py', 'parser/tcl.py',
+                        'directive/string.py'):
+                h.update(digest(path.join(root, *mod.split('/'))) or b'')
+            self._code = h.digest()
+        return self._code
+
+    def _entry(self, file: str, parser, args: tuple) -> str | None:
+        file_digest = digest(file)
+        if file_digest is None:
+            return None
+        h = hashlib.sha256()
+        h.update(repr((self.version, parser.__module__, parser.__qualname__,
+                       args)).encode())
+        h.update(self._code_digest())
+        h.update(file_digest)
+        key = h.hexdigest()
+        return path.join(self.directory, key[:2], f"{key}.pickle")
+
+    def get(self, file: str, parser, *args):
+        """
+        Return parser(*args), from the cache if file and every other file read
+        by the parser are unchanged.
+        """
+        entry = self._entry(file, parser, args) if self.directory else None
+        if entry is None:
+            return parser(*args)
+
+        try:
+            with open(entry, 'rb') as f:
+                files, warnings, data = pickle.load(f)
+            if all(digest(f_) == d for f_, d in files):
+                utime(entry)
+                replay(warnings)
+                return pickle.loads(data)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError,
+                AttributeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.debug(f"Discarding {entry}: {e}")
+
+        result, files, warnings = collect(parser, *args)
+        files = tuple((f_, digest(f_)) for f_ in files)
+        try:
+            makedirs(path.dirname(entry), mode=0o700, exist_ok=True)
+            # Written by concurrent builds and forked workers
+            tmp = f"{entry}.{getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                pickle.dump((files, warnings,
+                             pickle.dumps(result, pickle.HIGHEST_PROTOCOL)),
+                            f, pickle.HIGHEST_PROTOCOL)
+            replace(tmp, entry)
+        except OSError as e:
+            logger.debug(f"Could not save {entry}: {e}")
+        return result
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries past max_size bytes.
+        """
+        if not self.directory or not path.isdir(self.directory):
+            return
+        entries = []
+        for d in scandir(self.directory):
+            if not d.is_dir():
+                continue
+            for e in scandir(d.path):
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+        size = sum(e[1] for e in entries)
+        for _, size_, file in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                unlink(file)
+            except OSError:
+                continue
+            size -= size_
+
+
+parse_cache = ParseCache(CACHE_DIR)
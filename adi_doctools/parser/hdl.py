@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import contextlib
 import re
 from os import path
 
@@ -9,12 +8,13 @@ from sphinx.util import logging
 
 from ..directive.string import string_hdl
 from ..typing.hdl import Intf, IntfPort, Library, LibraryVendor, Project
+from .cache import track
 from .tcl import tcl
 
 logger = logging.getLogger(__name__)
 
 
-def parse_hdl_regmap(ctime: float, file: str) -> dict:
+def parse_hdl_regmap(file: str) -> dict:
     """
     From https://github.com/tfcollins/vger/blob/main/vger/hdl_reg_map.py
     Added methods:
@@ -23,8 +23,7 @@ def parse_hdl_regmap(ctime: float, file: str) -> dict:
     """
     regmap = {
         'subregmap': {},
-        'owners': [],
-        'ctime': ctime
+        'owners': []
     }
 
     def get_where(desc: str, reg: str, fi=None) -> tuple[any]:
@@ -49,6 +48,235 @@ def parse_hdl_regmap(ctime: float, file: str) -> dict:
         return (f"Where n is from {m.group(1)} to {m.group(2)}.",
                 (int(m.group(1)), int(m.group(2))+1))
 
+    def parse_reg(regi: int, rfi: int) -> dict:
+        """
+        Parse the register entry between lines regi (REG) and rfi (ENDREG).
+        """
+        reg_params = []
+        reg_where = None
+        if data[regi + 1].startswith("0x"):
+            reg_import = False
+
+            reg_addr = data[regi + 1]
+
+            reg_d = data[regi + 2]
+            where_desc = ''
+            if reg_d.startswith("WHERE n IS"):
+                where_desc, reg_where = get_where(reg_d[10:], reg_addr)
+                regi = regi + 1
+
+            reg_name = data[regi + 2].strip()
+            reg_desc = [data[f_].replace("''", "``") for f_ in range(regi + 3, rfi)]
+            if where_desc != "":
+                reg_desc.append(where_desc)
+
+            try:
+                if '+' in reg_addr:
+                    reg_addr = reg_addr.split('+')
+                    if reg_addr[1].strip() == 'n':
+                        reg_addr_incr = 1
+                    else:
+                        reg_addr_incr = int(reg_addr[1].replace('*n', ''),
+                                            16)
+                    reg_addr = int(reg_addr[0], 16)
+                    if where_desc == '':
+                        logger.warning(f"Ranged addr {reg_addr} without "
+                                       f"where method at {reg_name}!")
+                else:
+                    reg_addr = int(reg_addr, 16)
+                    reg_addr_incr = 0
+                    if where_desc != '':
+                        logger.warning(f"Static addr {reg_addr} "
+                                       f"with where method at {reg_name}!")
+            except (ValueError, IndexError):
+                logger.warning(f"Malformed register address {reg_addr} "
+                               f"for register {reg_name}.")
+                reg_addr = 0
+                reg_addr_incr = 0
+        else:
+            reg_import = True
+            reg_addr = 0
+            reg_addr_incr = 0
+            reg_name = data[regi + 1].strip()
+            reg_desc = None
+            reg_params = []
+
+        return {
+            'import': reg_import,
+            'where': reg_where,
+            'name': reg_name,
+            'address': reg_addr,
+            'addr_incr': reg_addr_incr,
+            'description': reg_desc,
+            'fields': [],
+            'parameters': reg_params
+        }
+
+    def parse_field(fi: int, efi: int, reg: dict, access_type: list) -> None:
+        """
+        Parse the field entry between lines fi (FIELD) and efi (ENDFIELD)
+        into reg.
+        """
+        reg_name = reg['name']
+        reg_params = reg['parameters']
+        fields = reg['fields']
+
+        if data[fi + 1].startswith('['):
+            field_where = None
+            field_import = False
+            field_loc = data[fi + 1]
+            field_loc = field_loc.split()
+            field_bits = field_loc[0].replace("[", "").replace("]", "")
+            if field_bits != 'n':
+                delimiters = ["+", "-", "*", "/"]
+                if ':' in field_bits:
+                    bits_ = field_bits.split(':')
+                else:
+                    bits_ = [field_bits, field_bits]
+                try:
+                    bit0_ = int(bits_[0])
+                except ValueError:
+                    bit0_ = bits_[0]
+                    bit_str = bit0_
+                    for delimiter in delimiters:
+                        bit_str = " ".join(bit_str.split(delimiter))
+                    for str_part in bit_str.split():
+                        try:
+                            int(str_part)
+                        except ValueError:
+                            reg_params.append(str_part)
+                try:
+                    bit1_ = int(bits_[1])
+                except ValueError:
+                    bit1_ = bits_[1]
+                    bit_str = bit1_
+                    for delimiter in delimiters:
+                        bit_str = " ".join(bit_str.split(delimiter))
+                    for str_part in bit_str.split():
+                        try:
+                            int(str_part)
+                        except ValueError:
+                            reg_params.append(str_part)
+                field_bits = (bit0_, bit1_)
+
+            if len(field_loc) > 1:
+                field_default = ' '.join(field_loc[1:])
+                field_default_long = ' '.join(field_loc[1:])
+                try:
+                    if not field_default.startswith("0x"):
+                        raise TypeError("Not hexadecimal")
+                    fd_ = int(field_default, 16)
+                    if type(field_bits) is tuple:
+                        len_f = (field_bits[0] - field_bits[1] + 1)
+                        len_d = len(bin(fd_)[2:])
+                        if len_d > len_f:
+                            logger.warning("Default value "
+                                           f"'{field_default}' "
+                                           f"overflows field width "
+                                           f"{field_loc[0]} at reg "
+                                           f"'{reg_name}'!")
+                    field_default = fd_
+                    field_default_long = fd_
+
+                except (TypeError, ValueError):
+                    split_field = field_default.split(" = ", 2)
+                    if "''" in field_default:
+                        logger.warning("Default value "
+                                       f"'{field_default}' "
+                                       f"contains ''!")
+                    field_default = split_field[0].replace("''", "")
+                    field_default_long = field_default
+
+                    if "0xX" not in field_default:
+                        try:
+                            default_str = split_field[1]
+                            field_default_long = split_field[1]
+                            field_default = f"{split_field[0]}"
+                        except IndexError:
+                            default_str = split_field[0]
+                        default_str = re.sub("`[A-Z0-9_]+", "", default_str)
+                        default_str = re.findall("[A-Z0-9_]+", default_str)
+                        for str_part in default_str:
+                            try:
+                                int(str_part)
+                            except ValueError:
+                                reg_params.append(re.sub('\\[[0-9:]+\\]', ' ', str_part))
+                                # TODO: Match parse_hdl_library extracted parameters
+            else:
+                field_default = None
+                field_default_long = None
+
+            fi_d = data[fi + 2]
+            where_desc = ''
+            if fi_d.startswith("WHERE n IS"):
+                where_desc, field_where = get_where(fi_d[10:], reg_name,
+                                                    field_bits)
+                fi = fi + 1
+                if field_bits != 'n':
+                    logger.warning("Where method with field bits "
+                                   f"{field_loc[0]} instead of n "
+                                   f"at reg '{reg_name}'!")
+            elif field_bits == 'n':
+                logger.warning("No where method for ranged field "
+                               f"n at reg '{reg_name}'!")
+
+            field_name = data[fi + 2].strip()
+            field_name = field_name.replace("/", "or")
+            field_rw = data[fi + 3]
+
+            if field_rw == 'R':
+                field_rw = 'RO'
+            elif field_rw == 'W':
+                field_rw = 'WO'
+            if '-V' in field_rw and 'V' not in access_type:
+                access_type.append('V')
+            field_rw_ = field_rw.replace('-V', '')
+            field_rw = field_rw.replace('-V', 'V')
+            if field_rw_ not in access_type:
+                if field_rw_ not in string_hdl.access_type:
+                    logger.warning(f"Malformed access type {field_rw} "
+                                   f"for reg {field_name}")
+                else:
+                    access_type.append(field_rw)
+
+            field_desc = [data[f_].replace("''", "``") for f_ in range(fi + 4, efi)]
+            if where_desc != '':
+                field_desc.append(where_desc)
+            if field_default_long is not None and field_default_long != field_default:
+                field_desc.append(f"``{field_default} = {field_default_long}``")
+
+            fields.append({
+                "import": field_import,
+                "where": field_where,
+                "name": field_name,
+                "bits": field_bits,
+                "default": field_default,
+                "default_long": field_default_long,
+                "rw": field_rw,
+                "description": field_desc,
+            })
+        else:
+            for i in range(fi + 1, efi):
+                if any(c in data[i] for c in ('[', ']')) or len(data[i]) == 1:
+                    logger.warning(f"Suspicious imported field '{data[i]}' "
+                                   f"at imported field group at reg {reg_name}!")
+                fields.append({
+                    "import": True,
+                    "where": None,
+                    "name": data[i].strip(),
+                    "bits": None,
+                    "default": None,
+                    "default_long": None,
+                    "rw": None,
+                    "description": None,
+                })
+
+    def close_reg(reg: dict, subregmap: dict) -> None:
+        if len(reg['parameters']):
+            reg['parameters'] = sorted(set(reg['parameters']))
+        subregmap['regmap'].append(reg)
+
+    track(file)
     if not path.isfile(file):
         logger.warning(f"{file}: File doesn't exist!")
         return regmap
@@ -56,13 +284,27 @@ def parse_hdl_regmap(ctime: float, file: str) -> dict:
     with open(file, "r") as f:
         data = f.readlines()
     data = [d.replace("\n", "") for d in data]
+    len_ = len(data)
 
+    # Single pass over the lines, the state being which entry is expected
+    # next: a TITLE, a REG of the current title or a FIELD of the current
+    # register. An entry starting right after the previous one ends, with no
+    # separator line, closes the register (FIELD) or the title (REG).
     using = []
-    while "TITLE" in data:
-        # Get title
-        tit = data.index("TITLE")
-        if data[tit + 1].startswith('USING'):
-            while data[tit + 1].startswith('USING'):
+    state = 'title'
+    subregmap = None
+    access_type = None
+    reg = None
+    start = 0
+    i = 0
+    while i < len_:
+        line = data[i]
+        if line == "TITLE":
+            if state == 'field':
+                close_reg(reg, subregmap)
+            state = 'title'
+            tit = i
+            while tit + 1 < len_ and data[tit + 1].startswith('USING'):
                 using_ = data[tit + 1][6:].strip()
                 tit += 1
                 if len(using_) == 0:
@@ -70,284 +312,72 @@ def parse_hdl_regmap(ctime: float, file: str) -> dict:
                     continue
                 using.append(using_)
 
-        title = str(data[tit + 1]).strip()
-        title_tool = str(data[tit + 2])
-        data = data[tit + 2:]
-
-        if 'ENDTITLE' in [title_tool, title]:
-            logger.warning("Malformed title entry, skipped!")
-            continue
-
-        regmap['subregmap'][title_tool] = {
-            'title': title,
-            'using': using,
-            'regmap': [],
-            'access_type': []
-        }
-
-        # Get registers
-        access_type = []
-        while "REG" in data:
-            regi = data.index("REG")
-            rfi = data.index("ENDREG")
-            reg_params = []
-
-            if not regi:
+            if tit + 2 >= len_:
+                logger.warning("Malformed title entry, skipped!")
                 break
+            title = str(data[tit + 1]).strip()
+            title_tool = str(data[tit + 2])
+            i = start = tit + 2
 
-            reg_where = None
-            if data[regi + 1].startswith("0x"):
-                reg_import = False
-
-                reg_addr = data[regi + 1]
-
-                reg_d = data[regi + 2]
-                where_desc = ''
-                if reg_d.startswith("WHERE n IS"):
-                    where_desc, reg_where = get_where(reg_d[10:], reg_addr)
-                    regi = regi + 1
-
-                reg_name = data[regi + 2].strip()
-                reg_desc = [data[f_].replace("''", "``") for f_ in range(regi + 3, rfi)]
-                if where_desc != "":
-                    reg_desc.append(where_desc)
-
-                try:
-                    if '+' in reg_addr:
-                        reg_addr = reg_addr.split('+')
-                        if reg_addr[1].strip() == 'n':
-                            reg_addr_incr = 1
-                        else:
-                            reg_addr_incr = int(reg_addr[1].replace('*n', ''),
-                                                16)
-                        reg_addr = int(reg_addr[0], 16)
-                        if where_desc == '':
-                            logger.warning(f"Ranged addr {reg_addr} without "
-                                           f"where method at {reg_name}!")
-                    else:
-                        reg_addr = int(reg_addr, 16)
-                        reg_addr_incr = 0
-                        if where_desc != '':
-                            logger.warning(f"Static addr {reg_addr} "
-                                           f"with where method at {reg_name}!")
-                except (ValueError, IndexError):
-                    logger.warning(f"Malformed register address {reg_addr} "
-                                   f"for register {reg_name}.")
-                    reg_addr = 0
-                    reg_addr_incr = 0
-            else:
-                reg_import = True
-                reg_addr = 0
-                reg_addr_incr = 0
-                reg_name = data[regi + 1].strip()
-                reg_desc = None
-                reg_params = []
-
-            with contextlib.suppress(ValueError):
-                tet = data.index("TITLE") if "TITLE" in data else -1
-                if tet != -1 and regi > tet:
-                    # into next regmap
-                    break
-            data = data[rfi + 1:]
+            if 'ENDTITLE' in [title_tool, title]:
+                logger.warning("Malformed title entry, skipped!")
+                continue
 
-            # Get fields
-            fields = []
-            while "FIELD" in data:
-                fi = data.index("FIELD")
-                efi = data.index("ENDFIELD")
+            access_type = []
+            subregmap = regmap['subregmap'][title_tool] = {
+                'title': title,
+                'using': using,
+                'regmap': [],
+                'access_type': access_type
+            }
+            state = 'reg'
+            continue
 
-                if not fi:
-                    break
+        if state == 'title':
+            i += 1
+        elif line == "REG":
+            if state == 'field':
+                close_reg(reg, subregmap)
+            if i == start:
+                state = 'title'
+                i += 1
+                continue
+            rfi = i + 1
+            while rfi < len_ and data[rfi] != "ENDREG":
+                rfi += 1
+            reg = parse_reg(i, rfi)
+            state = 'field'
+            i = start = rfi + 1
+        elif line == "FIELD" and state == 'field':
+            if i == start:
+                close_reg(reg, subregmap)
+                state = 'reg'
+                i += 1
+                continue
+            efi = i + 1
+            while efi < len_ and data[efi] != "ENDFIELD":
+                efi += 1
+            parse_field(i, efi, reg, access_type)
+            i = start = efi + 1
+        else:
+            if line == "ENDFIELD" and state == 'field':
+                logger.warning(f"Got ENDFIELD without FIELD "
+                               f"for register {reg['name']}.")
+            i += 1
 
-                if efi < fi:
-                        logger.warning(f"Got ENDFIELD without FIELD "
-                                       f"for register {reg_name}.")
-
-                with contextlib.suppress(ValueError):
-                    if "REG" in data:
-                        rege = data.index("REG")
-                    else:
-                        rege = -1
-                    if rege != -1 and fi > rege:
-                        # into next register
-                        break
-                if data[fi + 1].startswith('['):
-                    field_where = None
-                    field_import = False
-                    field_loc = data[fi + 1]
-                    field_loc = field_loc.split()
-                    field_bits = field_loc[0].replace("[", "").replace("]", "")
-                    if field_bits != 'n':
-                        delimiters = ["+", "-", "*", "/"]
-                        if ':' in field_bits:
-                            bits_ = field_bits.split(':')
-                        else:
-                            bits_ = [field_bits, field_bits]
-                        try:
-                            bit0_ = int(bits_[0])
-                        except ValueError:
-                            bit0_ = bits_[0]
-                            bit_str = bit0_
-                            for delimiter in delimiters:
-                                bit_str = " ".join(bit_str.split(delimiter))
-                            for str_part in bit_str.split():
-                                try:
-                                    int(str_part)
-                                except ValueError:
-                                    reg_params.append(str_part)
-                        try:
-                            bit1_ = int(bits_[1])
-                        except ValueError:
-                            bit1_ = bits_[1]
-                            bit_str = bit1_
-                            for delimiter in delimiters:
-                                bit_str = " ".join(bit_str.split(delimiter))
-                            for str_part in bit_str.split():
-                                try:
-                                    int(str_part)
-                                except ValueError:
-                                    reg_params.append(str_part)
-                        field_bits = (bit0_, bit1_)
-
-                    if len(field_loc) > 1:
-                        field_default = ' '.join(field_loc[1:])
-                        field_default_long = ' '.join(field_loc[1:])
-                        try:
-                            if not field_default.startswith("0x"):
-                                raise TypeError("Not hexadecimal")
-                            fd_ = int(field_default, 16)
-                            if type(field_bits) is tuple:
-                                len_f = (field_bits[0] - field_bits[1] + 1)
-                                len_d = len(bin(fd_)[2:])
-                                if len_d > len_f:
-                                    logger.warning("Default value "
-                                                   f"'{field_default}' "
-                                                   f"overflows field width "
-                                                   f"{field_loc[0]} at reg "
-                                                   f"'{reg_name}'!")
-                            field_default = fd_
-                            field_default_long = fd_
-
-                        except (TypeError, ValueError):
-                            split_field = field_default.split(" = ", 2)
-                            if "''" in field_default:
-                                logger.warning("Default value "
-                                               f"'{field_default}' "
-                                               f"contains ''!")
-                            field_default = split_field[0].replace("''", "")
-                            field_default_long = field_default
-
-                            if "0xX" not in field_default:
-                                try:
-                                    default_str = split_field[1]
-                                    field_default_long = split_field[1]
-                                    field_default = f"{split_field[0]}"
-                                except IndexError:
-                                    default_str = split_field[0]
-                                default_str = re.sub("`[A-Z0-9_]+", "", default_str)
-                                default_str = re.findall("[A-Z0-9_]+", default_str)
-                                for str_part in default_str:
-                                    try:
-                                        int(str_part)
-                                    except ValueError:
-                                        reg_params.append(re.sub('\\[[0-9:]+\\]', ' ', str_part))
-                                        # TODO: Match parse_hdl_library extracted parameters
-                    else:
-                        field_default = None
-                        field_default_long = None
-
-                    fi_d = data[fi + 2]
-                    where_desc = ''
-                    if fi_d.startswith("WHERE n IS"):
-                        where_desc, field_where = get_where(fi_d[10:], reg_name,
-                                                            field_bits)
-                        fi = fi + 1
-                        if field_bits != 'n':
-                            logger.warning("Where method with field bits "
-                                           f"{field_loc[0]} instead of n "
-                                           f"at reg '{reg_name}'!")
-                    elif field_bits == 'n':
-                        logger.warning("No where method for ranged field "
-                                       f"n at reg '{reg_name}'!")
-
-                    field_name = data[fi + 2].strip()
-                    field_name = field_name.replace("/", "or")
-                    field_rw = data[fi + 3]
-
-                    if field_rw == 'R':
-                        field_rw = 'RO'
-                    elif field_rw == 'W':
-                        field_rw = 'WO'
-                    if '-V' in field_rw and 'V' not in access_type:
-                        access_type.append('V')
-                    field_rw_ = field_rw.replace('-V', '')
-                    field_rw = field_rw.replace('-V', 'V')
-                    if field_rw_ not in access_type:
-                        if field_rw_ not in string_hdl.access_type:
-                            logger.warning(f"Malformed access type {field_rw} "
-                                           f"for reg {field_name}")
-                        else:
-                            access_type.append(field_rw)
-
-                    field_desc = [data[f_].replace("''", "``") for f_ in range(fi + 4, efi)]
-                    if where_desc != '':
-                        field_desc.append(where_desc)
-                    if field_default_long is not None and field_default_long != field_default:
-                        field_desc.append(f"``{field_default} = {field_default_long}``")
-
-                    fields.append({
-                        "import": field_import,
-                        "where": field_where,
-                        "name": field_name,
-                        "bits": field_bits,
-                        "default": field_default,
-                        "default_long": field_default_long,
-                        "rw": field_rw,
-                        "description": field_desc,
-                    })
-                else:
-                    for i in range(fi + 1, efi):
-                        if any(c in data[i] for c in ('[', ']')) or len(data[i]) == 1:
-                            logger.warning(f"Suspicious imported field '{data[i]}' "
-                                           f"at imported field group at reg {reg_name}!")
-                        fields.append({
-                            "import": True,
-                            "where": None,
-                            "name": data[i].strip(),
-                            "bits": None,
-                            "default": None,
-                            "default_long": None,
-                            "rw": None,
-                            "description": None,
-                        })
-
-                data = data[efi + 1:]
-
-            if len(reg_params):
-                reg_params_set = set(reg_params)
-                reg_params = list(reg_params_set)
-                reg_params.sort()
-            regmap['subregmap'][title_tool]['regmap'].append(
-                {
-                    'import': reg_import,
-                    'where': reg_where,
-                    'name': reg_name,
-                    'address': reg_addr,
-                    'addr_incr': reg_addr_incr,
-                    'description': reg_desc,
-                    'fields': fields,
-                    'parameters': reg_params
-                }
-            )
-        regmap['subregmap'][title_tool]['access_type'] = access_type
+    if state == 'field':
+        close_reg(reg, subregmap)
 
     return regmap
 
 
-def resolve_hdl_regmap(rm: dict) -> None:
+def resolve_hdl_regmap(rm: dict, libs: set | None = None) -> None:
     """
     Resolve imported registers and fields at regmaps with the "USING" method.
     parse_hdl_regmap must be called first.
+    Only the regmaps in libs are resolved, all if None, the others must be
+    resolved already. The regmaps are resolved after the ones they import
+    from, and the imported subregmaps are kept at 'imports'.
     """
 
     def patch_field(r, p, r_, p_name):
@@ -397,28 +427,64 @@ def resolve_hdl_regmap(rm: dict) -> None:
     def resolve(r):
         using = {}
         for use in r['using']:
-            use_ = None
-            for i in rm:
-                for k in rm[i]['subregmap']:
-                    if use == k:
-                        use_ = rm[i]['subregmap'][k]
-                        break
-                else:
-                    continue
-                break
-            if use_ is None:
+            if use not in provider:
                 logger.warning(f"Couldn't find regmap '{use}'!")
             else:
-                using[k] = use_
+                using[use] = rm[provider[use]]['subregmap'][use]
 
         patch_reg(r['regmap'], using, r['using'])
         r['using'] = []
 
+    provider = {}
     for i in rm:
+        for k in rm[i]['subregmap']:
+            provider.setdefault(k, i)
+
+    libs = list(rm) if libs is None else [i for i in rm if i in libs]
+    for i in libs:
+        rm[i]['imports'] = sorted({u for k in rm[i]['subregmap']
+                                   for u in rm[i]['subregmap'][k]['using']})
+
+    libs_ = set(libs)
+    order = []
+    visited = set()
+
+    def visit(i):
+        if i in visited:
+            return
+        visited.add(i)
+        for u in rm[i]['imports']:
+            if u in provider and provider[u] in libs_:
+                visit(provider[u])
+        order.append(i)
+
+    for i in libs:
+        visit(i)
+    for i in order:
         for k in rm[i]['subregmap']:
             resolve(rm[i]['subregmap'][k])
 
 
+def get_hdl_regmap_importers(rm: dict, names: set) -> set:
+    """
+    Return the keys of the resolved regmaps importing, directly or through
+    other regmaps, any of the subregmaps in names.
+    """
+    importers_of = {}
+    for i, r in rm.items():
+        for u in r.get('imports', ()):
+            importers_of.setdefault(u, []).append(i)
+
+    importers = set()
+    pending = list(names)
+    while pending:
+        for i in importers_of.get(pending.pop(), ()):
+            if i not in importers:
+                importers.add(i)
+                pending.extend(rm[i]['subregmap'])
+    return importers
+
+
 
 def expand_hdl_regmap(rm: dict) -> None:
     """
@@ -448,7 +514,7 @@ def expand_hdl_regmap(rm: dict) -> None:
 
 
 
-def parse_hdl_component(file: str, ctime: float, owners: list | None = None) -> dict:
+def parse_hdl_component(file: str, owners: list | None = None) -> dict:
     if owners is None:
         owners = []
     component = {
@@ -457,7 +523,6 @@ def parse_hdl_component(file: str, ctime: float, owners: list | None = None) ->
         'bus_domain': {},
         'ports': {},
         'parameters': {},
-        'ctime': ctime,
         'owners': owners.copy()
     }
 
@@ -592,6 +657,7 @@ def parse_hdl_component(file: str, ctime: float, owners: list | None = None) ->
 
             del items[key]
 
+    track(file)
     root = etree.parse(file).getroot()
     spirit, xilinx, _ = get_namespaces(root)
     name = get(root, 'name').text
@@ -864,6 +930,7 @@ def parse_hdl_library(
     # Obtain parameters from the top module
     def get_parameters(mod):
         f = path.join(path.dirname(file), mod)
+        track(f)
         if not path.isfile(f):
             logger.warning(f"{file}: Top module '{f}' from library '{ip_name}'"
                            " does not exist")
@@ -911,6 +978,7 @@ def parse_hdl_library(
     # Obtain parameters from the top module
     def get_parameters_ttcl(mod):
         f = path.join(path.dirname(file), mod)
+        track(f)
         if not path.isfile(f):
             logger.warning(f"{file}: TTcl '{f}' from library '{ip_name}' does not exist")
             return None
@@ -1062,6 +1130,7 @@ def parse_hdl_project(
 
     base_path = path.dirname(file)
     sys_path = path.join(base_path, "system_project.tcl")
+    track(sys_path)
     if not path.isfile(sys_path):
         logger.warning(f"{sys_path}: File doesn't exist!")
         return (None, None)
@@ -5,6 +5,8 @@ from os import path
 
 from sphinx.util import logging
 
+from .cache import track
+
 logger = logging.getLogger(__name__)
 
 class tcl:
@@ -15,6 +17,7 @@ class tcl:
         Tabs are the same as spaces -> replace all tabs with space.
         Strip leading whitespace and from common methods like lists.
         """
+        track(file)
         data = []
         with open(file, "r") as f:
             line_ = ''
@@ -100,6 +103,7 @@ class tcl:
         tcls = []
 
         def parse(file_):
+            track(file_)
             if not path.isfile(file_):
                 logger.warning(f"{file_}: File doesn't exist!")
                 return
@@ -0,0 +1 @@
+Search.setIndex({"alltitles":{"ADI":[[5,"adi"]],"Aggregate":[[1,"aggregate"]],"Analog Devices Doctools":[[7,null]],"Build the container image":[[0,"build-the-container-image"]],"Card":[[3,"card"]],"Clear content":[[3,"clear-content"]],"Code":[[4,"code"]],"Collapsible":[[3,"collapsible"]],"Collection":[[3,"collection"]],"Collection pattern":[[3,"collection-pattern"]],"Color":[[5,"color"]],"Command line interface":[[1,null]],"Common sections":[[4,"common-sections"]],"Configure podman":[[0,"configure-podman"]],"Container":[[3,"container"]],"Continuous integration":[[0,null]],"Custom Doc":[[1,"custom-doc"]],"Custom directives":[[3,null]],"Custom roles":[[5,null]],"Description":[[3,"description"]],"Development install":[[8,"development-install"]],"Directives and roles":[[4,"directives-and-roles"]],"Doctools extended directives and roles are provided at:":[[4,null]],"Documentation deployment":[[2,null]],"Documentation guidelines":[[4,null]],"Documentation hierarchical structure":[[6,"documentation-hierarchical-structure"]],"Dokuwiki":[[5,"dokuwiki"]],"DownGit":[[5,"downgit"]],"Dynamic elements":[[4,"dynamic-elements"]],"ESD warning":[[3,"esd-warning"]],"EngineerZone":[[5,"engineerzone"]],"Esbonio tips":[[8,"esbonio-tips"]],"External references":[[4,"external-references"]],"Fetch source":[[1,"fetch-source"]],"Fetch third-party resources":[[8,"fetch-third-party-resources"]],"Fine-grained form":[[2,"fine-grained-form"]],"Flex":[[3,"flex"]],"Fundamentals":[[6,null]],"Further notes":[[2,"further-notes"]],"Generate the doc.yml from a collection":[[1,"generate-the-doc-yml-from-a-collection"]],"Git":[[5,"git"]],"Git LFS":[[2,"git-lfs"]],"Git LFS integration":[[1,"git-lfs-integration"]],"Git Large File Storage":[[4,"git-large-file-storage"]],"GitHub Pages deployment":[[2,"github-pages-deployment"]],"GitHub release archive":[[8,"github-release-archive"]],"Global options for directives":[[3,"global-options-for-directives"]],"Grid":[[3,"grid"]],"HDL build status":[[3,"hdl-build-status"]],"HDL common sections":[[4,"hdl-common-sections"]],"HDL component diagram":[[3,"hdl-component-diagram"]],"HDL directives":[[3,"hdl-directives"]],"HDL interface":[[3,"hdl-interface"]],"HDL parameters":[[3,"hdl-parameters"]],"HDL regmap":[[3,"hdl-regmap"]],"How can I rebuild the whole documentation within Serve?":[[1,"how-can-i-rebuild-the-whole-documentation-within-serve"]],"How do I cross-reference a specific version?":[[2,"how-do-i-cross-reference-a-specific-version"]],"How does it even work?":[[1,"how-does-it-even-work"]],"I don\u2019t want a doc at the root":[[2,"i-don-t-want-a-doc-at-the-root"]],"Images":[[4,"images"]],"Importing from DokuWiki to Sphinx":[[4,"importing-from-dokuwiki-to-sphinx"]],"In organization reference":[[4,"in-organization-reference"]],"Include template":[[3,"include-template"]],"Indentation matters":[[4,"indentation-matters"]],"Insight":[[3,null]],"Install the repository":[[8,"install-the-repository"]],"Install the web compiler":[[8,"install-the-web-compiler"]],"Installing":[[8,null]],"Interactive run":[[0,"interactive-run"]],"Known issues":[[4,"known-issues"]],"Link":[[5,"link"]],"Lists":[[4,"lists"]],"Local":[[2,"local"]],"Local references":[[4,"local-references"]],"MCP integration":[[8,"mcp-integration"]],"Metadata":[[9,"metadata"]],"Neovim support":[[8,"neovim-support"],[8,"id3"]],"Network users & partitions":[[0,"network-users-partitions"]],"Numbered references":[[4,"numbered-references"]],"Outside organization Sphinx reference":[[4,"outside-organization-sphinx-reference"]],"PDF LaTeX support":[[8,"pdf-latex-support"]],"Position matters":[[4,"position-matters"]],"Release install":[[8,"release-install"]],"Removing":[[8,"removing"]],"Repository-specific extensions":[[4,"repository-specific-extensions"]],"Resource quotas":[[0,"resource-quotas"]],"Rolling release":[[2,"rolling-release"]],"Runner token and GitHub token":[[0,"runner-token-and-github-token"]],"SVG":[[3,"svg"]],"Search docs":[[1,"search-docs"]],"Search dokuwiki":[[1,"search-dokuwiki"]],"Self-hosted cluster":[[0,"self-hosted-cluster"]],"Self-hosted runner":[[0,"self-hosted-runner"]],"Serve":[[1,"serve"]],"Shell":[[3,"shell"]],"Shortcuts":[[9,"shortcuts"]],"Sparse builds":[[1,"sparse-builds"]],"Sphinx theme":[[9,null]],"String array form":[[2,"string-array-form"]],"Supplier":[[5,"supplier"]],"Support custom JavaScript in hot reload":[[4,"support-custom-javascript-in-hot-reload"]],"Table of contents":[[4,"table-of-contents"]],"Tables":[[4,"tables"]],"Tabs":[[3,"tabs"]],"Text width":[[4,"text-width"]],"Theme options":[[9,"theme-options"]],"Third-party directives and roles":[[4,"third-party-directives-and-roles"]],"Top-level caption":[[4,"top-level-caption"]],"Usage example":[[3,"usage-example"]],"Using a Python virtual environment":[[8,"using-a-python-virtual-environment"]],"VScode/VScodium support":[[8,"vscode-vscodium-support"]],"Vendor":[[5,"vendor"]],"Versioned":[[2,"versioned"]],"Versioning":[[4,"versioning"]],"Video":[[3,"video"]],"Why is the Python source code of this repo not watched?":[[1,"why-is-the-python-source-code-of-this-repo-not-watched"]],"Why is the output missing styling (CSS stylesheet)?":[[1,"why-is-the-output-missing-styling-css-stylesheet"]],"Why was Author Mode renamed to Serve?":[[1,"why-was-author-mode-renamed-to-serve"]],"With preview":[[4,"with-preview"]],"Working with multiple docs":[[1,"working-with-multiple-docs"]]},"docnames":["ci","cli","deploy","docs_guidelines/directives","docs_guidelines/index","docs_guidelines/roles","fundamentals","index","install","theme"],"envversion":{"sphinx":66,"sphinx.domains.c":3,"sphinx.domains.changeset":1,"sphinx.domains.citation":1,"sphinx.domains.cpp":9,"sphinx.domains.index":1,"sphinx.domains.javascript":3,"sphinx.domains.math":2,"sphinx.domains.python":4,"sphinx.domains.rst":2,"sphinx.domains.std":2,"sphinx.ext.intersphinx":1},"filenames":["ci.rst","cli.rst","deploy.rst","docs_guidelines/directives.rst","docs_guidelines/index.rst","docs_guidelines/roles.rst","fundamentals.rst","index.rst","install.rst","theme.rst"],"indexentries":{},"objects":{},"objnames":{},"objtypes":{},"terms":{"100g":0,"11s":3,"150px":3,"16g":0,"2023_r2":1,"20g":0,"20h1":8,"224f5755415c":8,"29s":3,"4000v":3,"7m54":3,"94s":3,"A":[1,3,4,5,7,8,9],"AM":3,"After":[0,4],"Again":0,"All":[1,3],"An":[0,4],"And":[0,3,4,7],"As":[1,4,9],"At":[0,3,4,8],"Be":1,"Below":[0,1,3,5],"Both":[0,1],"But":[0,2,3],"By":[0,3,4,6],"Do":[1,3,4],"Doing":0,"Each":[1,4],"For":[0,1,2,3,4,5,8,9],"From":4,"Having":1,"Here":[1,4],"How":[7,8],"If":[0,1,2,3,4,6,8,9],"In":[0,1,2,6,9],"It":[1,3,4,5,8],"More":[1,3,4],"Most":0,"My":[1,4],"Not":1,"On":[1,3,4,6],"Or":[0,2,4,9],"Other":3,"Same":5,"So":4,"Some":1,"That":3,"The":[0,1,2,3,4,5,6,8,9],"Then":0,"There":[4,8],"These":[0,3,5],"They":4,"This":[0,1,2,3,4,8,9],"To":[0,1,2,3,4,5,8,9],"What":7,"When":[4,5,9],"Where":[1,4],"While":1,"With":[1,2,3,8,9],"You":[0,1,3,4,5,8,9],"_":[0,3,4],"__init__":0,"_build":[1,2,4,8],"_context":4,"_imag":3,"_p":3,"_phi":3,"_somedoc":4,"_sourc":2,"abl":[0,2,8],"abov":3,"absent":5,"absolut":[3,8],"abspath":4,"accept":1,"access":[1,3,8],"accident":3,"accord":3,"accumul":3,"achiev":0,"across":[1,4],"action":[0,2,3,4,7],"activ":[0,8],"actual":4,"ad":5,"ad0000":5,"ad2234":4,"ad2234_sdz":4,"ad2234_sdz_schemat":4,"ad4050":3,"ad4052":[1,3],"ad4052_ardz":3,"ad405x":3,"ad4060":1,"ad4062":1,"ad4630":1,"ad7175":5,"ad7616":4,"ad7616_sdz":4,"ad9081":[1,5],"ad9084":1,"adc":[1,3,5],"adc_data_i":3,"adc_data_i0":3,"adc_data_q":3,"adc_data_q0":3,"add":[1,2,3,4,5,8,9],"addit":[1,2],"address":5,"adi":[0,1,2,3,4,7,8,9],"adi_doctool":[0,1,4,6,8],"adi_link":5,"adi_regmap_":3,"adjust":0,"admin":0,"administr":0,"adoc":[0,1,2,3,4,8],"adoc_doc_vers":[2,4],"adoc_hdl_cach":3,"adoc_interref_uri":4,"adrv9009":4,"adsb_exampl":5,"adventur":0,"aes256":0,"affect":1,"aggreg":[4,6,7],"ai":[1,8],"airplan":5,"al":3,"algorithm":1,"alia":[0,4],"align":[3,4],"aliv":1,"allow":[0,1,2,3,4,5,8],"alongsid":4,"alreadi":[0,1,3,4,8,9],"also":[0,1,2,3,4,5,8],"alt":[4,9],"altera":5,"altern":[0,1,3,9],"although":3,"alway":[0,1,3,4,8],"amd":5,"among":3,"analog":[1,3,4,5,8],"analogdevicesinc":[0,1,2,4,8],"analysi":2,"anchor":[4,9],"angl":[1,3],"angle19":3,"ani":[1,2,3,4,5],"anim":4,"anoth":[0,1,3,4],"answer":1,"antenna":3,"anyth":3,"api":4,"apollo":1,"app":4,"appear":[4,8],"append":[0,1,3,4,9],"appl":3,"appli":[0,3,4,8],"applic":4,"approach":0,"approv":0,"apt":4,"arbitrari":3,"ardz":[1,3],"area":4,"argument":0,"arrang":3,"arrow":5,"arrowleft":9,"arrowright":9,"artifact":[0,1,2,4],"artifact_path":4,"asset":0,"assign":0,"associ":6,"async":1,"asyncio":1,"attent":4,"attribut":6,"authent":0,"auto":[1,3,5,8],"autom":4,"automat":[0,1],"auxiliari":3,"avail":[0,1,3,4,7,8,9],"avoid":[0,3,4,8],"awar":2,"away":4,"axi":1,"axi_dmac":4,"a\u00e7a\u00ed":3,"b":[5,9],"back":1,"background":[1,4],"badg":3,"bandwidth":1,"banner":4,"bar":[4,9],"base":[4,7,8,9],"basenam":3,"bash":[1,3,4],"bashrc":0,"basi":9,"basic":[3,4],"batch":[0,1,9],"becaus":[0,3,4,5,9],"befor":[1,3,8],"begin":4,"behav":3,"behavior":[1,3],"behaviour":8,"belong":[1,3,7],"better":[3,4,5],"beyond":[1,4,8,9],"big":0,"big_cpu":0,"bigtim":0,"bin":[0,8],"binari":1,"bind":6,"bindpath":0,"bindreadonlypath":0,"bit":[1,3],"block":4,"bm25":1,"board":[3,4,6],"bodi":[3,9],"bold":4,"book":4,"bootstrap":3,"box":9,"branch":[0,1,2,4,5,8],"break":[3,4,8],"brief":[4,7],"briefli":1,"bring":4,"brot":1,"browser":[1,9],"bs":3,"build":[2,4,5,7,8,9],"build_status_fil":3,"build_zynq_kernel_imag":5,"builder":[1,3,4,8],"built":[0,1,2,3,4,8],"bump":8,"bundl":[1,8],"bundler":8,"bus":3,"buse":3,"byte":3,"c":[2,3,4,9],"cabl":3,"cach":[1,3,4],"cairosvg":8,"calibr":3,"calibrate_frm_en":3,"call":[0,1,4,7,8,9],"can":[0,2,3,4,5,8],"caption":[1,3],"captur":1,"care":[3,8],"case":[0,4,5,9],"cat":[0,4],"catch":0,"categori":1,"caught":8,"caus":[1,8],"cd":[0,1,3,8],"center":3,"central":6,"cgroup":0,"cgroup_no_v1":0,"chain":1,"chang":[0,1,3,5,8],"channel":1,"charact":[3,4,5],"charg":3,"cheat":4,"check":[0,1,3,4,5],"checkout":[1,2,4],"child":4,"choos":[4,8],"ci":[0,3,4,8],"ciphertext":0,"circuit":5,"circuitri":3,"class":[3,4,9],"claud":8,"clausen":3,"clean":[0,1,2,4],"cleanup":4,"clear":4,"cleardoublepag":3,"clearer":2,"cli":[0,1,8],"click":4,"client":[4,5],"clis":8,"clone":[1,4],"close":2,"cluster":3,"coat":3,"code":[2,3,8],"codex":8,"collection_pattern":3,"collid":9,"color":3,"column":[2,3,4],"com":[0,1,2,3,4,8],"combin":4,"comma":0,"command":[0,3,4,7,8],"comment":3,"commit":[0,2,8],"committ":2,"common":[8,9],"communiti":5,"compact":[1,3],"compat":[0,4],"compil":[0,1],"complet":2,"compress":1,"concatan":0,"concept":6,"concis":[1,2,4],"concurr":2,"condit":1,"conf":[0,1,2,3,4,9],"config":[0,1,2,4,8],"config_cfs_bandwidth":0,"configur":[1,3,6,8],"confirm":8,"conflict":4,"conform":4,"conmon":0,"connect":[1,3],"consecut":3,"consid":[0,1,4,8],"consol":4,"const":4,"contain":[1,2,4,5,6,8],"containerfil":[0,8],"content":[1,2,5,6,7,9],"content_root":4,"context":[4,8,9],"contextu":4,"continu":[1,2,3,4,7],"contribut":4,"control":[0,1,2,3,4],"control_interfac":4,"convert":[2,4,9],"cool":4,"copi":[0,1,3,4],"core":[0,1,3,7],"core_repo":4,"corner":0,"correct":[4,8],"cosmic":[7,9],"cost":1,"counter":4,"cover":0,"cp":0,"cpu":0,"cpuquota":0,"cpuset":0,"cr":0,"creat":[0,1,2,3,4,5,8],"cred":0,"credenti":0,"critic":1,"cross":[1,3,9],"css":[3,4,8],"csv":4,"ctrl":[4,9],"curl":0,"current":[1,3,4,5,6,9],"custom":[0,7,9],"custom_doc":1,"customiz":6,"cut":2,"cygpath":3,"d":[0,2,3,9],"daemon":[0,1,4],"damag":3,"dan":3,"dangl":4,"dark":[4,9],"dark_logo":9,"data":[3,4],"data_sheet":5,"data_tx_":3,"data_tx_12":3,"data_tx_12_p":3,"data_tx_23":3,"data_tx_23_p":3,"data_width":3,"databas":4,"dbus_session_bus_address":0,"dd":3,"de":3,"deactiv":8,"decrypt":0,"dedic":[2,7],"def":4,"default":[0,1,2,3,4,5,8],"defin":[0,4,5],"degrad":3,"deinit":4,"deleg":0,"demand":[0,1],"depend":[0,1,8,9],"deploy":[0,3,7,9],"deprec":[3,5],"depth":[1,2,4,6],"describ":[0,1,2,3,4],"descript":[0,1,4,8],"design":[0,1,3,7,9],"desir":[1,3,5,9],"dest_dir":4,"detail":[3,9],"detect":[1,3],"determin":4,"dev":[0,1,2,3,4,8],"develop":[1,2,7],"devic":[1,3,5,9],"device0":3,"device2":3,"device3":3,"device4":3,"device5":3,"device6":3,"devroom":3,"diagram":4,"dict":3,"dictat":4,"dictionari":9,"differ":[1,9],"digikey":5,"digil":5,"dir":[4,8],"direct":[0,1,7,8],"directori":[1,2,3,4],"dirnam":2,"disabl":[3,9],"discard":0,"discharg":3,"discourag":[3,4],"disk":0,"display":6,"distinct":5,"distribut":8,"distro":8,"divid":[4,8],"dmac":3,"doc":[0,3,4,5,6,7,8,9],"docker":[0,3,7,8],"docker_host":0,"docnam":[3,4],"docs_guidelin":[3,4,5,8],"doctool":[0,1,2,3,5,6,8,9],"doctools_latex":8,"doctre":1,"doctyp":2,"document":[0,3,5,7,8,9],"doe":[0,2,3,9],"doesn":3,"dom":[3,4],"don":[0,1,3,4,8],"dot":4,"doubl":9,"download":[0,1,2,5,8],"drive":[1,3],"driver":[0,3,4,5],"drop":1,"dropdown":3,"drwxr":3,"ds190":5,"dual_ad4052_ardz":3,"due":[0,8,9],"duplic":0,"durat":1,"dure":[0,1,3,5],"e":[0,1,2,3,4,5,6,7,8,9],"eas":1,"easi":[0,1,3],"easier":4,"easili":3,"ebz":5,"echo":[0,3],"edit":[1,4,8],"editor":[4,8],"effect":[0,1,3,9],"either":[1,2,4,8],"elabor":2,"electrostat":3,"elem":4,"element":3,"elimin":0,"els":[0,2,4],"email":2,"emb":3,"embed":3,"emphas":4,"empti":[1,2,3,4],"empty_glob":1,"en":[4,5],"enabl":[0,1,4,8],"encrypt":0,"end":[4,5,8],"endfor":3,"endtitl":3,"energi":3,"engin":[0,3,9],"ensur":[0,1,3,4,8],"entri":[1,2,3,4,6,8],"entrypoint":0,"enumer":4,"env":[0,2,4],"environ":[0,1,3,4],"envvar":4,"eof":0,"ephemer":0,"equal":3,"equip":3,"equiv":2,"equival":[0,3,4],"error":[2,3],"esc":9,"estobio":8,"etag":1,"etc":[0,3],"eval":[1,3,4,5,6],"evalu":[1,3,4,6],"even":[2,3,4,9],"event":[1,2,4],"event_nam":2,"ever":[0,4],"everi":[0,1,2,3,4,5],"evict":1,"evinc":1,"evolut":4,"exact":[3,4],"exampl":[0,1,2,4,5,8,9],"exceed":3,"except":3,"exclud":1,"exclude_pattern":1,"exec":[0,2],"execstart":0,"execut":[0,1,8],"exist":[0,3,4,6,9],"exit":[0,2,8,9],"expand":[3,4,6],"expect":0,"experi":4,"experiment":2,"expir":0,"explain":[3,5],"explanatori":4,"explicit":[3,4,8],"export":[0,2,4],"export_raw":4,"expos":8,"ext":[1,4],"ext_repo_nam":4,"extend":[3,8],"extens":[1,3,7,8],"extern":[0,1,3,5],"extra":[1,3,4],"extract":[0,1,4],"ez":5,"f":[4,8],"fail":[0,1,8],"fair":3,"fall":1,"fallback":[3,8],"fals":[5,9],"fast":4,"faster":4,"fau":3,"favorit":[0,1,4,8],"fdx":2,"featur":[1,2,3,4,6,9],"feel":0,"fetch":[0,4],"field":[5,9],"fifo":0,"figur":4,"file":[0,1,2,3,5,8,9],"file_basenam":1,"filenam":5,"fill":[3,5],"filter":1,"final":[0,1,3,5,8],"find":2,"fine":0,"firefox":4,"first":[0,1,2,3,4,8,9],"flag":[0,2,3,9],"float":3,"fmca":5,"focus":9,"fold":4,"folder":[0,1,2,3,8],"follow":[0,2,3,4],"font":[5,8],"footer":4,"forc":3,"forese":4,"fork":[2,5],"form":4,"format":[2,3,4,5],"former":[4,7,9],"forward":0,"fosdem":3,"found":[1,4],"found_doc":4,"fpga":5,"framework":3,"freedom":4,"frequent":4,"fresh":1,"fruit":3,"fruit_typ":3,"ftp":3,"full":[0,1,2,3,4,5],"function":[3,4],"fundament":7,"futur":[3,9],"fuzz":0,"g":[0,1,2,3,4,5,6,7,8,9],"gb":[3,8],"gcm":0,"gemini":8,"general":[1,4,5,6],"generat":[0,2,3,4,6,7,8],"get":[1,3,4,5],"gh":[0,2],"git":[0,8],"git_branch":2,"git_lfs_skip_smudg":1,"git_lfs_to_link":2,"git_org_repositori":2,"gitattribut":[1,4],"github":[1,3,4,7],"github_pat_mytoken":0,"github_sha":2,"github_token":0,"githubusercont":[0,2,8],"give":0,"global":[2,4,5],"gnome":1,"go":2,"goe":9,"good":3,"gpg":0,"gq":4,"grab":0,"grain":0,"grammar":8,"graphroot":0,"green":[0,3,5],"grep":0,"grid":4,"group":[3,4,5],"guarante":8,"guava":3,"gui":[0,5,8],"guid":[1,3,4,5],"guidelin":[5,7],"gz":[0,2,8],"gzip":1,"h":[0,3],"handl":[0,1],"happen":4,"har":[1,8],"hard":[2,4],"harden":0,"harder":4,"hardwar":4,"hardware_guid":4,"harmon":[4,7,8,9],"hasattr":4,"hash":1,"hdl":[1,5],"hdl_2023_r2":5,"head":[0,2,4,8],"head_commit":2,"header":[3,4,6,9],"hello":[3,4],"hello_world":4,"hellowindow":3,"help":[0,1,3,4],"hidden":[3,4],"hide":3,"hide_collapsible_cont":3,"hierarch":3,"hierarchi":[1,4],"high":[3,8],"higher":[3,4],"home":[0,3],"hook":[3,4],"host":[1,3,7],"hostnam":0,"hot":2,"hot_reload":4,"hotreload":4,"hover":3,"howev":[0,1,3,4],"hpc":1,"html":[0,1,2,3,4,5,6,7,8,9],"html_theme_opt":9,"http":[1,2,3],"http2":1,"https":[0,1,2,3,4,8],"hugo":1,"human":[1,3],"hyphen":4,"id":[0,4],"ide":1,"idea":4,"ideal":0,"ident":[1,3],"identifi":[0,6],"idx":0,"ignor":0,"ignore_chown_error":0,"iio":[1,2,3,4,6],"iio_reg":3,"iiosdr":3,"imag":[1,2,3],"img":[0,3],"implement":[2,3,4],"implic":0,"import":[0,1,5],"importantfil":3,"improv":4,"inc":[3,5,7],"includ":[1,4,8],"incomplet":9,"incorrect":4,"increment":[0,9],"indent":[0,3],"independ":1,"index":[1,2,3,4,6,8,9],"industri":3,"infer":[1,3,4],"info":[0,2,3,4],"inform":[0,3,4,7],"inherit":6,"init":[0,4],"inject":4,"inkscap":4,"inobtcount":0,"inotifi":1,"input":2,"insert":[3,4],"insid":[3,4,8],"inspect":8,"inspecttre":8,"inspir":1,"instal":[0,1,2,4,7],"instanc":[1,3,4],"instanti":1,"instead":[0,1,3,4,5,8],"instruct":[0,3,4,7,8],"instrument":1,"integr":[4,7,9],"intel":5,"intend":5,"intent":[4,5],"interact":3,"interest":[3,4],"interfac":[0,4,7],"intermedi":0,"intermediari":4,"internal":[4,8,9],"interref_loc":[1,4],"interref_repo":[1,2,4],"interref_uri":4,"intersphinx":[1,4],"intersphinx_disabled_reftyp":1,"intersphinx_map":[1,4],"intro":1,"intuit":4,"inv":[1,2,4],"inventori":1,"invert":1,"invok":[4,8],"io":[0,1,3,4],"ip":3,"ip_path":3,"ish":0,"isol":0,"issu":[0,8],"item":[3,4],"j":8,"javascript":[0,1],"jesd":1,"jinja":3,"jinja2":3,"job":[0,2],"join":[4,9],"jpg":[1,4],"jq":2,"js":[4,8],"js_script_memori":4,"json":[1,2,3,4,8],"just":[0,1,4,8],"k":9,"keep":[0,1,2,4,8],"kernel":0,"kernelcommandlin":0,"key":[3,9],"keyr":0,"keyword":4,"kind":4,"kiwi":3,"know":4,"known":1,"kuiper":3,"lab":5,"label":[0,1,2,3,4],"land":[3,6,9],"landing_pag":9,"languag":[7,8,9],"languagetool":8,"lar":3,"larg":1,"last":[4,5,8],"lastwritetim":3,"latenc":1,"latest":[0,1,2,4,8],"latex":[1,3,4],"latex_engin":8,"launch":[0,1,7],"lazyvim":8,"learn":[1,3],"least":[0,1,8],"left":[3,6],"legaci":3,"legibl":3,"length":3,"less":4,"lessimportantfil":3,"let":4,"letter":4,"level":[0,1,3,6,8],"lfs":4,"libiio":[1,3,5,6],"librari":[3,4],"licens":0,"lifetim":1,"light":[4,9],"light_logo":9,"like":[0,1,3,4,5],"limit":[0,1,8],"line":[3,4,7],"lineno":4,"liner":0,"linger":0,"link":[1,2,3,4],"linux":[0,1,3,4,5],"list":[0,1,3,6,9],"listen":1,"live":[0,1,2,7],"llm":8,"load":[0,1,4,8],"loadcredenti":0,"loadcredentialencrypt":0,"local":[0,1,7,8],"localhost":0,"localtoc":6,"locat":[0,4,9],"log":[2,4],"logic":[4,9],"login":0,"loginctl":0,"lognam":0,"logo":[3,4,9],"logo_dark":9,"logo_light":9,"logout":0,"long":3,"longer":4,"look":[1,4],"lookup":1,"loss":3,"low":[1,3],"lower":4,"ls":[2,3],"lts":8,"lut":[1,4,6],"m":[0,1,2,4,8],"machin":0,"machine_nam":0,"macro":4,"made":1,"main":[0,1,2,3,4,5,8],"maintain":4,"make":[0,1,2,3,4,8],"makefil":1,"manag":[0,4,5,6,8,9],"mani":9,"manipul":4,"manner":3,"manual":0,"map":[0,3,4],"mark":[0,3,9],"markdown":[3,8],"markup":1,"mask":1,"master":4,"match":[1,2,3,4],"mathjax":4,"mathwork":5,"matter":[3,7],"max":3,"maxdepth":[1,4],"maximum":0,"may":[0,1,3,4,5,9],"mb":3,"mcp":1,"md":[3,6],"mean":[2,3,4,5],"meant":[1,3],"media":2,"memori":[0,1,4,8],"memorymax":0,"memoryswapmax":0,"merg":[2,4],"meta":[2,3,9],"metadata":[3,4],"method":[0,4,8],"methodolog":8,"mib":1,"microcontrol":5,"middl":0,"migrat":[0,4],"millisecond":1,"min":[0,4],"mind":[1,3],"minifi":8,"minim":1,"minimum":0,"minut":1,"mitig":0,"mix":8,"mjs":4,"mkdir":0,"mkdoc":1,"mkfs":0,"mmcblk0":3,"mode":3,"modern":8,"modifi":[0,1],"modul":[4,8],"mono":6,"monolith":[1,3,4],"more_inform":4,"mount":0,"mouser":5,"move":3,"mp4":3,"msps":[1,3],"much":0,"multi":0,"multipl":[0,3,4,6,7],"multiplex":1,"must":[0,4,5,6],"mw":5,"mxfe":1,"my_cod":4,"my_doc":1,"my_imag":1,"my_project":1,"my_repo":4,"my_script":4,"mydata":3,"myscript":4,"mysignal_phy_4":3,"myverysecrunnertoken":0,"n":3,"name":[0,1,2,3,4,5],"name_label":0,"namespac":0,"nativ":6,"natur":4,"navig":4,"necessari":[1,4],"nechita":3,"need":[0,1,2,3,4],"neither":1,"neovim":[1,4],"nest":3,"new":[0,2,3,4],"new_tag":2,"newer":8,"next":[2,3,4,8,9],"nfs":0,"no_index":9,"node":[4,8],"nodesourc":8,"noindex":9,"nojekyl":2,"non":[0,4],"none":[1,4],"normal":[0,1,3],"note":[0,1],"notic":[2,3,4],"now":[0,5],"npm":[1,4,8],"nrext64":0,"null":2,"num_of_sdi":3,"number":[1,2,3],"numfig":4,"numfig_format":4,"numfig_per_doc":4,"numref":4,"nvim":8,"o":[0,4,5],"object":[1,2,4],"obtain":[0,2,3,4,8],"occur":3,"oci":0,"offlin":[2,7],"offset":4,"old":[4,8],"onc":[3,7],"one":[0,1,2,3,6,9],"oneshot":0,"onli":[0,1,2,3,4,5,6,7,9],"onlin":0,"onload":4,"onto":3,"open":[1,4,8],"opencod":8,"oper":9,"optim":4,"option":[0,1,2,4,5,8],"orchestr":[2,7],"order":[0,4],"org":[0,2,4],"organiz":[0,1,2,6,7],"organization_self_hosted_runn":0,"origin":[0,2,3,4],"orphan":2,"os":[1,3,4,5],"oscilloscop":1,"others":3,"outdir":4,"outfil":4,"output":[0,3,4,6],"outsid":8,"overcompl":4,"overlay":0,"overrid":4,"overview":[1,4,5],"overwrit":1,"overwritten":4,"owner_repositori":0,"ownership":0,"p":[0,1],"p_vntewue24":3,"packag":[0,1,2,4,7,8],"pad":3,"page":[0,1,3,4,5,6,7,9],"pair":3,"pandoc":4,"papaya":3,"paragraph":[3,4,8],"parallel":[0,3],"paramet":[0,4,5],"pardir":4,"parent":4,"pars":[3,4,9],"parser":8,"part":[1,4],"parti":[0,3],"particular":4,"pass":[0,3],"password":3,"past":1,"patch":[1,2,4],"path":[0,1,2,3,4,5,8,9],"path_absolut":3,"path_relative_to_hom":3,"pathnam":5,"pattern":[1,4],"pay":4,"pdf":[0,1,3,4,5,7],"pdflatex":8,"pdfs":4,"penal":8,"pend":5,"per":[0,1,4,9],"percentag":3,"perform":3,"perman":[3,9],"permiss":[0,2],"peter":3,"philosophi":0,"photo":4,"phrase":4,"physic":3,"pi":8,"pick":1,"pid":0,"piec":6,"pip":[1,2,4,8],"pip3":0,"pipelin":[0,3,4,7],"pipx":8,"place":4,"placehold":9,"placement":4,"plain":[0,2],"platform":1,"pleas":[0,1,2,3],"plugin":[1,8],"pmod":5,"png":[1,3],"podman":[3,7,8],"point":[1,2],"pointer":[0,1,2,4],"pointer_fil":1,"poll":1,"pool":1,"port":[3,4],"possibl":[0,1,4,6],"power":[1,3],"powershel":3,"pr":4,"practic":4,"pre":[0,1,2,8],"precaut":3,"preced":[0,3,4],"prefer":[0,4,5],"prefix":[3,4],"present":[1,3,4,5],"preserv":[4,9],"pretti":5,"previous":[0,3,4,8,9],"principl":7,"print":[3,4,5],"printabl":4,"printf":[0,4],"prior":0,"privateipc":0,"privatemount":0,"privatetmp":0,"privateus":0,"probabl":1,"proc":0,"procedur":3,"process":[0,1,3,4,8],"product":[3,5],"profil":1,"program":[4,6],"programm":5,"progress":4,"project":[1,3,4],"project_0":9,"project_1":9,"prompt":[1,8],"propag":4,"proper":[0,1,3,4],"properti":1,"protect":[2,3],"protecthostnam":0,"protocol":8,"provid":[0,2,3,5,7,8,9],"provis":0,"prs":[0,2],"ps1":3,"public":[0,1],"public_doctools_runner_token":0,"public_github_token":0,"pull":[1,2,9],"pull_request":[2,4],"pulsar":5,"purpl":3,"purpos":[3,5],"push":[0,2,4],"pute":3,"pwd":8,"px":3,"py":[0,1,2,3,4,5,6,8,9],"pyadi":[2,4,6],"pypa":8,"pypi":8,"pyproject":8,"pytest":0,"python":[0,2,3,4,6],"python3":[0,4,8],"q":[0,4],"qualifi":5,"qualiti":3,"queri":1,"queryselector":4,"queu":1,"quick":[1,4],"quiet":[0,2],"r":[2,4,8],"rais":3,"rambutan":3,"rank":1,"rather":4,"raw":[0,2,3,5,8],"re":4,"reach":1,"read":[0,1,3,4,7,8],"readabl":[0,1,5],"readili":3,"readthedoc":0,"real":[3,4],"rebuilt":1,"receiv":1,"recent":[1,4],"recomemd":8,"recommend":[0,2,3,4,5,8,9],"record":[3,4],"red":[3,5],"redirect":[2,9],"reduc":[1,4],"ref":[0,1,2,3,4],"ref_nam":[2,4],"refer":[1,3,6],"referenc":[1,4],"reflink":0,"refresh":[1,2],"regex":3,"regist":3,"regmap_nam":3,"reinstal":8,"relas":0,"relat":[1,3,4],"relax":0,"releas":[0,1,4,5,7],"relev":0,"reli":4,"reload":[0,1,2],"rememb":0,"remot":[1,2],"remov":[0,2,3,4],"render":[3,4,5],"repeat":1,"repetit":[3,4],"replac":[0,3,4],"repo":[0,2,3,4,5,6,8],"repo_nam":4,"repo_path":4,"repo_root":4,"repositori":[0,1,2,3,5,6,7,9],"repotoc":[4,6],"request":[0,1,2,4,5,9],"requir":[0,1,2,3,4,5,8],"rerun":1,"reset":[2,4],"resid":1,"resiz":4,"resolv":[0,1,4],"resort":4,"resourc":[1,4,5],"respect":[3,4],"respons":[1,3],"rest":4,"restart":0,"result":[1,3,4,8,9],"resum":1,"retrigg":4,"return":[1,8],"reus":[1,4],"revalid":1,"review":9,"rewrap":4,"rf":0,"right":[3,4,6,9],"risk":0,"rm":[0,2,8],"role":[6,7,8],"roll":7,"rollup":[4,8],"root":[0,3,4,5,7,8],"rootdirectori":0,"rough":0,"row":3,"rst":[1,3,4,5,6,8],"rule":[1,4,7],"run":[1,2,5,8],"runner":[3,7],"runner_allow_runasroot":0,"runner_label":0,"runner_nam":0,"runner_token":0,"runtim":0,"rw":3,"rx":1,"rx_phi":3,"rx_phy2":3,"rx_phy4":3,"s":[0,1,2,3,4,5,7,8,9],"sampl":3,"sandbox":3,"sar":[1,3],"sass":[0,8],"save":[0,1,4,8],"scenario":5,"schemat":4,"scope":[0,9],"scopi":1,"scp":0,"scratch":1,"screen":[3,4],"script":[0,1,4,5,8,9],"script_add":4,"script_remov":4,"sdi":3,"sdk":1,"sdo":3,"sdz":4,"search":[2,3,4,5,8,9],"search_wiki":8,"searchindex":1,"second":1,"secondari":4,"secreci":0,"secret":0,"section":[0,1,3,8,9],"secur":0,"see":[0,1,2,3,4,8],"select":[3,4,9],"self":[3,7],"sendfil":1,"sensit":[3,5],"sent":1,"seo":3,"separ":[0,2,4,8],"sequenc":1,"serv":[2,4,7,8,9],"server":[0,1,2,4,5,7,8],"servic":[0,3],"set":[0,1,2,3,4,5,7,8,9],"setup":[1,2,4,8],"setuptool":8,"sh":[0,2,3,4,5,8],"shall":[2,4],"share":[0,2,3],"sheet":[4,8],"shell":[0,4],"shift":9,"ship":8,"short":4,"shorter":[4,5],"show":[3,4],"shown":4,"side":[3,4],"sidebar":[4,9],"signal":3,"signific":1,"silent":1,"similar":[1,3],"simpl":[2,3,4],"simpler":[2,4],"simpli":[4,8],"simplifi":4,"sinc":[0,1,3,4,5,8,9],"singl":[0,1,3],"sitemap":5,"sitter":8,"size":3,"skill":8,"skip":[0,1,4,9],"slice":0,"slim":8,"slurp":2,"small":3,"smudg":[1,4],"snappi":1,"snippet":3,"soc":5,"sock":[0,1],"socket":[0,1],"soft":1,"softwar":[1,4,5],"software_defined_radio":3,"software_guid":4,"sole":[1,5],"solut":[0,1],"someon":4,"someth":[0,2],"sometim":4,"somewhat":3,"somewher":[0,4],"sort":2,"sourc":[0,3,4,8],"space":[0,3,4],"spars":8,"special":[0,3,9],"specif":[0,1,8],"speed":4,"sphinx":[1,2,3,5,6,7,8],"sphinxopt":2,"spi":3,"spi_engin":[3,4],"spi_engine_interconnect":3,"split":6,"sql_path":4,"sqlite":4,"squash":3,"srcdir":4,"ssh":0,"sssd":0,"stabl":[0,2],"stage":[0,2],"standalon":9,"standard":[3,6],"start":[0,1,4],"stat":1,"static":[3,4],"statist":1,"stdin":0,"step":[0,1,2,4,8],"still":[0,1,3,8],"storag":[0,1,3],"store":[0,2,3,4,6,8],"straight":0,"strategi":[0,1],"strict":4,"string":4,"structur":4,"stub":9,"studio":8,"style":[3,4,8],"stylesheet":8,"subdirectori":4,"subject":3,"subset":3,"subtitl":[1,3],"subuid":0,"succeed":0,"success":0,"sudo":[0,3],"suffic":[2,3],"suffix":[2,3,4,8],"sugar":3,"suggest":[0,2,4,9],"suitabl":1,"summari":1,"super":[3,4],"support":[0,1,2,3,5,9],"suppos":1,"suppress":[0,1],"suppress_warn":1,"sure":[1,4,8],"svg":[4,9],"sw":4,"switch":[1,4],"symbol":[0,1,3,4,8],"syntax":[3,4,5],"sys":[3,4],"system":[0,1,4,9],"systemctl":0,"systemd":[0,3,7],"t":[0,1,3,4,5,8],"tab":[1,4,9],"tabl":[1,3,6],"tabular":3,"tag":[0,2,3,4,8,9],"take":[2,3],"taken":4,"tar":[0,2,8],"tarbal":0,"target":[0,2,3,4],"tasksmax":0,"teach":8,"tee":[0,8],"tell":4,"temper":3,"templat":[1,4],"temporari":9,"term":4,"termin":0,"terser":8,"test":[0,1,3,8],"texliv":8,"text":[0,1,3,5,8,9],"theme":[1,4,7,8],"therefor":3,"thing":[3,4],"think":4,"third":[0,3],"though":4,"thread":1,"three":6,"thrown":[3,4],"thumb":4,"time":[0,1,3,4],"timeoutstopsec":0,"timestamp":1,"titl":[1,3,4,6],"tlmgr":8,"tmp":[0,1],"toc":[1,4,6],"toctre":[1,4,6],"togeth":[1,3,6],"token":4,"toml":8,"tool":[0,1,2,3,4,5,7,8],"top":[1,3,6,9],"topic":[4,6],"total":3,"touch":[1,2,5],"tpm2":0,"track":[1,4,5],"transit":1,"tree":[1,8],"tri":[1,4],"trigger":[1,8,9],"tropic":3,"true":[0,2,3,4,9],"truncat":0,"tsinstal":8,"ttl":1,"tune":[0,4],"tutori":4,"tweak":4,"twice":1,"two":[0,1,2,3,4,8],"txt":[2,3,4,8],"type":[0,2,3,4,5],"typeof":4,"typeset":4,"ubuntu":[2,8],"uid":0,"umd":4,"unchang":1,"undefin":4,"underlin":4,"underscor":[4,5],"understand":[0,1],"unicod":8,"unifi":4,"unified_cgroup_hierarchi":0,"uninstal":8,"unit":[0,3],"universiti":[4,6],"unix":[0,1],"unless":0,"unlik":0,"unord":4,"unrel":4,"unset":[1,4],"unsetenviron":0,"unshar":0,"unstabl":2,"unwant":1,"updat":[0,1,4,8],"upgrad":[2,8],"upload":[0,2],"url":[1,2,3,4,5],"us":5,"usag":[1,4,8],"use":[0,1,2,3,4,5,6,7,9],"user":[1,2,3,4,5,8],"user_guid":5,"usr":0,"util":8,"uvx":8,"v":[3,4,8],"v0":8,"v1":[2,4],"v2":[0,2,4],"v4":[0,2],"v5":2,"val":3,"valid":[4,5],"validate_link":5,"valu":[2,3,4,5,8,9],"var":0,"variabl":[0,2,3,4],"variant":9,"vector":4,"vendor":1,"venv":[0,8],"verbos":4,"veri":5,"verilog":4,"version":[0,7,8],"via":[0,2],"view":5,"viewer":1,"virtual":5,"visibl":4,"visit":[3,9],"visitor":8,"visual":[4,8],"vivado":[1,3],"void":4,"volum":4,"vr":2,"vscode":[1,4],"vscodium":1,"w":[2,8],"walk":1,"want":[0,1,3,4],"wantedbi":0,"warn":[0,1,2,4],"watch":[0,3,8],"way":[1,3,4],"web":[1,5],"webpack":1,"webpag":[1,4,5,6,8,9],"websit":5,"well":[4,9],"wget":4,"white":4,"whole":9,"wide":4,"width":3,"wiki":[1,4,5],"wikifil":4,"will":[1,2,3,4,5,8,9],"window":[1,3,4,8],"wish":0,"within":[0,4],"without":[0,1,2,3,4,5,7,8],"won":[1,3,5],"wonki":4,"word":4,"work":[0,2,3,4,7,8],"workflow":[0,2],"world":[3,4],"worri":3,"wors":4,"worth":1,"wrap":[1,3,4,5],"wrapfig":8,"write":[0,2,3,4],"written":3,"wsl2":0,"wslconfig":0,"www":[3,4,5],"x":[2,3],"xact":3,"xc":0,"xdg_cache_hom":0,"xdg_config_dir":0,"xdg_config_hom":0,"xdg_data_dir":0,"xdg_data_hom":0,"xdg_runtime_dir":0,"xdg_state_hom":0,"xelatex":8,"xfs":0,"xilinx":5,"xml":[3,4],"xr":3,"yaml":[3,8],"yellow":3,"yes":[0,4],"yml":2,"youtub":3,"z":9,"zgrep":0,"zoom":4,"zsh":3,"zynq":5},"titles":["Continuous integration","Command line interface","Documentation deployment","Custom directives","Documentation guidelines","Custom roles","Fundamentals","Analog Devices Doctools","Installing","Sphinx theme"],"titleterms":{"Further":2,"How":[1,2],"I":[1,2],"In":4,"With":4,"adi":5,"aggreg":1,"analog":7,"archiv":8,"array":2,"author":1,"build":[0,1,3],"can":1,"caption":4,"card":3,"clear":3,"cluster":0,"code":[1,4],"collaps":3,"collect":[1,3],"color":5,"command":1,"common":4,"compil":8,"compon":3,"configur":0,"contain":[0,3],"content":[3,4],"continu":0,"cross":2,"css":1,"custom":[1,3,4,5],"deploy":2,"descript":3,"develop":8,"devic":7,"diagram":3,"direct":[3,4],"doc":[1,2],"doctool":[4,7],"document":[1,2,4,6],"doe":1,"dokuwiki":[1,4,5],"don":2,"downgit":5,"dynam":4,"element":4,"engineerzon":5,"environ":8,"esbonio":8,"esd":3,"even":1,"exampl":3,"extend":4,"extens":4,"extern":4,"fetch":[1,8],"file":4,"fine":2,"flex":3,"form":2,"fundament":6,"generat":1,"git":[1,2,4,5],"github":[0,2,8],"global":3,"grain":2,"grid":3,"guidelin":4,"hdl":[3,4],"hierarch":6,"host":0,"hot":4,"imag":[0,4],"import":4,"includ":3,"indent":4,"insight":3,"instal":8,"integr":[0,1,8],"interact":0,"interfac":[1,3],"issu":4,"javascript":4,"known":4,"larg":4,"latex":8,"level":4,"lfs":[1,2],"line":1,"link":5,"list":4,"local":[2,4],"matter":4,"mcp":8,"metadata":9,"miss":1,"mode":1,"multipl":1,"neovim":8,"network":0,"note":2,"number":4,"option":[3,9],"organiz":4,"output":1,"outsid":4,"page":2,"paramet":3,"parti":[4,8],"partit":0,"pattern":3,"pdf":8,"podman":0,"posit":4,"preview":4,"provid":4,"python":[1,8],"quota":0,"rebuild":1,"refer":[2,4],"regmap":3,"releas":[2,8],"reload":4,"remov":8,"renam":1,"repo":1,"repositori":[4,8],"resourc":[0,8],"role":[4,5],"roll":2,"root":2,"run":0,"runner":0,"search":1,"section":4,"self":0,"serv":1,"shell":3,"shortcut":9,"sourc":1,"spars":1,"specif":[2,4],"sphinx":[4,9],"status":3,"storag":4,"string":2,"structur":6,"style":1,"stylesheet":1,"supplier":5,"support":[4,8],"svg":3,"t":2,"tab":3,"tabl":4,"templat":3,"text":4,"theme":9,"third":[4,8],"tip":8,"token":0,"top":4,"usag":3,"use":8,"user":0,"vendor":5,"version":[2,4],"video":3,"virtual":8,"vscode":8,"vscodium":8,"want":2,"warn":3,"watch":1,"web":8,"whi":1,"whole":1,"width":4,"within":1,"work":1,"yml":1}})
\ No newline at end of file
@@ -1,10 +1,6 @@
 """Tests for the search CLI command."""
 from contextlib import ExitStack
 from unittest.mock import MagicMock, patch
-from urllib.request import Request
-
-from packaging.version import Version
-from sphinx import __version__ as __sphinx_version__
 
 from adi_doctools.cli.search import search
 
@@ -37,15 +33,9 @@ SAMPLE_SEARCHINDEX = '''Search.setIndex({
 
 
 def mock_urlopen_searchindex(url_or_request, timeout=None):
-    """Mock urlopen to return searchindex.js or handle HEAD requests."""
+    """Mock urlopen to return searchindex.js."""
     mock_response = MagicMock()
-
-    is_head_request = isinstance(url_or_request, Request) and url_or_request.method == 'HEAD'
-
-    if is_head_request:
-        mock_response.read.return_value = b''
-    else:
-        mock_response.read.return_value = SAMPLE_SEARCHINDEX.encode('utf-8')
+    mock_response.read.return_value = SAMPLE_SEARCHINDEX.encode('utf-8')
 
     mock_response.__enter__.return_value = mock_response
     mock_response.__exit__.return_value = None
@@ -57,41 +47,16 @@ def mock_urlopen_searchindex(url_or_request, timeout=None):
     return mock_response
 
 
-def mock_fetch_inventory(*args, **kwargs):
-    """Mock Sphinx's _fetch_inventory to return empty inventory (Sphinx < 9.0.0)."""
-    mock_inv = MagicMock()
-    mock_inv.data = {}  # Empty inventory - no intersphinx refs
-    return mock_inv
-
-
-def mock_fetch_inventory_data(*args, **kwargs):
-    """Mock Sphinx's _fetch_inventory_data (Sphinx >= 9.0.0)."""
-    # Return (raw_data, target_uri)
-    return (b'', '')
-
-
-def mock_load_inventory(*args, **kwargs):
-    """Mock Sphinx's _load_inventory (Sphinx >= 9.0.0)."""
-    mock_inv = MagicMock()
-    mock_inv.data = {}  # Empty inventory - no intersphinx refs
-    return mock_inv
-
-
 def test_cli_search_basic(monkeypatch, capsys):
     """Test basic search functionality with --url."""
     monkeypatch.setattr('sys.argv', ['pytest', '--url', 'https://example.com/searchindex.js', '--limit', '3', 'tutorial'])
 
     with ExitStack() as stack:
-        stack.enter_context(patch('adi_doctools.cli.search.urlopen', side_effect=mock_urlopen_searchindex))
+        stack.enter_context(patch('adi_doctools.cli.search.http_open', side_effect=mock_urlopen_searchindex))
+        stack.enter_context(patch('adi_doctools.cli.search_utils.http_open', side_effect=mock_urlopen_searchindex))
         stack.enter_context(patch('adi_doctools.cli.search.save_to_cache'))
         stack.enter_context(patch('adi_doctools.cli.search.save_inventory_to_cache'))
 
-        if Version(__sphinx_version__) < Version('9.0.0'):
-            stack.enter_context(patch('adi_doctools.cli.search._fetch_inventory', side_effect=mock_fetch_inventory))
-        else:
-            stack.enter_context(patch('adi_doctools.cli.search._fetch_inventory_data', side_effect=mock_fetch_inventory_data))
-            stack.enter_context(patch('adi_doctools.cli.search._load_inventory', side_effect=mock_load_inventory))
-
         try:
             search()
             exit_code = 0
@@ -109,16 +74,11 @@ def test_cli_search_no_results(monkeypatch, capsys):
     monkeypatch.setattr('sys.argv', ['pytest', '--url', 'https://example.com/searchindex.js', '--limit', '3', 'nonexistent'])
 
     with ExitStack() as stack:
-        stack.enter_context(patch('adi_doctools.cli.search.urlopen', side_effect=mock_urlopen_searchindex))
+        stack.enter_context(patch('adi_doctools.cli.search.http_open', side_effect=mock_urlopen_searchindex))
+        stack.enter_context(patch('adi_doctools.cli.search_utils.http_open', side_effect=mock_urlopen_searchindex))
         stack.enter_context(patch('adi_doctools.cli.search.save_to_cache'))
         stack.enter_context(patch('adi_doctools.cli.search.save_inventory_to_cache'))
 
-        if Version(__sphinx_version__) < Version('9.0.0'):
-            stack.enter_context(patch('adi_doctools.cli.search._fetch_inventory', side_effect=mock_fetch_inventory))
-        else:
-            stack.enter_context(patch('adi_doctools.cli.search._fetch_inventory_data', side_effect=mock_fetch_inventory_data))
-            stack.enter_context(patch('adi_doctools.cli.search._load_inventory', side_effect=mock_load_inventory))
-
         try:
             search()
             exit_code = 0
@@ -135,16 +95,11 @@ def test_cli_search_multiple_terms(monkeypatch, capsys):
     monkeypatch.setattr('sys.argv', ['pytest', '--url', 'https://example.com/searchindex.js', '--limit', '3', 'getting', 'started'])
 
     with ExitStack() as stack:
-        stack.enter_context(patch('adi_doctools.cli.search.urlopen', side_effect=mock_urlopen_searchindex))
+        stack.enter_context(patch('adi_doctools.cli.search.http_open', side_effect=mock_urlopen_searchindex))
+        stack.enter_context(patch('adi_doctools.cli.search_utils.http_open', side_effect=mock_urlopen_searchindex))
         stack.enter_context(patch('adi_doctools.cli.search.save_to_cache'))
         stack.enter_context(patch('adi_doctools.cli.search.save_inventory_to_cache'))
 
-        if Version(__sphinx_version__) < Version('9.0.0'):
-            stack.enter_context(patch('adi_doctools.cli.search._fetch_inventory', side_effect=mock_fetch_inventory))
-        else:
-            stack.enter_context(patch('adi_doctools.cli.search._fetch_inventory_data', side_effect=mock_fetch_inventory_data))
-            stack.enter_context(patch('adi_doctools.cli.search._load_inventory', side_effect=mock_load_inventory))
-
         try:
             search()
             exit_code = 0
@@ -155,3 +110,416 @@ def test_cli_search_multiple_terms(monkeypatch, capsys):
     assert exit_code == 0
     assert 'Tutorial' in captured.out or 'Getting Started' in captured.out
 
+
+def test_cli_search_compiled_index():
+    """Test the merged index ranks titles, prefixes and terms across repos."""
+    import json
+
+    import snowballstemmer
+
+    from adi_doctools.cli.aux_index import CompiledIndex
+    from adi_doctools.cli.search import stem_query
+
+    data = json.loads(SAMPLE_SEARCHINDEX[len('Search.setIndex('):-1])
+    other = {
+        "docnames": ["guide"],
+        "titles": ["Example Guide"],
+        "alltitles": {"Example Guide": [[0, None]]},
+        "titleterms": {"exampl": 0, "guid": 0},
+        "terms": {"exampl": 0, "guid": 0},
+    }
+    stemmer = snowballstemmer.stemmer('porter')
+    index = CompiledIndex.build([('a', data), ('b', other)])
+
+    results = index.search(['example'], stem_query(['example'], stemmer))
+    ranked = sorted(results.items(), key=lambda x: -x[1][1])
+    assert ranked[0][0] == ('b', 'guide', None)
+    assert ('a', 'tutorial', None) in results
+
+    # Prefix of a title word, shorter than a trigram
+    assert index.find_titles('ge') == index.find_titles('getting')
+    assert index.titles[next(iter(index.find_titles('ge')))][1] == 'Getting Started'
+
+    single = CompiledIndex.build([(None, data)])
+    query = ['getting', 'started']
+    results = single.search(query, stem_query(query, stemmer))
+    title, score = results[(None, 'tutorial', 'getting-started')]
+    assert title == 'Getting Started'
+    assert score > results[(None, 'tutorial', None)][1]
+    assert single.search(['the'], stem_query(['the'], stemmer)) == {}
+
+    # Updating a changed page matches a rebuild, unchanged pages are kept
+    changed = json.loads(json.dumps(other))
+    changed['terms']['tutori'] = 0
+    changed['alltitles']['Guide Tutorial'] = [[0, 'tutorial']]
+    assert index.update('b', changed) == (1, 1)
+    assert index.update('a', data) == (0, 0)
+    rebuilt = CompiledIndex.build([('a', data), ('b', changed)])
+    for query in (['tutorial'], ['example'], ['guide', 'tutorial']):
+        stemmed = stem_query(query, stemmer)
+        assert index.search(query, stemmed) == rebuilt.search(query, stemmed)
+
+
+def test_cli_search_binary_cache(tmp_path):
+    """Test the mapped cache files round-trip indexes, inventories and errors."""
+    import json
+    import zlib
+
+    from adi_doctools.cli.aux_cache import read_metadata
+    from adi_doctools.cli.search import (
+        get_cache_validators,
+        load_from_cache,
+        load_inventory_from_cache,
+        save_error_to_cache,
+        save_inventory_to_cache,
+        save_to_cache,
+    )
+
+    last_modified = 'Mon, 01 Jan 2024 00:00:00 GMT'
+    data = json.loads(SAMPLE_SEARCHINDEX[len('Search.setIndex('):-1])
+    data['terms']['exampl'] = 1
+
+    path = tmp_path / 'index.bin'
+    save_to_cache(path, data, last_modified, '"abc"')
+    metadata = read_metadata(path)
+    assert metadata['last_modified'] == last_modified
+    assert get_cache_validators(metadata) == ('"abc"', last_modified)
+
+    cached = load_from_cache(path)
+    for key in ('docnames', 'titles', 'alltitles', 'titleterms'):
+        assert cached[key] == data[key]
+    assert cached['terms']['exampl'] == [1]
+    assert cached.get('objects') is None
+
+    save_error_to_cache(path, '404', 'https://example.com/searchindex.js')
+    assert get_cache_validators(read_metadata(path)) == (None, None)
+    assert load_from_cache(path) is None
+
+    raw = b''.join((
+        b'# Sphinx inventory version 2\n# Project: p\n# Version: \n',
+        b'# The remainder of this file is compressed using zlib.\n',
+        zlib.compress(b'tutorial std:doc -1 tutorial.html Tutorial\n'
+                      b'start std:label -1 tutorial.html#$ Getting started\n'
+                      b'api std:label -1 api.html#api API\n'
+                      b'foo py:function 1 api.html#$ -\n')))
+    path = tmp_path / 'objects.inv.bin'
+    save_inventory_to_cache(path, raw, last_modified)
+    cached = load_inventory_from_cache(path)
+    raw_cache = cached.cache
+    assert cached.lookup('tutorial') == [('std:doc', 'tutorial', 'tutorial.html'),
+                                         ('std:label', 'start', 'tutorial.html#start')]
+    # The docname index was written back to the cache
+    assert raw_cache._map.closed
+    assert 'inventory.docnames' in load_inventory_from_cache(path).cache
+    assert load_inventory_from_cache(path).lookup('api') == [('std:label', 'api', 'api.html#api')]
+    assert cached.lookup('index') == []
+
+
+def test_cli_search_daemon(tmp_path):
+    """Test the daemon answers JSON requests and reports handler errors."""
+    import threading
+
+    from adi_doctools.cli.aux_daemon import (
+        DaemonServer,
+        daemon_request,
+        is_daemon_running,
+    )
+
+    def handler(request):
+        if 'fail' in request:
+            raise ValueError('bad request')
+        return {'results': request['query'][::-1]}
+
+    socket_path = tmp_path / 'daemon.sock'
+    assert daemon_request(socket_path, {'query': []}) is None
+
+    server = DaemonServer(socket_path, handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert is_daemon_running(socket_path)
+        assert daemon_request(socket_path, {'query': ['a', 'b']}) == {'results': ['b', 'a']}
+        assert daemon_request(socket_path, {'fail': True}) == {'error': 'bad request'}
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not socket_path.exists()
+    assert daemon_request(socket_path, {'query': []}) is None
+
+
+def test_cli_search_in_process():
+    """Test the in-process API returns ranked results as data."""
+    import pytest
+
+    from adi_doctools.cli.search import fetch_docs, search_docs
+
+    with ExitStack() as stack:
+        stack.enter_context(patch('adi_doctools.cli.search.http_open', side_effect=mock_urlopen_searchindex))
+        stack.enter_context(patch('adi_doctools.cli.search_utils.http_open', side_effect=mock_urlopen_searchindex))
+        stack.enter_context(patch('adi_doctools.cli.search.save_to_cache'))
+        stack.enter_context(patch('adi_doctools.cli.search.save_inventory_to_cache'))
+        stack.enter_context(patch('adi_doctools.cli.search.save_search_results'))
+        stack.enter_context(patch('adi_doctools.cli.search.daemon_request', return_value=None))
+
+        data = search_docs(['getting', 'started'], url='https://example.com/in-process',
+                           limit=1, summaries=False)
+
+    assert data['query'] == 'getting started'
+    assert data['total'] > 1
+    assert len(data['results']) == 1
+    result = data['results'][0]
+    assert result['index'] == 0
+    assert result['title'] == 'Getting Started'
+    assert result['url'] == 'https://example.com/in-process/tutorial.html#getting-started'
+
+    with pytest.raises(ValueError):
+        search_docs(['axi'], repo='hdl', url='https://example.com/')
+    with pytest.raises(ValueError):
+        fetch_docs('https://example.com/index.html', format='src')
+
+
+def test_cli_search_state_ttl():
+    """Test loaded repos are reloaded once older than the ttl of the access."""
+    from adi_doctools.cli.search import SearchState
+
+    state = SearchState(max_age=300)
+    sources = [('repo', 'https://example.com/searchindex.js')]
+    with patch('adi_doctools.cli.search.load_repo_data',
+               side_effect=lambda key, ttl: ({}, ttl)) as load:
+        assert state.get(sources, 300) == ({}, 300)
+        assert state.get(sources, 300) == ({}, 300)
+        assert load.call_count == 1
+        assert state.get(sources, 0) == ({}, 0)
+        with patch('adi_doctools.cli.search.query_repo_data', return_value=(0, [])):
+            state.query({'sources': sources, 'query': ['a'], 'ttl': 0})
+        assert load.call_count == 3
+
+
+def test_cli_search_conditional_get(tmp_path, monkeypatch):
+    """Test cached indexes are revalidated with a single conditional GET."""
+    import os
+    from email.message import Message
+    from urllib.error import HTTPError
+
+    from adi_doctools.cli import search as search_module
+
+    url = 'https://example.com/searchindex.js'
+    monkeypatch.setattr(search_module, 'CACHE_DIR', tmp_path)
+    requests = []
+
+    def urlopen(request, timeout=None):
+        requests.append(request)
+        if request.get_header('If-none-match') == '"v1"':
+            raise HTTPError(request.full_url, 304, 'Not Modified', Message(), None)
+        response = mock_urlopen_searchindex(request)
+        response.headers.get = {'ETag': '"v1"',
+                                'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}.get
+        return response
+
+    with patch('adi_doctools.cli.search_utils.http_open', side_effect=urlopen):
+        data = search_module.fetch_search_index(url, ttl=0)
+        assert data['docnames'] == ['index', 'tutorial', 'api']
+        assert len(requests) == 1
+
+        cache_path = search_module.get_cache_path(url)
+        os.utime(cache_path, (0, 0))
+        assert search_module.fetch_search_index(url, ttl=0)['docnames'] == data['docnames']
+        assert len(requests) == 2
+        assert requests[1].get_header('If-modified-since') == 'Mon, 01 Jan 2024 00:00:00 GMT'
+        # The 304 marks the cache fresh again
+        assert cache_path.stat().st_mtime > 0
+
+        assert search_module.fetch_search_index(url, ttl=300)['titles'] == data['titles']
+        assert len(requests) == 2
+
+
+def test_cli_search_http_pool():
+    """Test the pooled client reuses connections and follows redirects."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.error import HTTPError
+    from urllib.request import Request
+
+    import pytest
+
+    from adi_doctools.cli.search_utils import HttpPool, http_open
+
+    connections = []
+    user_agents = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_GET(self):
+            user_agents.append(self.headers.get_all('User-Agent'))
+            if self.path == '/old':
+                self.send_response(301)
+                self.send_header('Location', '/page')
+                body = b''
+            elif self.path == '/page':
+                self.send_response(200)
+                body = b'content'
+            else:
+                self.send_response(404)
+                body = b'missing'
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    pool = HttpPool(http2=False)
+    try:
+        for _ in range(3):
+            assert pool.request(f'{url}/page').read() == b'content'
+        response = pool.request(f'{url}/old')
+        assert response.read() == b'content'
+        assert response.geturl() == f'{url}/page'
+        with pytest.raises(HTTPError) as e:
+            pool.request(f'{url}/none')
+        assert e.value.code == 404
+        assert len(connections) == 1
+
+        user_agents.clear()
+        request = Request(f'{url}/page', headers={'User-Agent': 'test', 'If-None-Match': '"a"'})
+        assert http_open(request).read() == b'content'
+        assert user_agents == [['test']]
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_cli_search_http_proxy(monkeypatch):
+    """Test the pooled client goes through the proxy of the environment."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.error import URLError
+
+    import pytest
+
+    from adi_doctools.cli.search_utils import HttpPool
+
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            requests.append((self.command, self.path, self.headers.get('Proxy-Authorization')))
+            self.send_response(200)
+            self.send_header('Content-Length', '7')
+            self.end_headers()
+            self.wfile.write(b'content')
+
+        def do_CONNECT(self):
+            requests.append((self.command, self.path, self.headers.get('Proxy-Authorization')))
+            self.send_response(502)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    proxy = f'127.0.0.1:{server.server_address[1]}'
+    for name in ('no_proxy', 'NO_PROXY', 'http_proxy', 'https_proxy'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('HTTP_PROXY', f'http://user:pass@{proxy}')
+    monkeypatch.setenv('HTTPS_PROXY', f'http://{proxy}')
+    pool = HttpPool(http2=False)
+    try:
+        assert pool.request('http://docs.example/page?q=1#top').read() == b'content'
+        assert requests.pop() == ('GET', 'http://docs.example/page?q=1', 'Basic dXNlcjpwYXNz')
+
+        with pytest.raises(URLError):
+            pool.request('https://docs.example/page')
+        assert requests.pop() == ('CONNECT', 'docs.example:443', None)
+
+        monkeypatch.setenv('no_proxy', '127.0.0.1')
+        assert pool.request(f'http://{proxy}/page').read() == b'content'
+        assert requests.pop() == ('GET', '/page', None)
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_cli_search_page_cache(tmp_path):
+    """Test pages and their text are cached, revalidated and evicted."""
+    import os
+    from email.message import Message
+    from urllib.error import HTTPError
+
+    from adi_doctools.cli.search_utils import PageCache
+
+    requests = []
+
+    def urlopen(request, timeout=None):
+        requests.append(request.full_url)
+        if request.get_header('If-none-match'):
+            raise HTTPError(request.full_url, 304, 'Not Modified', Message(), None)
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.read.return_value = f'<p>{request.full_url}</p>'.encode()
+        response.headers.get = {'ETag': '"v1"'}.get
+        return response
+
+    indexed = []
+
+    def index_page(html):
+        indexed.append(html)
+        return html, {'intro': (3, 10)}
+
+    cache = PageCache(tmp_path, max_size=60, index_page=index_page)
+    url = 'https://example.com/page.html'
+    with patch('adi_doctools.cli.search_utils.http_open', side_effect=urlopen):
+        digest, content = cache.get(f'{url}#intro')
+        assert content == f'<p>{url}</p>'.encode()
+        assert cache.get(url, ttl=300) == (digest, content)
+        assert len(requests) == 1
+
+        assert cache.get_text(url, 'intro', ttl=300) == 'https:/'
+        assert cache.get_text(url, 'other', ttl=300) == f'<p>{url}</p>'
+        assert len(indexed) == 1
+
+        os.utime(cache.get_entry_path(url), (0, 0))
+        assert cache.get(url, ttl=300) == (digest, content)
+        assert len(requests) == 2
+
+        # Over max_size, the least recently used page is evicted
+        os.utime(cache.get_blob_path(digest), (0, 0))
+        cache.get('https://example.com/other.html')
+        assert not cache.get_blob_path(digest).exists()
+        assert cache.get(url, ttl=300) == (digest, content)
+        assert len(requests) == 5
+
+
+def test_cli_search_page_sections():
+    """Test the section text store is plain text, anchored per section."""
+    from adi_doctools.cli.aux_html2chunk import HTMLToChunks
+
+    html = '''<html><body><div itemprop="articleBody">
+<section id="page"><h1>Page<a class="headerlink" href="#page">¶</a></h1>
+<p>Intro <code>adoc</code> text.</p>
+<section id="sub"><span id="label"></span><h2>Sub</h2>
+<p>Sub text <strong>bold</strong>.</p>
+<ul><li><p>One</p></li><li><p>Two</p></li></ul>
+</section></section>
+</div></body></html>'''
+
+    text, anchors = HTMLToChunks().sections(html)
+    assert text == 'Intro adoc text.\nSub text bold. One Two'
+    start, end = anchors['sub']
+    assert anchors['label'] == anchors['sub']
+    assert text[start:end] == 'Sub text bold. One Two'
+    assert text[slice(*anchors['page'])] == 'Intro adoc text.'
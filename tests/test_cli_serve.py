@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 
 import pytest
@@ -31,3 +32,313 @@ def test_cli_serve_latex(monkeypatch, builder):
         exit_code = e.code if e.code is not None else 0
 
     assert exit_code == 0
+
+
+@pytest.mark.parametrize('polling', [False, True])
+def test_cli_serve_watcher(tmp_path, polling):
+    from adi_doctools.cli.aux_watch import PollWatcher, get_watcher
+
+    (tmp_path / 'a').mkdir()
+    (tmp_path / '_build').mkdir()
+    (tmp_path / 'a' / 'index.rst').write_text('Index')
+    (tmp_path / 'conf.py').write_text('')
+
+    args = (str(tmp_path), ('.rst',), [str(tmp_path / 'conf.py')], [str(tmp_path / '_build')])
+    watcher = PollWatcher(*args) if polling else get_watcher(*args)
+    assert set(watcher.scan()) == {str(tmp_path / 'a' / 'index.rst'),
+                                   str(tmp_path / 'conf.py')}
+
+    (tmp_path / '_build' / 'index.rst').write_text('Build')
+    (tmp_path / 'b').mkdir()
+    (tmp_path / 'b' / 'index.rst').write_text('New')
+    assert watcher.wait(1.5) == {str(tmp_path / 'b' / 'index.rst')}
+
+    (tmp_path / 'a' / 'index.rst').unlink()
+    assert watcher.wait(1.5) == {str(tmp_path / 'a' / 'index.rst')}
+
+    watcher.close()
+
+
+def test_cli_serve_file_index(tmp_path):
+    import os
+
+    from adi_doctools.cli.aux_watch import FileIndex, PollWatcher
+
+    src = tmp_path / 'src'
+    (src / 'a').mkdir(parents=True)
+    (src / 'a' / 'index.rst').write_text('Index')
+    index_file = str(tmp_path / '_build' / '.serve-index')
+
+    index = FileIndex(index_file, str(src), ('.rst',))
+    files = PollWatcher(str(src), ('.rst',), index=index).scan()
+    index.fill_digests(threading.Event())
+    index.save()
+
+    # New file in a listed directory, picked up through the directory mtime
+    (src / 'a' / 'new.rst').write_text('New')
+    index = FileIndex(index_file, str(src), ('.rst',))
+    files_ = PollWatcher(str(src), ('.rst',), index=index).scan()
+    assert set(files_) == set(files) | {str(src / 'a' / 'new.rst')}
+
+    # Touched, same content
+    f = src / 'a' / 'index.rst'
+    os.utime(f, (0, 1))
+    assert not index.changed(str(f), f.stat())
+    f.write_text('Edited')
+    assert index.changed(str(f), f.stat())
+
+    # Different key discards the stored state
+    assert FileIndex(index_file, str(src), ('.md',)).mtime(str(f)) is None
+
+
+def test_cli_serve_dependents(tmp_path):
+    from types import SimpleNamespace
+
+    from adi_doctools.cli.serve import get_dependents
+
+    env = SimpleNamespace(
+        found_docs={'index', 'ip/axi'},
+        doc2path=lambda d: tmp_path / f"{d}.rst",
+        dependencies={'ip/axi': {'ip/diagram.svg'}},
+        included={'index': {'ip/axi'}},
+        config=SimpleNamespace(monolithic=False),
+        regmaps={'axi': {'owners': ['ip/axi']}},
+        component={'axi': {'owners': ['ip/axi']}},
+    )
+    graph = get_dependents(env, str(tmp_path))
+
+    assert graph[str(tmp_path / 'index.rst')] == {'index'}
+    assert graph[str(tmp_path / 'ip' / 'axi.rst')] == {'ip/axi', 'index'}
+    assert graph[str(tmp_path / 'ip' / 'diagram.svg')] == {'ip/axi'}
+    assert graph[str(tmp_path / 'regmap' / 'adi_regmap_axi.txt')] == {'ip/axi'}
+    assert graph[str(tmp_path.parent / 'axi' / 'component.xml')] == {'ip/axi'}
+
+
+def test_cli_serve_stale_docs(tmp_path):
+    from sphinx.application import Sphinx
+
+    from adi_doctools.cli.serve import get_stale_docs, get_toctree_state
+
+    (tmp_path / 'conf.py').write_text('')
+    (tmp_path / 'index.rst').write_text(
+        "Index\n=====\n\n.. toctree::\n   :numbered:\n\n   a\n   c\n")
+    (tmp_path / 'a.rst').write_text("A\n=\n\n.. toctree::\n\n   b\n")
+    (tmp_path / 'b.rst').write_text("B\n=\n")
+    (tmp_path / 'c.rst').write_text("C\n=\n")
+
+    read_docnames = set()
+
+    def new_app():
+        app = Sphinx(tmp_path, tmp_path, tmp_path / '_build', tmp_path / '_build' / 'doctrees',
+                     'dummy', status=None, warning=None)
+        app.connect('doctree-read', lambda app_, doctree: read_docnames.add(app_.env.docname))
+        return app
+
+    new_app().build()
+
+    def build(doc, content):
+        (tmp_path / f"{doc}.rst").write_text(content)
+        read_docnames.clear()
+        app = new_app()
+        state = get_toctree_state(app.env)
+        app.build(filenames=[app.env.doc2path(doc)])
+        return get_stale_docs(app.env, state, read_docnames)
+
+    # Ancestors of a retitled page
+    assert build('b', "New B\n=====\n") == {'a', 'index'}
+    # Unchanged titles and toctrees
+    assert build('b', "New B\n=====\n\nText.\n") == set()
+    # Renumbered pages
+    assert build('index', "Index\n=====\n\n.. toctree::\n   :numbered:\n\n   c\n   a\n") == \
+        {'a', 'b', 'c'}
+
+
+def test_cli_serve_file_cache(tmp_path):
+    from adi_doctools.cli.aux_http import FileCache, not_modified, select_encoding
+
+    file = tmp_path / 'index.html'
+    file.write_bytes(b'<body></body>' * 100)
+    cache = FileCache()
+    entry = cache.get(str(file), lambda c: c.replace(b'</body>', b'<script></script></body>'))
+    assert entry.content.count(b'<script>') == 100
+    assert cache.get(str(file)) is entry
+    assert entry.encoded('gzip') != entry.content
+
+    assert select_encoding('gzip;q=1.0, deflate', 'text/html', 2048) == 'gzip'
+    assert select_encoding('gzip;q=0', 'text/html', 2048) is None
+    assert select_encoding('gzip', 'image/png', 2048) is None
+    assert not_modified({'If-None-Match': entry.etag}, entry.etag, entry.mtime_ns)
+    assert not not_modified({'If-None-Match': '"other"'}, entry.etag, entry.mtime_ns)
+
+
+def test_cli_serve_events():
+    import socket
+
+    from adi_doctools.cli.aux_events import EventChannel
+
+    def read_until(sock, token):
+        buf = b''
+        while token not in buf:
+            buf += sock.recv(4096)
+        return buf.decode()
+
+    events = EventChannel()
+    events.publish("old")
+    server, client = socket.socketpair()
+    events.subscribe(server)
+    assert 'event: hello' in read_until(client, b'\n\n')
+
+    events.publish("first")
+    events.publish("second")
+    buf = read_until(client, b'data: second\n\n')
+    assert buf.index('data: first') < buf.index('data: second')
+    assert 'old' not in buf
+
+    # Reconnect, resuming after the first message
+    server_, client_ = socket.socketpair()
+    events.subscribe(server_, last_id=2)
+    buf = read_until(client_, b'data: second\n\n')
+    assert 'data: first' not in buf
+
+    events.close()
+    client.close()
+    client_.close()
+
+
+def test_cli_serve_async_server(tmp_path):
+    from urllib.request import Request, urlopen
+
+    from adi_doctools.cli.aux_async import AsyncServer
+    from adi_doctools.cli.aux_events import EventChannel
+    from adi_doctools.cli.aux_http import FileCache
+
+    (tmp_path / 'index.html').write_bytes(b'<body></body>')
+    (tmp_path / 'image.png').write_bytes(bytes(range(256)) * 1024)
+
+    events = EventChannel()
+    server = AsyncServer(('127.0.0.1', 0), str(tmp_path), events, FileCache(),
+                         lambda c: c.replace(b'</body>', b'<script></script></body>'))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = 'http://{}:{}'.format(*server.server_address)
+    try:
+        with urlopen(f"{url}/") as f:
+            assert f.read() == b'<body><script></script></body>'
+            etag = f.headers['ETag']
+        with urlopen(f"{url}/image.png") as f:
+            assert f.read() == bytes(range(256)) * 1024
+        try:
+            urlopen(Request(f"{url}/index.html", headers={'If-None-Match': etag}))
+            status = 200
+        except OSError as e:
+            status = e.code
+        assert status == 304
+
+        events.publish("@docname index.html")
+        with urlopen(f"{url}/.dev-pool") as f:
+            assert f.read() == b'@docname index.html'
+        assert server.stats.summary()['requests'] >= 3
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+def test_cli_serve_lfs_index(tmp_path):
+    from adi_doctools.cli.aux_git import LfsIndex
+
+    sha = b'a' * 64
+    pointer = (b"version https://git-lfs.github.com/spec/v1\noid sha256:" + sha +
+               b"\nsize 1024\n")
+    image = tmp_path / 'image.png'
+    image.write_bytes(pointer)
+
+    index = LfsIndex(['.png'])
+    index.update(str(image))
+    index.update(str(tmp_path / 'missing.png'))
+    assert index.get(sha) == str(image)
+
+    # Smudged
+    image.write_bytes(b'\x89PNG' * 512)
+    index.update(str(image))
+    assert index.get(sha) is None
+    assert len(index) == 0
+
+
+def test_cli_serve_lfs_fetcher(tmp_path, monkeypatch):
+    import subprocess
+
+    from adi_doctools.cli import aux_git
+
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        if args[:3] == ["git", "lfs", "pull"]:
+            for f in args[4].split(','):
+                (tmp_path / f).write_bytes(b'content')
+        return subprocess.CompletedProcess(args, 0)
+
+    monkeypatch.setattr(aux_git.subprocess, 'run', run)
+    files = [str(tmp_path / f"{i}.png") for i in range(3)]
+    for f in files:
+        Path(f).write_bytes(b"version https://git-lfs.github.com/spec/v1\noid sha256:" + b'a' * 64)
+
+    fetcher = aux_git.LfsFetcher(str(tmp_path), coalesce=0.2)
+    futures = [fetcher.fetch(f) for f in files]
+    assert fetcher.fetch(files[0]) is futures[0]
+    assert all(f.result(timeout=5) for f in futures)
+    fetcher.close()
+
+    assert [c[:3] for c in calls] == [["git", "lfs", "pull"], ["git", "update-index", "-q"]]
+    assert calls[0][4] == "0.png,1.png,2.png"
+
+    # A failed pull resolves its batch and keeps the worker running
+    def missing(args, **kwargs):
+        raise FileNotFoundError(2, "No such file or directory", "git")
+
+    monkeypatch.setattr(aux_git.subprocess, 'run', missing)
+    for f in files:
+        Path(f).write_bytes(b"version https://git-lfs.github.com/spec/v1\noid sha256:" + b'a' * 64)
+    fetcher = aux_git.LfsFetcher(str(tmp_path), coalesce=0)
+    assert fetcher.fetch(files[0]).result(timeout=5) is False
+    assert fetcher.fetch(files[1]).result(timeout=5) is False
+    fetcher.close()
+
+
+def test_cli_serve_sparse_doctreedir(tmp_path):
+    from adi_doctools.cli.serve import get_sparse_doctreedir
+
+    assert get_sparse_doctreedir(str(tmp_path), {}) == str(tmp_path / 'doctrees')
+
+    a = get_sparse_doctreedir(str(tmp_path), {'exclude_patterns': ['a', 'b']})
+    assert a == get_sparse_doctreedir(str(tmp_path), {'exclude_patterns': ['a', 'b']})
+
+    dirs = []
+    for i in range(6):
+        dirs.append(get_sparse_doctreedir(str(tmp_path), {'exclude_patterns': [str(i)]}, keep=2))
+        Path(dirs[-1]).mkdir()
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(Path(d).name for d in dirs[-2:])
+
+
+def test_cli_serve_sparse_patterns(tmp_path):
+    from adi_doctools.cli.serve import (
+        _compact_patterns,
+        _listdir,
+        compute_sparse_config,
+    )
+
+    assert _compact_patterns({'a', 'a/b', 'c/*', 'c/index', 'c/d/e', 'cd'}) == {'a', 'c/*', 'cd'}
+
+    for d in ('lib/a/x', 'lib/b', 'other'):
+        (tmp_path / d).mkdir(parents=True)
+    (tmp_path / 'other' / 'index.rst').write_text('')
+    (tmp_path / 'page.rst').write_text('')
+    (tmp_path / 'conf.py').write_text("exclude_patterns = ['_build']\n")
+
+    confoverrides = compute_sparse_config(str(tmp_path), [str(tmp_path / 'lib' / 'a')], False)
+    assert confoverrides['exclude_patterns'] == ['_build', 'lib/b', 'other/*', 'page.rst']
+
+    assert _listdir(str(tmp_path / 'lib'))[0] == ('a', 'b')
+    (tmp_path / 'lib' / 'c').mkdir()
+    assert _listdir(str(tmp_path / 'lib'))[0] == ('a', 'b', 'c')
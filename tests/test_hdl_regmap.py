@@ -1,6 +1,11 @@
+import os
+import shutil
 from logging import WARNING
 from pathlib import Path
+from types import SimpleNamespace
 
+from adi_doctools.directive import hdl
+from adi_doctools.parser import cache
 from adi_doctools.parser.hdl import (
     expand_hdl_regmap,
     parse_hdl_regmap,
@@ -21,7 +26,7 @@ def test_hdl_regmap(monkeypatch, tmp_path, caplog):
     for r in regnames:
         file = Path(f"asset/hdl/docs/regmap/adi_regmap_{r}.txt")
 
-        regmap[r] = parse_hdl_regmap(0, str(file))
+        regmap[r] = parse_hdl_regmap(str(file))
 
     resolve_hdl_regmap(regmap)
     expand_hdl_regmap(regmap)
@@ -44,3 +49,174 @@ def test_hdl_regmap(monkeypatch, tmp_path, caplog):
         e2.pop(index_date)
 
         assert e1 == e2
+
+
+def test_hdl_regmap_parse(tmp_path, caplog):
+    caplog.set_level(WARNING, logger="adi_doctools.parser.hdl")
+
+    file = tmp_path / "adi_regmap_mock.txt"
+    file.write_text("""\
+TITLE
+USING PARENT
+First (first)
+FIRST
+ENDTITLE
+
+REG
+0x0004 + 0x4*n
+WHERE n IS FROM 0 TO 3
+CHANn
+Channel ''n''.
+
+ENDREG
+
+FIELD
+[W-1:0] 0x0
+DATA
+RW-V
+Data.
+ENDFIELD
+
+FIELD
+IMPORTED_0
+IMPORTED_1
+ENDFIELD
+
+REG
+PARENT.MOCK_0
+ENDREG
+TITLE
+USING CHILD
+Second (second)
+SECOND
+ENDTITLE
+
+REG
+0x0010
+MOCK
+Mock.
+ENDREG
+FIELD
+[0] 0x1
+SKIPPED
+RW
+ENDFIELD
+""")
+
+    rm = parse_hdl_regmap(str(file))
+    first = rm['subregmap']['FIRST']
+    second = rm['subregmap']['SECOND']
+
+    # The using list is shared by all titles of the file
+    assert first['using'] == second['using'] == ['PARENT', 'CHILD']
+    assert first['access_type'] == ['V', 'RWV']
+    assert [r['name'] for r in first['regmap']] == ['CHANn', 'PARENT.MOCK_0']
+
+    chan = first['regmap'][0]
+    assert chan['where'] == (0, 4)
+    assert (chan['address'], chan['addr_incr']) == (4, 4)
+    assert chan['description'] == ["Channel ``n``.", "",
+                                   "Where n is from 0 to 3."]
+    assert chan['parameters'] == ['W']
+    assert [(f['name'], f['import']) for f in chan['fields']] == [
+        ('DATA', False), ('IMPORTED_0', True), ('IMPORTED_1', True)]
+    assert chan['fields'][0]['bits'] == ('W-1', 0)
+    assert first['regmap'][1]['import']
+
+    # A FIELD right after ENDREG, with no separator line, is not parsed
+    assert [(r['name'], r['fields']) for r in second['regmap']] == [
+        ('MOCK', [])]
+    assert not caplog.records
+
+
+def test_hdl_regmap_cache(monkeypatch, tmp_path, caplog):
+    monkeypatch.chdir(tmp_path)
+    caplog.set_level(WARNING)
+
+    file = "adi_regmap_mock.txt"
+    with open(file, 'w') as f:
+        f.write("TITLE\nMock (mock)\nMOCK\nENDTITLE\n\n"
+                "REG\n0x0004\nMOCK\nMock.\nENDREG\n\n"
+                "FIELD\n[0] 0x0\nFIRST\nXX\nENDFIELD\n")
+
+    parse_cache = cache.ParseCache(str(tmp_path / "cache"))
+    rm = parse_cache.get(file, parse_hdl_regmap, file)
+    warnings = [r.getMessage() for r in caplog.records]
+    assert len(warnings) == 1
+    caplog.clear()
+
+    # Hit, with the warnings replayed
+    def collect(*args):
+        raise AssertionError("parsed again")
+    with monkeypatch.context() as m:
+        m.setattr(cache, "collect", collect)
+        assert parse_cache.get(file, parse_hdl_regmap, file) == rm
+    assert [r.getMessage() for r in caplog.records] == warnings
+
+    with open(file, 'a') as f:
+        f.write("\nFIELD\n[1] 0x0\nSECOND\nRW\nENDFIELD\n")
+    rm = parse_cache.get(file, parse_hdl_regmap, file)
+    assert [f['name'] for f in rm['subregmap']['MOCK']['regmap'][0]['fields']] == [
+        'FIRST', 'SECOND']
+
+
+def test_hdl_regmap_parallel(monkeypatch, tmp_path, caplog):
+    caplog.set_level(WARNING)
+    monkeypatch.setattr(hdl, "parse_cache", cache.ParseCache(""))
+
+    regmap_dir = Path(__file__).parent / "asset/hdl/docs/regmap"
+    files = sorted(str(f) for f in regmap_dir.glob("adi_regmap_*.txt"))
+    files.append(str(tmp_path / "adi_regmap_missing.txt"))
+    jobs = [(f, parse_hdl_regmap, f) for f in files * 2]
+
+    parallel = hdl.parse_hdl_artifacts(SimpleNamespace(parallel=3), jobs)
+    warnings = [r.getMessage() for r in caplog.records]
+    caplog.clear()
+    serial = hdl.parse_hdl_artifacts(SimpleNamespace(parallel=1), jobs)
+
+    assert parallel == serial
+    assert warnings == [r.getMessage() for r in caplog.records]
+    assert len(warnings) == 2
+
+
+def test_hdl_regmap_incremental(monkeypatch, tmp_path):
+    shutil.copytree(Path(__file__).parent / "asset/hdl/docs/regmap",
+                    tmp_path / "regmap")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(hdl, "parse_cache",
+                        cache.ParseCache(str(tmp_path / "cache")))
+
+    app = SimpleNamespace(parallel=1)
+    env = SimpleNamespace(config=SimpleNamespace(monolithic=False),
+                          found_docs={'parent', 'parent_ops', 'child', 'child_ops'})
+
+    hdl.manage_hdl_artifacts(app, env, [])
+    rm = env.regmaps
+    assert rm['child_ops']['imports'] == ['PARENT', 'PARENT_OPS']
+    for r in rm:
+        rm[r]['owners'].append(r)
+
+    # Touched but unchanged, e.g. by a checkout
+    child = rm['child']
+    os.utime("regmap/adi_regmap_parent.txt", ns=(0, 0))
+    docnames = []
+    hdl.manage_hdl_artifacts(app, env, docnames)
+    assert docnames == []
+    assert rm['child'] is child
+    assert rm['parent']['fingerprint'][1] == 0
+
+    file = Path("regmap/adi_regmap_parent_ops.txt")
+    file.write_text(file.read_text().replace("Mock ops register 0",
+                                             "Mock ops register zero"))
+    hdl.manage_hdl_artifacts(app, env, docnames)
+
+    # Only the importers of the changed regmap are resolved again
+    assert sorted(docnames) == ['child_ops', 'parent_ops']
+    assert rm['child'] is child
+    reg = rm['child_ops']['subregmap']['CHILD_OPS']['regmap'][0]
+    assert reg['description'] == ["Mock ops register zero"]
+
+    full = {r: parse_hdl_regmap(hdl.hdl_regmap_file(env, r)) for r in rm}
+    resolve_hdl_regmap(full)
+    for r in rm:
+        assert rm[r]['subregmap'] == full[r]['subregmap']